@@ -19,7 +19,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.models.database import Base
-from app.models.tao_dividends import TaoDividends
+from app.models import auth, blockchain, sentiment  # noqa: F401 (register models)
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,103 @@
+"""create base tables
+
+The users, blockchain_transactions and sentiment_analyses tables as the
+application first defined them; later revisions build on these. Tables that
+already exist (created outside of migrations) are left alone.
+
+Revision ID: 9e0a2c4d0000
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9e0a2c4d0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not _has_table("blockchain_transactions"):
+        op.create_table(
+            "blockchain_transactions",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("transaction_type", sa.String(), nullable=False),
+            sa.Column("netuid", sa.Integer(), nullable=False),
+            sa.Column("hotkey", sa.String(), nullable=False),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("transaction_hash", sa.String(), nullable=True),
+            sa.Column("sentiment_score", sa.Float(), nullable=True),
+            sa.Column("success", sa.Boolean(), nullable=True),
+            sa.Column("error", sa.String(), nullable=True),
+            sa.Column("transaction_data", sa.JSON(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_blockchain_transactions_id", "blockchain_transactions", ["id"]
+        )
+
+    if not _has_table("sentiment_analyses"):
+        op.create_table(
+            "sentiment_analyses",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("netuid", sa.Integer(), nullable=False),
+            sa.Column("tweet_count", sa.Integer(), nullable=True),
+            sa.Column("sentiment_score", sa.Float(), nullable=True),
+            sa.Column("data", sa.JSON(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_sentiment_analyses_id", "sentiment_analyses", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sentiment_analyses_id", table_name="sentiment_analyses")
+    op.drop_table("sentiment_analyses")
+    op.drop_index(
+        "ix_blockchain_transactions_id", table_name="blockchain_transactions"
+    )
+    op.drop_table("blockchain_transactions")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
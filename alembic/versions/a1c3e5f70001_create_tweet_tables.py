@@ -0,0 +1,60 @@
+"""create tweet tables
+
+Revision ID: a1c3e5f70001
+Revises: 9e0a2c4d0000
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a1c3e5f70001"
+down_revision = "9e0a2c4d0000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tweets",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("query", sa.String(), nullable=False),
+        sa.Column("netuid", sa.Integer(), nullable=True),
+        sa.Column("text", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("tweet_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("query", "id"),
+    )
+    op.create_index(
+        "ix_tweets_query_tweet_created_at",
+        "tweets",
+        ["query", "tweet_created_at"],
+    )
+
+    op.create_table(
+        "tweet_cursors",
+        sa.Column("query", sa.String(), nullable=False),
+        sa.Column("since_id", sa.String(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("query"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tweet_cursors")
+    op.drop_index("ix_tweets_query_tweet_created_at", table_name="tweets")
+    op.drop_table("tweets")
@@ -0,0 +1,50 @@
+"""create dividend snapshots
+
+Revision ID: b2d4f6a80002
+Revises: a1c3e5f70001
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b2d4f6a80002"
+down_revision = "a1c3e5f70001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dividend_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("netuid", sa.Integer(), nullable=False),
+        sa.Column("hotkey", sa.String(), nullable=False),
+        sa.Column("stake", sa.Float(), nullable=False),
+        sa.Column("dividend", sa.Float(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_dividend_snapshots_id", "dividend_snapshots", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_dividend_snapshots_netuid_created_at",
+        "dividend_snapshots",
+        ["netuid", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_dividend_snapshots_netuid_created_at", table_name="dividend_snapshots"
+    )
+    op.drop_index("ix_dividend_snapshots_id", table_name="dividend_snapshots")
+    op.drop_table("dividend_snapshots")
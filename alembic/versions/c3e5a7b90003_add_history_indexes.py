@@ -0,0 +1,60 @@
+"""add history indexes
+
+Composite indexes ending in (created_at, id) for the per-netuid, per-hotkey
+and global history queries and their keyset pagination. Built concurrently
+so existing tables stay writable.
+
+Revision ID: c3e5a7b90003
+Revises: b2d4f6a80002
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c3e5a7b90003"
+down_revision = "b2d4f6a80002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    (
+        "ix_blockchain_transactions_netuid_created_at",
+        "blockchain_transactions",
+        ["netuid", "created_at", "id"],
+    ),
+    (
+        "ix_blockchain_transactions_hotkey_created_at",
+        "blockchain_transactions",
+        ["hotkey", "created_at", "id"],
+    ),
+    (
+        "ix_blockchain_transactions_created_at",
+        "blockchain_transactions",
+        ["created_at", "id"],
+    ),
+    (
+        "ix_sentiment_analyses_netuid_created_at",
+        "sentiment_analyses",
+        ["netuid", "created_at", "id"],
+    ),
+    (
+        "ix_sentiment_analyses_created_at",
+        "sentiment_analyses",
+        ["created_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,171 @@
+"""partition history tables
+
+Rebuilds blockchain_transactions and sentiment_analyses as tables
+range-partitioned by month on created_at (which joins id in the primary
+key), with monthly partitions from the oldest row up to a few months ahead
+and a default partition. Existing rows are copied over; the tables are
+locked while this runs. Also adds the daily per-netuid rollup tables.
+
+Revision ID: d4f6b8c00004
+Revises: c3e5a7b90003
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d4f6b8c00004"
+down_revision = "c3e5a7b90003"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created beyond the current month; later ones are created
+# by the maintain_history_tables task
+PARTITIONS_AHEAD = 2
+
+INDEXES = {
+    "blockchain_transactions": [
+        ("ix_blockchain_transactions_id", ["id"]),
+        (
+            "ix_blockchain_transactions_netuid_created_at",
+            ["netuid", "created_at", "id"],
+        ),
+        (
+            "ix_blockchain_transactions_hotkey_created_at",
+            ["hotkey", "created_at", "id"],
+        ),
+        ("ix_blockchain_transactions_created_at", ["created_at", "id"]),
+    ],
+    "sentiment_analyses": [
+        ("ix_sentiment_analyses_id", ["id"]),
+        ("ix_sentiment_analyses_netuid_created_at", ["netuid", "created_at", "id"]),
+        ("ix_sentiment_analyses_created_at", ["created_at", "id"]),
+    ],
+}
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _move_aside(table: str, suffix: str) -> str:
+    """Rename a table and the names it holds (primary key, indexes) out of the way"""
+    old = f"{table}_{suffix}"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER INDEX IF EXISTS {table}_pkey RENAME TO {old}_pkey")
+    for name, _ in INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    return old
+
+
+def _adopt_sequence(table: str, old: str):
+    """Keep the id sequence alive when the old table is dropped"""
+    sequence = (
+        op.get_bind()
+        .execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": old})
+        .scalar()
+    )
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+
+
+def _create_indexes(table: str):
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns)
+
+
+def _partition(table: str):
+    old = _move_aside(table, "unpartitioned")
+    op.execute(f"UPDATE {old} SET created_at = now() WHERE created_at IS NULL")
+
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+    _adopt_sequence(table, old)
+
+    oldest = (
+        op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+    )
+    now = datetime.now(timezone.utc)
+    start = _add_months(oldest or now, 0)
+    last = _add_months(now, PARTITIONS_AHEAD)
+    while start <= last:
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    _create_indexes(table)
+
+
+def _unpartition(table: str):
+    old = _move_aside(table, "partitioned")
+
+    op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    _adopt_sequence(table, old)
+
+    # Only rows in attached partitions are copied back
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old} CASCADE")
+    _create_indexes(table)
+
+
+def upgrade() -> None:
+    for table in INDEXES:
+        _partition(table)
+
+    op.create_table(
+        "sentiment_daily",
+        sa.Column("netuid", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("analysis_count", sa.Integer(), nullable=False),
+        sa.Column("tweet_count", sa.Integer(), nullable=False),
+        sa.Column("avg_score", sa.Float(), nullable=True),
+        sa.Column("min_score", sa.Float(), nullable=True),
+        sa.Column("max_score", sa.Float(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("netuid", "day"),
+    )
+    op.create_table(
+        "transaction_daily",
+        sa.Column("netuid", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("transaction_type", sa.String(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("success_count", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("netuid", "day", "transaction_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_daily")
+    op.drop_table("sentiment_daily")
+
+    for table in INDEXES:
+        _unpartition(table)
@@ -0,0 +1,69 @@
+"""create sentiment latest
+
+Latest sentiment analysis per netuid, maintained by a statement-level
+trigger on sentiment_analyses: each INSERT (including multi-row bulk inserts)
+upserts the newest of its rows per netuid, keeping whichever of the stored
+and new rows is newer. Backfilled from the existing history.
+
+Revision ID: e5a7c9d10005
+Revises: d4f6b8c00004
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c9d10005"
+down_revision = "d4f6b8c00004"
+branch_labels = None
+depends_on = None
+
+UPSERT_LATEST = """
+    INSERT INTO sentiment_latest
+        (netuid, analysis_id, sentiment_score, tweet_count, created_at)
+    SELECT DISTINCT ON (netuid)
+        netuid, id, sentiment_score, coalesce(tweet_count, 0), created_at
+    FROM {source}
+    ORDER BY netuid, created_at DESC, id DESC
+    ON CONFLICT (netuid) DO UPDATE SET
+        analysis_id = EXCLUDED.analysis_id,
+        sentiment_score = EXCLUDED.sentiment_score,
+        tweet_count = EXCLUDED.tweet_count,
+        created_at = EXCLUDED.created_at
+    WHERE (sentiment_latest.created_at, sentiment_latest.analysis_id)
+        <= (EXCLUDED.created_at, EXCLUDED.analysis_id)
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sentiment_latest",
+        sa.Column("netuid", sa.Integer(), nullable=False),
+        sa.Column("analysis_id", sa.Integer(), nullable=False),
+        sa.Column("sentiment_score", sa.Float(), nullable=True),
+        sa.Column("tweet_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("netuid"),
+    )
+
+    op.execute(
+        "CREATE FUNCTION sentiment_latest_upsert() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        + UPSERT_LATEST.format(source="inserted")
+        + "; RETURN NULL; END $$"
+    )
+    op.execute(
+        "CREATE TRIGGER sentiment_latest_upsert AFTER INSERT ON sentiment_analyses "
+        "REFERENCING NEW TABLE AS inserted "
+        "FOR EACH STATEMENT EXECUTE FUNCTION sentiment_latest_upsert()"
+    )
+
+    op.execute(UPSERT_LATEST.format(source="sentiment_analyses"))
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS sentiment_latest_upsert ON sentiment_analyses")
+    op.execute("DROP FUNCTION IF EXISTS sentiment_latest_upsert()")
+    op.drop_table("sentiment_latest")
@@ -0,0 +1,61 @@
+"""jsonb payloads
+
+Converts blockchain_transactions.transaction_data and sentiment_analyses.data
+from json to jsonb and indexes them: GIN (jsonb_path_ops) indexes for
+containment searches, and an expression index on the payload's transaction
+hash. Both tables are partitioned, which rules out CREATE INDEX CONCURRENTLY,
+so the tables are rewritten and indexed under lock.
+
+Revision ID: f6b8d0e20006
+Revises: e5a7c9d10005
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f6b8d0e20006"
+down_revision = "e5a7c9d10005"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("blockchain_transactions", "transaction_data"),
+    ("sentiment_analyses", "data"),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE jsonb USING {column}::jsonb"
+        )
+        op.create_index(
+            f"ix_{table}_{column}",
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+        )
+
+    op.create_index(
+        "ix_blockchain_transactions_payload_hash",
+        "blockchain_transactions",
+        [sa.text("(transaction_data ->> 'transaction_hash')")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_blockchain_transactions_payload_hash",
+        table_name="blockchain_transactions",
+    )
+    for table, column in COLUMNS:
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE json USING {column}::json"
+        )
@@ -0,0 +1,165 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from datetime import datetime
+import csv
+import io
+import json
+import logging
+
+from app.core.config import settings
+from app.core.security import get_current_active_user
+from app.crud.blockchain import stream_transactions
+from app.crud.sentiment import stream_sentiment_analyses
+from app.models.auth import User
+from app.models.blockchain import BlockchainTransaction
+from app.models.database import async_session
+from app.models.sentiment import SentimentAnalysis
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _row_dict(row: Any, columns: List[str]) -> Dict[str, Any]:
+    return {column: _value(getattr(row, column)) for column in columns}
+
+
+async def ndjson_chunks(
+    rows: AsyncIterator[Any], columns: List[str], batch_size: int
+) -> AsyncIterator[str]:
+    """
+    Encode rows as newline-delimited JSON, batch_size rows per chunk
+    """
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(_row_dict(row, columns), default=str) + "\n")
+        if len(lines) >= batch_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+async def csv_chunks(
+    rows: AsyncIterator[Any], columns: List[str], batch_size: int
+) -> AsyncIterator[str]:
+    """
+    Encode rows as CSV with a header line, batch_size rows per chunk
+
+    JSON payload columns are written as JSON strings.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    async for row in rows:
+        values = _row_dict(row, columns)
+        writer.writerow(
+            json.dumps(value) if isinstance(value, (dict, list)) else value
+            for value in values.values()
+        )
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _export(
+    name: str,
+    model: Any,
+    stream: Callable[..., AsyncIterator[Any]],
+    format: str,
+    **filters: Any,
+) -> StreamingResponse:
+    """
+    Stream an export of a history table
+
+    The rows are read in their own session, open for as long as the response
+    streams, rather than the request's.
+    """
+    columns = [column.name for column in model.__table__.columns]
+    encode = csv_chunks if format == "csv" else ndjson_chunks
+    batch_size = settings.EXPORT_BATCH_SIZE
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async with async_session() as db:
+                rows = stream(db, batch_size=batch_size, **filters)
+                async for chunk in encode(rows, columns, batch_size):
+                    yield chunk
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error(f"Error exporting {name}: {e}")
+            raise
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+@router.get("/transactions")
+async def export_transactions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Format"),
+    netuid: Optional[int] = Query(None, description="Subnet ID"),
+    hotkey: Optional[str] = Query(None, description="Account ID or public key"),
+    start: Optional[datetime] = Query(None, description="Start time (inclusive)"),
+    end: Optional[datetime] = Query(None, description="End time (exclusive)"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Export blockchain transaction history, oldest first
+
+    Returns:
+        Streamed NDJSON or CSV, one transaction per line
+    """
+    return _export(
+        "transactions",
+        BlockchainTransaction,
+        stream_transactions,
+        format,
+        netuid=netuid,
+        hotkey=hotkey,
+        start=start,
+        end=end,
+    )
+
+
+@router.get("/sentiment")
+async def export_sentiment(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Format"),
+    netuid: Optional[int] = Query(None, description="Subnet ID"),
+    start: Optional[datetime] = Query(None, description="Start time (inclusive)"),
+    end: Optional[datetime] = Query(None, description="End time (exclusive)"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Export sentiment analysis history, oldest first
+
+    Returns:
+        Streamed NDJSON or CSV, one analysis per line
+    """
+    return _export(
+        "sentiment",
+        SentimentAnalysis,
+        stream_sentiment_analyses,
+        format,
+        netuid=netuid,
+        start=start,
+        end=end,
+    )
@@ -4,9 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.core.security import get_current_active_user
+from app.crud.sentiment import get_latest_sentiments
 from app.models.database import get_db
 from app.models.auth import User
 from app.services.sentiment import sentiment_service
+from app.services.sentiment_stats import sentiment_stats_service
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -57,3 +59,64 @@ async def search_tweets(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to search tweets: {str(e)}",
         )
+
+
+@router.get("/stats")
+async def get_sentiment_stats(
+    netuid: int = Query(..., description="Subnet ID"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get rolling sentiment statistics (EWMA and 1h/24h/7d windows) for a subnet
+
+    Returns:
+        Dictionary with the EWMA, latest score and per-window aggregates
+    """
+    try:
+        stats = await sentiment_stats_service.get_stats(netuid)
+    except Exception as e:
+        logger.error(f"Error getting sentiment stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get sentiment stats: {str(e)}",
+        )
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No sentiment recorded for netuid {netuid}",
+        )
+    return stats
+
+
+@router.get("/latest")
+async def get_latest_sentiment(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the current sentiment score of every subnet in one query
+
+    Returns:
+        Dictionary with the latest analysis of each netuid
+    """
+    try:
+        latest = await get_latest_sentiments(db)
+    except Exception as e:
+        logger.error(f"Error getting latest sentiment: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get latest sentiment: {str(e)}",
+        )
+    return {
+        "count": len(latest),
+        "subnets": [
+            {
+                "netuid": row.netuid,
+                "sentiment_score": row.sentiment_score,
+                "tweet_count": row.tweet_count,
+                "analysis_id": row.analysis_id,
+                "created_at": row.created_at,
+            }
+            for row in latest
+        ],
+    }
@@ -8,7 +8,7 @@ from app.core.config import settings
 from app.models.database import get_db
 from app.models.auth import User
 from app.services.blockchain import blockchain_service
-from app.tasks.stake import process_sentiment_stake
+from app.tasks.enqueue import enqueue_sentiment_stake
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -52,12 +52,13 @@ async def get_tao_dividends(
                 f"Trade is enabled. Triggering sentiment analysis for netuid {netuid}, hotkey {hotkey}"
             )
 
-            # Trigger the Celery task for sentiment analysis and staking
-            task = process_sentiment_stake.delay(netuid, hotkey)
+            # Trigger the staged Celery pipeline, reusing in-flight work
+            task_id, deduplicated = await enqueue_sentiment_stake(netuid, hotkey)
 
             # Add task ID to result
-            result["task_id"] = task.id
-            logger.info(f"Sentiment analysis task triggered with ID: {task.id}")
+            result["task_id"] = task_id
+            result["task_deduplicated"] = deduplicated
+            logger.info(f"Sentiment analysis task triggered with ID: {task_id}")
 
         return result
 
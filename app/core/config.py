@@ -18,6 +18,75 @@ class Settings(BaseSettings):
     # Cache settings
     CACHE_TTL: Union[int, str, None] = 120
 
+    # Sentiment sweep settings (seconds); cached scores outlive several sweeps
+    SENTIMENT_SWEEP_INTERVAL: int = 300
+    SENTIMENT_CACHE_TTL: int = 900
+    # Subnets fetched concurrently during a sweep
+    SENTIMENT_SWEEP_CONCURRENCY: int = 8
+    # Half-life (seconds) of the rolling sentiment EWMA per subnet
+    SENTIMENT_EWMA_HALF_LIFE: int = 6 * 3600
+
+    # Tweet ingestion: tweets fetched per page, pages fetched per refresh to
+    # backfill back to the cursor, and analysis window
+    TWEET_INGEST_LIMIT: int = 100
+    TWEET_INGEST_MAX_PAGES: int = 10
+    SENTIMENT_TWEET_WINDOW_HOURS: int = 24
+    SENTIMENT_TWEET_LIMIT: int = 20
+
+    # Per-tweet LLM score cache TTL (seconds)
+    TWEET_SCORE_TTL: int = 7 * 24 * 3600
+    # Maximum estimated prompt tokens per batched Chutes request
+    SENTIMENT_BATCH_TOKEN_BUDGET: int = 3000
+    # Maximum estimated tweet tokens scored per subnet, highest priority first
+    SENTIMENT_SUBNET_TOKEN_BUDGET: int = 2000
+    # Age (hours) at which a tweet's prompt priority halves
+    SENTIMENT_RECENCY_HALF_LIFE_HOURS: float = 6.0
+    # Maximum SimHash distance (bits of 64) for tweets to count as near-duplicates
+    TWEET_DEDUP_MAX_DISTANCE: int = 6
+    # Batches whose local lexicon scores all stay within this band skip the LLM
+    LEXICON_NEUTRAL_THRESHOLD: float = 10.0
+
+    # Window during which repeated trade requests reuse the pending task
+    TRADE_DEDUP_WINDOW: int = 60
+    # Base stake decisions on the sentiment EWMA instead of the latest score
+    STAKE_USE_EWMA: bool = True
+    # Stake per point of sentiment score and smallest stake worth making (TAO)
+    STAKE_PER_SENTIMENT_POINT: float = 0.01
+    MIN_STAKE_AMOUNT: float = 0.01
+
+    # Cross-subnet allocator: total stake budget and per-subnet cap (TAO),
+    # smallest trade worth submitting, neutral score band and yield tilt
+    ALLOCATOR_TOTAL_BUDGET: float = 10.0
+    ALLOCATOR_MAX_SUBNET_STAKE: float = 2.0
+    ALLOCATOR_MIN_TRADE: float = 0.05
+    ALLOCATOR_SCORE_THRESHOLD: float = 1.0
+    ALLOCATOR_YIELD_WEIGHT: float = 0.5
+    # Seconds between scheduled portfolio rebalances (0 disables the schedule)
+    REBALANCE_INTERVAL: int = 0
+    # Seconds between dividend snapshots for backtesting (0 disables them)
+    DIVIDEND_SNAPSHOT_INTERVAL: int = 3600
+
+    # Write-behind buffering of transaction and sentiment rows: flush after
+    # this many rows or seconds; at most BULK_WRITE_MAX_BUFFER rows are kept
+    # while the database is unavailable. Disabled, every write is immediate.
+    BULK_WRITE_ENABLED: bool = True
+    BULK_WRITE_MAX_ROWS: int = 500
+    BULK_WRITE_MAX_DELAY: float = 1.0
+    BULK_WRITE_MAX_BUFFER: int = 10000
+
+    # History table maintenance: monthly partitions created ahead, months of
+    # raw rows kept (0 keeps everything), whether expired partitions are
+    # dropped instead of detached, and recent days re-rolled up each run
+    HISTORY_MAINTENANCE_INTERVAL: int = 24 * 3600
+    HISTORY_PARTITIONS_AHEAD: int = 2
+    HISTORY_RETENTION_MONTHS: int = 12
+    HISTORY_RETENTION_DROP: bool = False
+    HISTORY_ROLLUP_DAYS: int = 2
+
+    # History export: rows fetched per server-side cursor batch and per
+    # response chunk
+    EXPORT_BATCH_SIZE: int = 1000
+
     # Bittensor settings
     BITTENSOR_CHAIN_ENDPOINT: str = "ws://127.0.0.1:9944"
     BITTENSOR_NETWORK: str = "testnet"
@@ -28,10 +97,52 @@ class Settings(BaseSettings):
     DATURA_API_KEY: str = ""
     CHUTES_API_KEY: str = ""
 
+    # Upstream HTTP client settings
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    DATURA_READ_TIMEOUT: float = 30.0
+    CHUTES_READ_TIMEOUT: float = 60.0
+
+    # Client-side rate limits (requests per second and burst size)
+    DATURA_RATE_LIMIT: float = 5.0
+    DATURA_RATE_BURST: int = 10
+    CHUTES_RATE_LIMIT: float = 2.0
+    CHUTES_RATE_BURST: int = 4
+    # Retries of a request the upstream throttled (429)
+    UPSTREAM_THROTTLE_RETRIES: int = 3
+
+    # Shared (Redis) API quota across web and worker processes
+    QUOTA_ENABLED: bool = True
+    DATURA_QUOTA_PER_MINUTE: int = 300
+    CHUTES_QUOTA_PER_MINUTE: int = 120
+    # Fraction of the burst background work may use, leaving headroom for users
+    QUOTA_BACKGROUND_SHARE: float = 0.5
+    # Longest wait (seconds) for quota before giving up
+    QUOTA_MAX_WAIT_INTERACTIVE: float = 2.0
+    QUOTA_MAX_WAIT_BACKGROUND: float = 60.0
+
+    # Circuit breakers: open when this share of the last calls failed or were slow
+    CIRCUIT_WINDOW_SIZE: int = 20
+    CIRCUIT_MIN_CALLS: int = 5
+    CIRCUIT_FAILURE_RATE: float = 0.5
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    DATURA_SLOW_CALL_SECONDS: float = 10.0
+    CHUTES_SLOW_CALL_SECONDS: float = 20.0
+    # Hedge tweet searches slower than the p95 latency (never sooner than this)
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_MIN_DELAY: float = 0.5
+    # How long the last good search result is kept as a fallback (seconds)
+    STALE_CACHE_TTL: int = 24 * 3600
+
     # Wallet seed for testnet
     WALLET_SEED: str = (
         "diamond like interest affair safe clarify lawsuit innocent beef van grief color"
     )
+    # Optional separate hotkey seed (defaults to WALLET_SEED)
+    WALLET_HOTKEY_SEED: str = ""
 
     # Database configuration (these will be ignored from environment)
     POSTGRES_USER: Optional[str] = None
@@ -1,8 +1,17 @@
+from datetime import date, datetime
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
-from app.models.blockchain import BlockchainTransaction
+from app.crud.pagination import fetch_page
+from app.models.blockchain import (
+    BlockchainTransaction,
+    DividendSnapshot,
+    TransactionDaily,
+    payload_transaction_hash,
+)
 
 
 async def create_transaction(
@@ -38,6 +47,37 @@ async def create_transaction(
     return transaction
 
 
+async def create_transactions(
+    db: AsyncSession, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """
+    Insert many blockchain transaction records in one statement
+
+    Returns:
+        IDs of the new records, in the order of rows
+    """
+    if not rows:
+        return []
+
+    defaults = {
+        "transaction_hash": None,
+        "sentiment_score": None,
+        "success": True,
+        "error": None,
+        "transaction_data": None,
+    }
+    query = (
+        insert(BlockchainTransaction)
+        .values([{**defaults, **row} for row in rows])
+        .returning(BlockchainTransaction.id)
+    )
+
+    result = await db.execute(query)
+    ids = list(result.scalars().all())
+    await db.commit()
+    return ids
+
+
 async def get_transactions(
     db: AsyncSession, skip: int = 0, limit: int = 100
 ) -> List[BlockchainTransaction]:
@@ -46,7 +86,9 @@ async def get_transactions(
     """
     query = (
         select(BlockchainTransaction)
-        .order_by(BlockchainTransaction.created_at.desc())
+        .order_by(
+            BlockchainTransaction.created_at.desc(), BlockchainTransaction.id.desc()
+        )
         .offset(skip)
         .limit(limit)
     )
@@ -64,7 +106,9 @@ async def get_transactions_for_hotkey(
     query = (
         select(BlockchainTransaction)
         .where(BlockchainTransaction.hotkey == hotkey)
-        .order_by(BlockchainTransaction.created_at.desc())
+        .order_by(
+            BlockchainTransaction.created_at.desc(), BlockchainTransaction.id.desc()
+        )
         .offset(skip)
         .limit(limit)
     )
@@ -82,10 +126,267 @@ async def get_transactions_for_netuid(
     query = (
         select(BlockchainTransaction)
         .where(BlockchainTransaction.netuid == netuid)
-        .order_by(BlockchainTransaction.created_at.desc())
+        .order_by(
+            BlockchainTransaction.created_at.desc(), BlockchainTransaction.id.desc()
+        )
         .offset(skip)
         .limit(limit)
     )
 
     result = await db.execute(query)
     return result.scalars().all()
+
+
+async def get_transactions_page(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[BlockchainTransaction], Optional[str]]:
+    """
+    Get a page of blockchain transactions, newest first
+
+    Returns:
+        Transactions, and the cursor of the next page (None on the last page)
+    """
+    query = select(BlockchainTransaction)
+    return await fetch_page(db, query, BlockchainTransaction, cursor, limit)
+
+
+async def get_transactions_for_hotkey_page(
+    db: AsyncSession, hotkey: str, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[BlockchainTransaction], Optional[str]]:
+    """
+    Get a page of blockchain transactions for a specific hotkey, newest first
+    """
+    query = select(BlockchainTransaction).where(BlockchainTransaction.hotkey == hotkey)
+    return await fetch_page(db, query, BlockchainTransaction, cursor, limit)
+
+
+async def get_transactions_for_netuid_page(
+    db: AsyncSession, netuid: int, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[BlockchainTransaction], Optional[str]]:
+    """
+    Get a page of blockchain transactions for a specific netuid, newest first
+    """
+    query = select(BlockchainTransaction).where(BlockchainTransaction.netuid == netuid)
+    return await fetch_page(db, query, BlockchainTransaction, cursor, limit)
+
+
+async def get_transaction_by_payload_hash(
+    db: AsyncSession, transaction_hash: str
+) -> Optional[BlockchainTransaction]:
+    """
+    Get the latest transaction whose payload carries a transaction hash
+    """
+    query = (
+        select(BlockchainTransaction)
+        .where(payload_transaction_hash == transaction_hash)
+        .order_by(
+            BlockchainTransaction.created_at.desc(), BlockchainTransaction.id.desc()
+        )
+        .limit(1)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().first()
+
+
+async def search_transaction_data(
+    db: AsyncSession, match: Dict[str, Any], limit: int = 100
+) -> List[BlockchainTransaction]:
+    """
+    Get transactions whose payload contains match, newest first
+
+    e.g. ``{"success": False}`` or ``{"netuid": 18, "hotkey": "5F..."}``
+    """
+    query = (
+        select(BlockchainTransaction)
+        .where(BlockchainTransaction.transaction_data.contains(match))
+        .order_by(
+            BlockchainTransaction.created_at.desc(), BlockchainTransaction.id.desc()
+        )
+        .limit(limit)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def stream_transactions(
+    db: AsyncSession,
+    netuid: Optional[int] = None,
+    hotkey: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[BlockchainTransaction]:
+    """
+    Stream transactions in [start, end), oldest first
+
+    Rows come from a server-side cursor batch_size at a time, so memory use
+    does not grow with the size of the range.
+    """
+    query = select(BlockchainTransaction)
+    if netuid is not None:
+        query = query.where(BlockchainTransaction.netuid == netuid)
+    if hotkey is not None:
+        query = query.where(BlockchainTransaction.hotkey == hotkey)
+    if start is not None:
+        query = query.where(BlockchainTransaction.created_at >= start)
+    if end is not None:
+        query = query.where(BlockchainTransaction.created_at < end)
+    query = query.order_by(BlockchainTransaction.created_at, BlockchainTransaction.id)
+
+    result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+    async for row in result:
+        yield row
+
+
+async def get_transaction_history(
+    db: AsyncSession, start: datetime, end: datetime
+) -> List[Any]:
+    """
+    Get successful (netuid, created_at, transaction_type, amount) rows in a time range
+    """
+    query = (
+        select(
+            BlockchainTransaction.netuid,
+            BlockchainTransaction.created_at,
+            BlockchainTransaction.transaction_type,
+            BlockchainTransaction.amount,
+        )
+        .where(
+            BlockchainTransaction.success.is_(True),
+            BlockchainTransaction.created_at >= start,
+            BlockchainTransaction.created_at < end,
+        )
+        .order_by(BlockchainTransaction.created_at)
+    )
+
+    result = await db.execute(query)
+    return result.all()
+
+
+async def create_dividend_snapshots(
+    db: AsyncSession,
+    hotkey: str,
+    netuids: List[int],
+    stakes: List[float],
+    dividends: List[float],
+) -> int:
+    """
+    Record the stake and dividend of a hotkey on each subnet
+
+    Returns:
+        Number of snapshots written
+    """
+    rows = [
+        {"netuid": netuid, "hotkey": hotkey, "stake": stake, "dividend": dividend}
+        for netuid, stake, dividend in zip(netuids, stakes, dividends)
+    ]
+    if not rows:
+        return 0
+
+    await db.execute(insert(DividendSnapshot), rows)
+    await db.commit()
+    return len(rows)
+
+
+async def get_dividend_history(
+    db: AsyncSession, start: datetime, end: datetime, hotkey: Optional[str] = None
+) -> List[Any]:
+    """
+    Get (netuid, created_at, stake, dividend) snapshot rows in a time range
+    """
+    query = select(
+        DividendSnapshot.netuid,
+        DividendSnapshot.created_at,
+        DividendSnapshot.stake,
+        DividendSnapshot.dividend,
+    ).where(DividendSnapshot.created_at >= start, DividendSnapshot.created_at < end)
+    if hotkey is not None:
+        query = query.where(DividendSnapshot.hotkey == hotkey)
+
+    result = await db.execute(query.order_by(DividendSnapshot.created_at))
+    return result.all()
+
+
+async def refresh_transaction_daily(
+    db: AsyncSession, start: datetime, end: datetime
+) -> int:
+    """
+    Recompute the daily per-netuid rollups of transactions in [start, end)
+
+    start and end should be midnights (UTC) so every day is complete.
+
+    Returns:
+        Number of rollup rows written
+    """
+    day = func.date(func.timezone("UTC", BlockchainTransaction.created_at))
+    succeeded = BlockchainTransaction.success.is_(True)
+    source = (
+        select(
+            BlockchainTransaction.netuid,
+            day,
+            BlockchainTransaction.transaction_type,
+            func.count(),
+            func.count().filter(succeeded),
+            func.coalesce(
+                func.sum(BlockchainTransaction.amount).filter(succeeded), 0.0
+            ),
+        )
+        .where(
+            BlockchainTransaction.created_at >= start,
+            BlockchainTransaction.created_at < end,
+        )
+        .group_by(
+            BlockchainTransaction.netuid, day, BlockchainTransaction.transaction_type
+        )
+    )
+
+    statement = pg_insert(TransactionDaily).from_select(
+        [
+            "netuid",
+            "day",
+            "transaction_type",
+            "transaction_count",
+            "success_count",
+            "total_amount",
+        ],
+        source,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            TransactionDaily.netuid,
+            TransactionDaily.day,
+            TransactionDaily.transaction_type,
+        ],
+        set_={
+            "transaction_count": statement.excluded.transaction_count,
+            "success_count": statement.excluded.success_count,
+            "total_amount": statement.excluded.total_amount,
+            "updated_at": func.now(),
+        },
+    )
+
+    result = await db.execute(statement)
+    await db.commit()
+    return result.rowcount
+
+
+async def get_transaction_daily(
+    db: AsyncSession, netuid: int, start: date, end: date
+) -> List[TransactionDaily]:
+    """
+    Get daily transaction rollups for a netuid in [start, end], oldest first
+    """
+    query = (
+        select(TransactionDaily)
+        .where(
+            TransactionDaily.netuid == netuid,
+            TransactionDaily.day >= start,
+            TransactionDaily.day <= end,
+        )
+        .order_by(TransactionDaily.day, TransactionDaily.transaction_type)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -0,0 +1,80 @@
+"""
+Keyset (cursor) pagination for history queries
+
+Pages are ordered newest first by (created_at, id). Instead of OFFSET, which
+makes the database walk and discard every earlier row, each page continues
+strictly after the last row of the previous one. With an index ending in
+(created_at, id) every page is a short index range scan, however deep.
+
+Cursors are opaque URL-safe strings encoding the last row's created_at and id.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the position of a row as a page cursor
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a page cursor into (created_at, id)
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = (
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+        )
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_query(
+    query: Select, model: Any, cursor: Optional[str], limit: int
+) -> Select:
+    """
+    Restrict a query to the page after cursor, newest first
+
+    One row more than the limit is selected to tell whether there is a next page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query
+
+    Returns:
+        Rows of the page, and the cursor of the next page (None on the last page)
+    """
+    result = await db.execute(keyset_query(query, model, cursor, limit))
+    rows = result.scalars().all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
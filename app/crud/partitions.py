@@ -0,0 +1,149 @@
+"""
+Monthly range partitions of the history tables
+
+blockchain_transactions and sentiment_analyses are partitioned by month on
+created_at. Partitions are named ``<table>_pYYYY_MM`` and cover
+[first of the month, first of the next month) in UTC; rows outside every
+monthly partition land in ``<table>_default``.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARTITIONED_TABLES = ("blockchain_transactions", "sentiment_analyses")
+
+_SUFFIX_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def _utc(value: datetime) -> datetime:
+    # Partition bounds are UTC months; naive values are taken as UTC
+    return value.astimezone(timezone.utc) if value.tzinfo else value
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant (UTC) of the month containing value"""
+    value = _utc(value)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """First instant of the month months after the (UTC) month containing value"""
+    value = _utc(value)
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Name of the partition of table for the month starting at start"""
+    return f"{table}_p{start:%Y_%m}"
+
+
+def partition_start(table: str, name: str) -> Optional[datetime]:
+    """Start of the month covered by a partition, None if not a monthly partition"""
+    if not name.startswith(f"{table}_"):
+        return None
+    match = _SUFFIX_RE.search(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def _check_table(table: str):
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"Not a partitioned history table: {table}")
+
+
+async def list_partitions(db: AsyncSession, table: str) -> List[str]:
+    """
+    Get the names of a table's attached partitions
+    """
+    _check_table(table)
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def create_partition(db: AsyncSession, table: str, start: datetime) -> bool:
+    """
+    Create the partition of a table for the month starting at start
+
+    Postgres refuses to create a partition while the default partition holds
+    rows in its range, so any such rows are moved over: the default partition
+    is detached, the partition created, the rows moved into it and the
+    default reattached, all in one transaction.
+
+    Returns:
+        True if it was created, False if it already existed
+    """
+    _check_table(table)
+    start = month_start(start)
+    end = add_months(start, 1)
+    name = partition_name(table, start)
+    default = f"{table}_default"
+
+    exists = await db.execute(text("SELECT to_regclass(:name)"), {"name": name})
+    if exists.scalar() is not None:
+        return False
+
+    in_range = "created_at >= :start AND created_at < :end"
+    bounds = {"start": start, "end": end}
+    stranded = await db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"), bounds
+    )
+    move_rows = bool(stranded.scalar())
+
+    if move_rows:
+        await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{end.isoformat()}')"
+        )
+    )
+    if move_rows:
+        await db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        await db.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+        )
+    await db.commit()
+    return True
+
+
+async def detach_partition(db: AsyncSession, table: str, name: str):
+    """
+    Detach a partition, keeping it as a standalone table (e.g. for archiving)
+    """
+    _check_table(table)
+    if partition_start(table, name) is None:
+        raise ValueError(f"Not a monthly partition of {table}: {name}")
+    await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    await db.commit()
+
+
+async def drop_partition(db: AsyncSession, table: str, name: str):
+    """
+    Drop a partition and its rows
+    """
+    _check_table(table)
+    if partition_start(table, name) is None:
+        raise ValueError(f"Not a monthly partition of {table}: {name}")
+    await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    await db.commit()
@@ -1,8 +1,12 @@
+from datetime import date, datetime
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
-from app.models.sentiment import SentimentAnalysis
+from app.crud.pagination import fetch_page
+from app.models.sentiment import SentimentAnalysis, SentimentDaily, SentimentLatest
 
 
 async def create_sentiment_analysis(
@@ -28,6 +32,31 @@ async def create_sentiment_analysis(
     return sentiment
 
 
+async def create_sentiment_analyses(
+    db: AsyncSession, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """
+    Insert many sentiment analysis records in one statement
+
+    Returns:
+        IDs of the new records, in the order of rows
+    """
+    if not rows:
+        return []
+
+    defaults = {"tweet_count": 0, "data": None}
+    query = (
+        insert(SentimentAnalysis)
+        .values([{**defaults, **row} for row in rows])
+        .returning(SentimentAnalysis.id)
+    )
+
+    result = await db.execute(query)
+    ids = list(result.scalars().all())
+    await db.commit()
+    return ids
+
+
 async def get_sentiment_analyses(
     db: AsyncSession, skip: int = 0, limit: int = 100
 ) -> List[SentimentAnalysis]:
@@ -36,7 +65,7 @@ async def get_sentiment_analyses(
     """
     query = (
         select(SentimentAnalysis)
-        .order_by(SentimentAnalysis.created_at.desc())
+        .order_by(SentimentAnalysis.created_at.desc(), SentimentAnalysis.id.desc())
         .offset(skip)
         .limit(limit)
     )
@@ -54,7 +83,7 @@ async def get_sentiment_analyses_for_netuid(
     query = (
         select(SentimentAnalysis)
         .where(SentimentAnalysis.netuid == netuid)
-        .order_by(SentimentAnalysis.created_at.desc())
+        .order_by(SentimentAnalysis.created_at.desc(), SentimentAnalysis.id.desc())
         .offset(skip)
         .limit(limit)
     )
@@ -63,6 +92,29 @@ async def get_sentiment_analyses_for_netuid(
     return result.scalars().all()
 
 
+async def get_sentiment_analyses_page(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[SentimentAnalysis], Optional[str]]:
+    """
+    Get a page of sentiment analyses, newest first
+
+    Returns:
+        Analyses, and the cursor of the next page (None on the last page)
+    """
+    query = select(SentimentAnalysis)
+    return await fetch_page(db, query, SentimentAnalysis, cursor, limit)
+
+
+async def get_sentiment_analyses_for_netuid_page(
+    db: AsyncSession, netuid: int, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[SentimentAnalysis], Optional[str]]:
+    """
+    Get a page of sentiment analyses for a specific netuid, newest first
+    """
+    query = select(SentimentAnalysis).where(SentimentAnalysis.netuid == netuid)
+    return await fetch_page(db, query, SentimentAnalysis, cursor, limit)
+
+
 async def get_latest_sentiment_for_netuid(
     db: AsyncSession, netuid: int
 ) -> Optional[SentimentAnalysis]:
@@ -72,9 +124,228 @@ async def get_latest_sentiment_for_netuid(
     query = (
         select(SentimentAnalysis)
         .where(SentimentAnalysis.netuid == netuid)
-        .order_by(SentimentAnalysis.created_at.desc())
+        .order_by(SentimentAnalysis.created_at.desc(), SentimentAnalysis.id.desc())
         .limit(1)
     )
 
     result = await db.execute(query)
     return result.scalars().first()
+
+
+async def get_sentiment_analyses_for_tweet(
+    db: AsyncSession, tweet_id: str, limit: int = 100
+) -> List[SentimentAnalysis]:
+    """
+    Get sentiment analyses that included a tweet, newest first
+    """
+    query = (
+        select(SentimentAnalysis)
+        .where(SentimentAnalysis.data.contains({"tweet_ids": [tweet_id]}))
+        .order_by(SentimentAnalysis.created_at.desc(), SentimentAnalysis.id.desc())
+        .limit(limit)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def search_sentiment_data(
+    db: AsyncSession, match: Dict[str, Any], limit: int = 100
+) -> List[SentimentAnalysis]:
+    """
+    Get sentiment analyses whose data contains match, newest first
+    """
+    query = (
+        select(SentimentAnalysis)
+        .where(SentimentAnalysis.data.contains(match))
+        .order_by(SentimentAnalysis.created_at.desc(), SentimentAnalysis.id.desc())
+        .limit(limit)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def get_latest_sentiments(db: AsyncSession) -> List[SentimentLatest]:
+    """
+    Get the latest sentiment analysis of every netuid in one query
+    """
+    query = select(SentimentLatest).order_by(SentimentLatest.netuid)
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def refresh_sentiment_latest(db: AsyncSession) -> int:
+    """
+    Rebuild the latest-sentiment table from the analyses history
+
+    The table is maintained on insert by a trigger; this repairs it (e.g.
+    after a restore or bulk load) with one DISTINCT ON (netuid) scan of the
+    (netuid, created_at, id) index.
+
+    Returns:
+        Number of netuids written
+    """
+    source = (
+        select(
+            SentimentAnalysis.netuid,
+            SentimentAnalysis.id,
+            SentimentAnalysis.sentiment_score,
+            func.coalesce(SentimentAnalysis.tweet_count, 0),
+            SentimentAnalysis.created_at,
+        )
+        .distinct(SentimentAnalysis.netuid)
+        .order_by(
+            SentimentAnalysis.netuid,
+            SentimentAnalysis.created_at.desc(),
+            SentimentAnalysis.id.desc(),
+        )
+    )
+
+    statement = pg_insert(SentimentLatest).from_select(
+        ["netuid", "analysis_id", "sentiment_score", "tweet_count", "created_at"],
+        source,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[SentimentLatest.netuid],
+        set_={
+            "analysis_id": statement.excluded.analysis_id,
+            "sentiment_score": statement.excluded.sentiment_score,
+            "tweet_count": statement.excluded.tweet_count,
+            "created_at": statement.excluded.created_at,
+        },
+    )
+
+    result = await db.execute(statement)
+    await db.commit()
+    return result.rowcount
+
+
+async def stream_sentiment_analyses(
+    db: AsyncSession,
+    netuid: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[SentimentAnalysis]:
+    """
+    Stream sentiment analyses in [start, end), oldest first
+
+    Rows come from a server-side cursor batch_size at a time, so memory use
+    does not grow with the size of the range.
+    """
+    query = select(SentimentAnalysis)
+    if netuid is not None:
+        query = query.where(SentimentAnalysis.netuid == netuid)
+    if start is not None:
+        query = query.where(SentimentAnalysis.created_at >= start)
+    if end is not None:
+        query = query.where(SentimentAnalysis.created_at < end)
+    query = query.order_by(SentimentAnalysis.created_at, SentimentAnalysis.id)
+
+    result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+    async for row in result:
+        yield row
+
+
+async def get_sentiment_history(
+    db: AsyncSession, start: datetime, end: datetime
+) -> List[Any]:
+    """
+    Get (netuid, created_at, sentiment_score) rows in a time range, oldest first
+    """
+    query = (
+        select(
+            SentimentAnalysis.netuid,
+            SentimentAnalysis.created_at,
+            SentimentAnalysis.sentiment_score,
+        )
+        .where(
+            SentimentAnalysis.sentiment_score.isnot(None),
+            SentimentAnalysis.created_at >= start,
+            SentimentAnalysis.created_at < end,
+        )
+        .order_by(SentimentAnalysis.created_at)
+    )
+
+    result = await db.execute(query)
+    return result.all()
+
+
+async def refresh_sentiment_daily(
+    db: AsyncSession, start: datetime, end: datetime
+) -> int:
+    """
+    Recompute the daily per-netuid rollups of analyses in [start, end)
+
+    start and end should be midnights (UTC) so every day is complete.
+
+    Returns:
+        Number of rollup rows written
+    """
+    day = func.date(func.timezone("UTC", SentimentAnalysis.created_at))
+    source = (
+        select(
+            SentimentAnalysis.netuid,
+            day,
+            func.count(),
+            func.coalesce(func.sum(SentimentAnalysis.tweet_count), 0),
+            func.avg(SentimentAnalysis.sentiment_score),
+            func.min(SentimentAnalysis.sentiment_score),
+            func.max(SentimentAnalysis.sentiment_score),
+        )
+        .where(
+            SentimentAnalysis.created_at >= start,
+            SentimentAnalysis.created_at < end,
+        )
+        .group_by(SentimentAnalysis.netuid, day)
+    )
+
+    statement = pg_insert(SentimentDaily).from_select(
+        [
+            "netuid",
+            "day",
+            "analysis_count",
+            "tweet_count",
+            "avg_score",
+            "min_score",
+            "max_score",
+        ],
+        source,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[SentimentDaily.netuid, SentimentDaily.day],
+        set_={
+            "analysis_count": statement.excluded.analysis_count,
+            "tweet_count": statement.excluded.tweet_count,
+            "avg_score": statement.excluded.avg_score,
+            "min_score": statement.excluded.min_score,
+            "max_score": statement.excluded.max_score,
+            "updated_at": func.now(),
+        },
+    )
+
+    result = await db.execute(statement)
+    await db.commit()
+    return result.rowcount
+
+
+async def get_sentiment_daily(
+    db: AsyncSession, netuid: int, start: date, end: date
+) -> List[SentimentDaily]:
+    """
+    Get daily sentiment rollups for a netuid in [start, end], oldest first
+    """
+    query = (
+        select(SentimentDaily)
+        .where(
+            SentimentDaily.netuid == netuid,
+            SentimentDaily.day >= start,
+            SentimentDaily.day <= end,
+        )
+        .order_by(SentimentDaily.day)
+    )
+
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Dict, Any, Optional
+
+from app.models.sentiment import Tweet, TweetCursor
+
+
+def parse_tweet_time(value: Optional[str]) -> datetime:
+    """
+    Parse a tweet timestamp, falling back to now if it is missing or unknown
+    """
+    if value:
+        for parse in (
+            lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")),
+            lambda v: datetime.strptime(v, "%a %b %d %H:%M:%S %z %Y"),
+        ):
+            try:
+                return parse(value)
+            except ValueError:
+                continue
+    return datetime.now(timezone.utc)
+
+
+def _tweet_sort_key(tweet_id: str):
+    # Tweet IDs are snowflakes: numeric order is chronological order
+    return (len(tweet_id), tweet_id)
+
+
+def newest_tweet_id(tweets: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Get the newest tweet ID in a list of tweets
+    """
+    ids = [str(tweet["id"]) for tweet in tweets if tweet.get("id")]
+    return max(ids, key=_tweet_sort_key) if ids else None
+
+
+def oldest_tweet_id(tweets: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Get the oldest tweet ID in a list of tweets
+    """
+    ids = [str(tweet["id"]) for tweet in tweets if tweet.get("id")]
+    return min(ids, key=_tweet_sort_key) if ids else None
+
+
+async def upsert_tweets(
+    db: AsyncSession,
+    query: str,
+    tweets: List[Dict[str, Any]],
+    netuid: Optional[int] = None,
+) -> int:
+    """
+    Insert or update a query's tweets in a single multi-row statement
+
+    Tweets are keyed by (query, id), so a tweet already stored for another
+    query is stored again for this one.
+    """
+    rows = {}
+    for tweet in tweets:
+        if not tweet.get("id"):
+            continue
+        rows[str(tweet["id"])] = {
+            "id": str(tweet["id"]),
+            "query": query,
+            "netuid": netuid,
+            "text": tweet.get("text", ""),
+            "username": (tweet.get("user") or {}).get("username"),
+            "tweet_created_at": parse_tweet_time(tweet.get("created_at")),
+            "data": tweet,
+        }
+
+    if not rows:
+        return 0
+
+    statement = insert(Tweet).values(list(rows.values()))
+    statement = statement.on_conflict_do_update(
+        index_elements=[Tweet.query, Tweet.id],
+        set_={
+            "netuid": statement.excluded.netuid,
+            "text": statement.excluded.text,
+            "data": statement.excluded.data,
+        },
+    )
+
+    await db.execute(statement)
+    await db.commit()
+    return len(rows)
+
+
+async def get_tweet_cursor(db: AsyncSession, query: str) -> Optional[str]:
+    """
+    Get the newest ingested tweet ID for a query
+    """
+    result = await db.execute(
+        select(TweetCursor.since_id).where(TweetCursor.query == query)
+    )
+    return result.scalars().first()
+
+
+async def set_tweet_cursor(db: AsyncSession, query: str, since_id: str) -> None:
+    """
+    Store the newest ingested tweet ID for a query
+    """
+    statement = insert(TweetCursor).values(query=query, since_id=since_id)
+    statement = statement.on_conflict_do_update(
+        index_elements=[TweetCursor.query],
+        set_={
+            "since_id": statement.excluded.since_id,
+            "updated_at": datetime.now(timezone.utc),
+        },
+    )
+
+    await db.execute(statement)
+    await db.commit()
+
+
+async def get_recent_tweets(
+    db: AsyncSession,
+    query: str,
+    since: Optional[datetime] = None,
+    limit: int = 100,
+) -> List[Tweet]:
+    """
+    Get the most recent stored tweets for a query
+    """
+    statement = select(Tweet).where(Tweet.query == query)
+    if since is not None:
+        statement = statement.where(Tweet.tweet_created_at >= since)
+    statement = statement.order_by(Tweet.tweet_created_at.desc()).limit(limit)
+
+    result = await db.execute(statement)
+    return result.scalars().all()
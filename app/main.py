@@ -1,20 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 import logging
 
-from app.api.routes import tao_dividends, auth, sentiment
+from app.api.routes import tao_dividends, auth, sentiment, history
 from app.core.config import settings
 from app.models.database import engine, Base
+from app.services.bulk_writer import bulk_writers
+from app.services.cache import cache
+from app.services.http import http_clients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Flush buffered writes and close shared upstream, Redis and database clients on shutdown
+    """
+    yield
+    await bulk_writers.aclose()
+    await http_clients.aclose()
+    await cache.close()
+    await engine.dispose()
+
+
 app = FastAPI(
     title="Tao Dividends API",
     description="API service for querying Tao dividends from the Bittensor blockchain",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Setup CORS
@@ -45,6 +63,12 @@ app.include_router(
     tags=["sentiment"],
 )
 
+app.include_router(
+    history.router,
+    prefix="/api/v1/history",
+    tags=["history"],
+)
+
 
 @app.get("/health", tags=["health"])
 async def health_check():
@@ -1,16 +1,29 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Float,
+    Date,
+    DateTime,
+    Boolean,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func, literal_column
 from app.models.database import Base
 
 
 class BlockchainTransaction(Base):
     """
     Model for storing blockchain transaction history
+
+    Range-partitioned by month on created_at, which is therefore part of the
+    primary key.
     """
 
     __tablename__ = "blockchain_transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     transaction_type = Column(String, nullable=False)
     netuid = Column(Integer, nullable=False)
     hotkey = Column(String, nullable=False)
@@ -19,5 +32,73 @@ class BlockchainTransaction(Base):
     sentiment_score = Column(Float, nullable=True)
     success = Column(Boolean, default=True)
     error = Column(String, nullable=True)
-    transaction_data = Column(JSON, nullable=True)
+    transaction_data = Column(JSONB, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
+    # Serve per-netuid, per-hotkey and global history pages (newest first)
+    __table_args__ = (
+        Index(
+            "ix_blockchain_transactions_netuid_created_at", "netuid", "created_at", "id"
+        ),
+        Index(
+            "ix_blockchain_transactions_hotkey_created_at", "hotkey", "created_at", "id"
+        ),
+        Index("ix_blockchain_transactions_created_at", "created_at", "id"),
+        # Containment searches of the payload (transaction_data @> {...})
+        Index(
+            "ix_blockchain_transactions_transaction_data",
+            "transaction_data",
+            postgresql_using="gin",
+            postgresql_ops={"transaction_data": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+# Transaction hash inside the payload, with the key inlined so queries match
+# the expression index under generic (prepared statement) plans too
+payload_transaction_hash = BlockchainTransaction.transaction_data.op(
+    "->>", return_type=String
+)(literal_column("'transaction_hash'"))
+
+Index("ix_blockchain_transactions_payload_hash", payload_transaction_hash)
+
+
+class TransactionDaily(Base):
+    """
+    Model for daily per-netuid transaction rollups
+    """
+
+    __tablename__ = "transaction_daily"
+
+    netuid = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    transaction_type = Column(String, primary_key=True)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    # Sum of successful transaction amounts
+    total_amount = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class DividendSnapshot(Base):
+    """
+    Model for storing periodic snapshots of a hotkey's stake and dividend per subnet
+    """
+
+    __tablename__ = "dividend_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    netuid = Column(Integer, nullable=False)
+    hotkey = Column(String, nullable=False)
+    stake = Column(Float, nullable=False, default=0.0)
+    dividend = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_dividend_snapshots_netuid_created_at", "netuid", "created_at"),
+    )
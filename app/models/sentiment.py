@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.models.database import Base
 
@@ -6,13 +7,106 @@ from app.models.database import Base
 class SentimentAnalysis(Base):
     """
     Model for storing sentiment analysis results
+
+    Range-partitioned by month on created_at, which is therefore part of the
+    primary key.
     """
 
     __tablename__ = "sentiment_analyses"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     netuid = Column(Integer, nullable=False)
     tweet_count = Column(Integer, default=0)
     sentiment_score = Column(Float, nullable=True)
+    data = Column(JSONB, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
+    # Serve per-netuid and global history pages (newest first)
+    __table_args__ = (
+        Index("ix_sentiment_analyses_netuid_created_at", "netuid", "created_at", "id"),
+        Index("ix_sentiment_analyses_created_at", "created_at", "id"),
+        # Containment searches of the payload, e.g. by tweet ID
+        Index(
+            "ix_sentiment_analyses_data",
+            "data",
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class SentimentDaily(Base):
+    """
+    Model for daily per-netuid sentiment rollups
+    """
+
+    __tablename__ = "sentiment_daily"
+
+    netuid = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    analysis_count = Column(Integer, nullable=False, default=0)
+    tweet_count = Column(Integer, nullable=False, default=0)
+    avg_score = Column(Float, nullable=True)
+    min_score = Column(Float, nullable=True)
+    max_score = Column(Float, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class SentimentLatest(Base):
+    """
+    Model for the latest sentiment analysis of each netuid
+
+    Kept up to date by a trigger on sentiment_analyses, so every subnet's
+    current score is one small table scan.
+    """
+
+    __tablename__ = "sentiment_latest"
+
+    netuid = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, nullable=False)
+    sentiment_score = Column(Float, nullable=True)
+    tweet_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class Tweet(Base):
+    """
+    Model for storing ingested tweets, deduplicated by tweet ID per query
+
+    A tweet matching several subnets' queries is stored once for each, so
+    every subnet reads it back.
+    """
+
+    __tablename__ = "tweets"
+
+    query = Column(String, primary_key=True)
+    id = Column(String, primary_key=True)
+    netuid = Column(Integer, nullable=True)
+    text = Column(String, nullable=False, default="")
+    username = Column(String, nullable=True)
+    tweet_created_at = Column(DateTime(timezone=True), nullable=False)
     data = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_tweets_query_tweet_created_at", "query", "tweet_created_at"),
+    )
+
+
+class TweetCursor(Base):
+    """
+    Model for storing the newest ingested tweet ID per search query
+    """
+
+    __tablename__ = "tweet_cursors"
+
+    query = Column(String, primary_key=True)
+    since_id = Column(String, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,160 @@
+"""
+Cross-subnet stake allocation
+
+Instead of deciding every (netuid, hotkey) on its own, the allocator looks at
+all subnets at once. Given arrays of sentiment scores, dividend yields and
+current positions, it computes target stakes in one vectorized pass:
+
+- subnets with positive sentiment share the budget in proportion to their
+  score, tilted towards higher dividend yields;
+- subnets with negative sentiment are exited;
+- subnets without a clear signal (neutral or unknown score) are held;
+- no subnet gets more than the per-subnet cap, and capped stake is
+  redistributed among the others (water-filling);
+- the total never exceeds the budget.
+
+Only the differences to current positions are emitted, and trades smaller
+than the minimum trade size are dropped.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def _capped_shares(raw: np.ndarray, total: float, cap: float) -> np.ndarray:
+    """
+    Split total in proportion to raw weights, with no share above cap
+
+    Shares that would exceed the cap are fixed at the cap and the rest is
+    split again among the others; at most one pass per subnet.
+    """
+    shares = np.zeros_like(raw)
+    capped = np.zeros(raw.shape, dtype=bool)
+
+    for _ in range(raw.size):
+        free = (raw > 0) & ~capped
+        if total <= 0 or not free.any():
+            break
+        remaining = total - cap * capped.sum()
+        shares = np.where(capped, cap, 0.0)
+        shares[free] = remaining * raw[free] / raw[free].sum()
+        over = free & (shares > cap)
+        if not over.any():
+            break
+        capped |= over
+
+    return np.minimum(shares, cap)
+
+
+def target_stakes(
+    scores: np.ndarray,
+    yields: np.ndarray,
+    positions: np.ndarray,
+    budget: float,
+    max_subnet_stake: float,
+    threshold: Optional[float] = None,
+    yield_weight: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Target stake per subnet
+
+    Args:
+        scores: Sentiment scores (-100..100); NaN means no signal
+        yields: Dividend yields (dividend per staked TAO)
+        positions: Current stake per subnet
+        budget: Maximum total stake across subnets
+        max_subnet_stake: Maximum stake in any one subnet
+        threshold: Scores within +/- threshold are held (no signal)
+        yield_weight: How strongly yields tilt the allocation
+
+    Returns:
+        Array of target stakes, aligned with the inputs
+    """
+    threshold = settings.ALLOCATOR_SCORE_THRESHOLD if threshold is None else threshold
+    yield_weight = settings.ALLOCATOR_YIELD_WEIGHT if yield_weight is None else yield_weight
+
+    scores = np.asarray(scores, dtype=float)
+    yields = np.nan_to_num(np.asarray(yields, dtype=float), nan=0.0).clip(min=0.0)
+    positions = np.asarray(positions, dtype=float)
+
+    known = ~np.isnan(scores)
+    signal = np.where(known, scores, 0.0)
+    buy = known & (signal > threshold)
+    hold = ~buy & ~(known & (signal < -threshold))
+
+    # Held positions keep their stake (within the cap) and use up budget first
+    held = np.where(hold, np.minimum(positions, max_subnet_stake), 0.0)
+    if held.sum() > budget:
+        held *= budget / held.sum()
+
+    top_yield = yields.max() if yields.size else 0.0
+    tilt = 1.0 + yield_weight * (yields / top_yield if top_yield > 0 else 0.0)
+    raw = np.where(buy, signal / 100.0 * tilt, 0.0)
+
+    return held + _capped_shares(raw, budget - held.sum(), max_subnet_stake)
+
+
+def rebalance_deltas(
+    targets: np.ndarray,
+    positions: np.ndarray,
+    budget: float,
+    min_trade: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Stake changes that move positions towards targets
+
+    Changes smaller than min_trade are dropped. If dropping small unstakes
+    would push the total over budget, stakes are scaled down to fit.
+    """
+    min_trade = settings.ALLOCATOR_MIN_TRADE if min_trade is None else min_trade
+    positions = np.asarray(positions, dtype=float)
+
+    deltas = np.asarray(targets, dtype=float) - positions
+    deltas[np.abs(deltas) < min_trade] = 0.0
+
+    excess = (positions + deltas).sum() - budget
+    buys = deltas > 0
+    if excess > 1e-9 and buys.any():
+        deltas[buys] *= max(1.0 - excess / deltas[buys].sum(), 0.0)
+        deltas[buys & (deltas < min_trade)] = 0.0
+
+    return deltas
+
+
+def allocate(
+    netuids: List[int],
+    scores: np.ndarray,
+    yields: np.ndarray,
+    positions: np.ndarray,
+    budget: Optional[float] = None,
+    max_subnet_stake: Optional[float] = None,
+    min_trade: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rebalancing orders for a set of subnets
+
+    Returns:
+        List of orders (netuid, transaction_type, amount, target), unstakes
+        first so their proceeds are available to the stakes
+    """
+    budget = settings.ALLOCATOR_TOTAL_BUDGET if budget is None else budget
+    if max_subnet_stake is None:
+        max_subnet_stake = settings.ALLOCATOR_MAX_SUBNET_STAKE
+
+    targets = target_stakes(scores, yields, positions, budget, max_subnet_stake)
+    deltas = rebalance_deltas(targets, positions, budget, min_trade)
+
+    orders = [
+        {
+            "netuid": int(netuids[i]),
+            "transaction_type": "stake" if deltas[i] > 0 else "unstake",
+            "amount": float(abs(deltas[i])),
+            "target": float(positions[i] + deltas[i]),
+        }
+        for i in np.flatnonzero(deltas)
+    ]
+    orders.sort(key=lambda order: order["transaction_type"] == "stake")
+    return orders
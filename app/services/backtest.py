@@ -0,0 +1,399 @@
+"""
+Offline backtesting of staking strategies
+
+Replays recorded sentiment analyses, dividend snapshots and blockchain
+transactions through staking strategies without touching the chain.
+History is aligned once onto a regular time grid as (time x subnet) arrays,
+with each subnet's latest score and yield carried forward. Strategies turn
+these arrays into stake positions, and every variant is scored the same way:
+
+- dividends: stake held during a step times the subnet's dividend yield;
+- fees: a fixed fee per trade plus a fee rate on the amount traded;
+- turnover: total TAO staked and unstaked;
+- P&L: dividends minus fees.
+
+Price moves of subnet stake are not modelled; the P&L is dividend carry.
+
+Strategies:
+
+- ``per_subnet``: the live decision rule, stake or unstake
+  STAKE_PER_SENTIMENT_POINT TAO (a setting) per point of sentiment for every
+  subnet on its own, never below zero stake (fully vectorized over time and
+  subnets). Like live staking, it follows the sentiment EWMA (replayed with
+  the live half-life) when STAKE_USE_EWMA is set;
+- ``allocator``: the cross-subnet allocator, rebalancing towards its target
+  stakes every step;
+- ``recorded``: the positions implied by the transactions actually made.
+
+Run from the command line, e.g. ``python -m app.services.backtest --days 365``.
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.crud.blockchain import get_dividend_history, get_transaction_history
+from app.crud.sentiment import get_sentiment_history
+from app.services.allocator import rebalance_deltas, target_stakes
+from app.services.sentiment_stats import fold_ewma
+
+# Dividends are paid once per tempo (360 blocks of 12 seconds); a snapshot's
+# dividend / stake is the yield per tempo
+TEMPO_SECONDS = 360 * 12
+
+DEFAULT_STEP = 3600
+DEFAULT_FEE_PER_TRADE = 0.0001
+DEFAULT_FEE_RATE = 0.0005
+
+DEFAULT_VARIANTS: List[Dict[str, Any]] = [
+    {"name": "per_subnet", "strategy": "per_subnet"},
+    {"name": "allocator", "strategy": "allocator"},
+    {"name": "recorded", "strategy": "recorded"},
+]
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _grid_index(
+    grid: np.ndarray, netuids: np.ndarray, rows: Sequence[Sequence[Any]]
+) -> Dict[str, np.ndarray]:
+    """
+    Grid row and subnet column of each (netuid, time, ...) row
+
+    An observation becomes visible at the first grid time at or after it;
+    observations after the grid or for unknown subnets are dropped.
+    """
+    if not rows:
+        empty = np.zeros(0, dtype=int)
+        return {"rows": empty, "cols": empty, "keep": np.zeros(0, dtype=bool)}
+
+    row_netuids = np.fromiter((row[0] for row in rows), dtype=int, count=len(rows))
+    times = np.fromiter(
+        (_timestamp(row[1]) for row in rows), dtype=float, count=len(rows)
+    )
+
+    grid_rows = np.searchsorted(grid, times, side="left")
+    cols = np.searchsorted(netuids, row_netuids).clip(max=max(netuids.size - 1, 0))
+    keep = (grid_rows < grid.size) & (netuids[cols] == row_netuids)
+    return {"rows": grid_rows, "cols": cols, "keep": keep}
+
+
+def forward_fill(
+    grid: np.ndarray,
+    netuids: np.ndarray,
+    rows: Sequence[Sequence[Any]],
+    values: np.ndarray,
+) -> np.ndarray:
+    """
+    (time x subnet) array of the latest value seen at each grid time
+
+    Rows must be ordered by time. Cells before a subnet's first observation
+    are NaN.
+    """
+    filled = np.full((grid.size, netuids.size), np.nan)
+    index = _grid_index(grid, netuids, rows)
+    keep = index["keep"]
+    # Later rows overwrite earlier ones that land in the same cell
+    values = np.asarray(values, dtype=float)
+    filled[index["rows"][keep], index["cols"][keep]] = values[keep]
+
+    seen = np.where(~np.isnan(filled), np.arange(grid.size)[:, None], 0)
+    np.maximum.accumulate(seen, axis=0, out=seen)
+    return filled[seen, np.arange(netuids.size)]
+
+
+def replay_ewma(
+    sentiment_rows: Sequence[Sequence[Any]], half_life: Optional[float] = None
+) -> np.ndarray:
+    """
+    Sentiment EWMA of each row's subnet after that row, as updated live
+
+    Rows are (netuid, created_at, sentiment_score), oldest first; rows
+    without a score leave the EWMA as it was (NaN before the first score).
+    """
+    half_life = half_life or settings.SENTIMENT_EWMA_HALF_LIFE
+    states: Dict[int, Dict[str, Any]] = {}
+    ewma = np.full(len(sentiment_rows), np.nan)
+    for i, (netuid, created_at, score, *_) in enumerate(sentiment_rows):
+        state = states.setdefault(netuid, {"ewma": None})
+        if score is not None:
+            fold_ewma(state, float(score), _timestamp(created_at), half_life)
+        if state["ewma"] is not None:
+            ewma[i] = state["ewma"]
+    return ewma
+
+
+def build_history(
+    sentiment_rows: Sequence[Sequence[Any]],
+    dividend_rows: Sequence[Sequence[Any]],
+    transaction_rows: Sequence[Sequence[Any]],
+    start: datetime,
+    end: datetime,
+    step: int = DEFAULT_STEP,
+) -> Dict[str, Any]:
+    """
+    Align recorded history onto a regular time grid
+
+    Args:
+        sentiment_rows: (netuid, created_at, sentiment_score), oldest first
+        dividend_rows: (netuid, created_at, stake, dividend), oldest first
+        transaction_rows: (netuid, created_at, transaction_type, amount), oldest first
+        start: Start of the backtest
+        end: End of the backtest
+        step: Seconds between grid points (decision interval)
+
+    Returns:
+        Dictionary with the grid, netuids and (time x subnet) arrays of
+        scores, their EWMA, per-step yields and recorded stake changes
+    """
+    grid = np.arange(_timestamp(start), _timestamp(end), step, dtype=float)
+    netuids = np.unique(
+        [row[0] for row in (*sentiment_rows, *dividend_rows, *transaction_rows)]
+    ).astype(int)
+
+    scores = forward_fill(
+        grid,
+        netuids,
+        sentiment_rows,
+        np.array([row[2] for row in sentiment_rows], dtype=float),
+    )
+    ewma_scores = forward_fill(
+        grid, netuids, sentiment_rows, replay_ewma(sentiment_rows)
+    )
+
+    stakes = np.array([row[2] for row in dividend_rows], dtype=float)
+    dividends = np.array([row[3] for row in dividend_rows], dtype=float)
+    tempo_yields = np.divide(
+        dividends, stakes, out=np.zeros_like(dividends), where=stakes > 0
+    )
+    yields = forward_fill(grid, netuids, dividend_rows, tempo_yields)
+    yields = np.nan_to_num(yields, nan=0.0) * (step / TEMPO_SECONDS)
+
+    recorded = np.zeros((grid.size, netuids.size))
+    index = _grid_index(grid, netuids, transaction_rows)
+    if transaction_rows:
+        signed = np.array(
+            [
+                row[3] if row[2] == "stake" else -row[3]
+                for row in transaction_rows
+            ],
+            dtype=float,
+        )
+        keep = index["keep"]
+        np.add.at(recorded, (index["rows"][keep], index["cols"][keep]), signed[keep])
+
+    return {
+        "grid": grid,
+        "netuids": netuids,
+        "scores": scores,
+        "ewma_scores": ewma_scores,
+        "yields": yields,
+        "recorded": recorded,
+        "step": step,
+    }
+
+
+def per_subnet_positions(
+    history: Dict[str, Any],
+    stake_per_point: Optional[float] = None,
+    min_amount: Optional[float] = None,
+    use_ewma: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    Positions of the live per-subnet rule, decided at every grid step
+
+    As in live staking, decisions follow the sentiment EWMA if use_ewma
+    (default STAKE_USE_EWMA) is set and the history has one, else the latest
+    score. Unstaking stops at zero stake, so positions are the running sum of the
+    decisions reflected at zero: p_t = S_t - min(0, min_{k<=t} S_k).
+    """
+    if stake_per_point is None:
+        stake_per_point = settings.STAKE_PER_SENTIMENT_POINT
+    min_amount = settings.MIN_STAKE_AMOUNT if min_amount is None else min_amount
+
+    if use_ewma is None:
+        use_ewma = settings.STAKE_USE_EWMA
+
+    scores = history["scores"]
+    if use_ewma and "ewma_scores" in history:
+        ewma = history["ewma_scores"]
+        scores = np.where(np.isnan(ewma), scores, ewma)
+    scores = np.nan_to_num(scores, nan=0.0)
+    decisions = stake_per_point * scores
+    decisions[np.abs(decisions) < min_amount] = 0.0
+
+    running = np.cumsum(decisions, axis=0)
+    floor = np.minimum(np.minimum.accumulate(running, axis=0), 0.0)
+    return running - floor
+
+
+def allocator_positions(
+    history: Dict[str, Any],
+    budget: Optional[float] = None,
+    max_subnet_stake: Optional[float] = None,
+    min_trade: Optional[float] = None,
+    threshold: Optional[float] = None,
+    yield_weight: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Positions of the cross-subnet allocator, rebalanced at every grid step
+
+    Each step depends on the positions left by the previous one (held
+    subnets, minimum trade size), so steps run in sequence, each vectorized
+    over subnets.
+    """
+    budget = settings.ALLOCATOR_TOTAL_BUDGET if budget is None else budget
+    if max_subnet_stake is None:
+        max_subnet_stake = settings.ALLOCATOR_MAX_SUBNET_STAKE
+
+    scores, yields = history["scores"], history["yields"]
+    positions = np.zeros_like(scores)
+    current = np.zeros(scores.shape[1])
+
+    for t in range(scores.shape[0]):
+        targets = target_stakes(
+            scores[t],
+            yields[t],
+            current,
+            budget,
+            max_subnet_stake,
+            threshold=threshold,
+            yield_weight=yield_weight,
+        )
+        current = current + rebalance_deltas(targets, current, budget, min_trade)
+        positions[t] = current
+
+    return positions
+
+
+def recorded_positions(history: Dict[str, Any]) -> np.ndarray:
+    """
+    Positions implied by the recorded transactions, starting from zero
+    """
+    return np.cumsum(history["recorded"], axis=0).clip(min=0.0)
+
+
+STRATEGIES = {
+    "per_subnet": per_subnet_positions,
+    "allocator": allocator_positions,
+    "recorded": recorded_positions,
+}
+
+
+def evaluate(
+    positions: np.ndarray,
+    yields: np.ndarray,
+    fee_per_trade: float = DEFAULT_FEE_PER_TRADE,
+    fee_rate: float = DEFAULT_FEE_RATE,
+) -> Dict[str, float]:
+    """
+    P&L, dividends, fees and turnover of a (time x subnet) position path
+    """
+    trades = np.diff(positions, axis=0, prepend=0.0)
+    traded = np.abs(trades)
+    trade_count = int(np.count_nonzero(traded > 1e-12))
+    turnover = float(traded.sum())
+
+    dividends = float((positions * yields).sum())
+    fees = trade_count * fee_per_trade + turnover * fee_rate
+    total_stake = positions.sum(axis=1)
+
+    return {
+        "pnl": dividends - fees,
+        "dividends": dividends,
+        "fees": fees,
+        "turnover": turnover,
+        "trades": trade_count,
+        "peak_stake": float(total_stake.max()) if total_stake.size else 0.0,
+        "final_stake": float(total_stake[-1]) if total_stake.size else 0.0,
+    }
+
+
+def run_backtest(
+    history: Dict[str, Any],
+    variants: Optional[List[Dict[str, Any]]] = None,
+    fee_per_trade: float = DEFAULT_FEE_PER_TRADE,
+    fee_rate: float = DEFAULT_FEE_RATE,
+) -> List[Dict[str, Any]]:
+    """
+    Replay history through each strategy variant
+
+    Args:
+        history: Output of build_history
+        variants: Dictionaries with a name, a strategy (per_subnet, allocator
+            or recorded) and that strategy's keyword arguments
+        fee_per_trade: Fixed fee (TAO) per stake or unstake
+        fee_rate: Fee as a fraction of the amount traded
+
+    Returns:
+        One report per variant
+    """
+    reports = []
+    for variant in variants or DEFAULT_VARIANTS:
+        params = {k: v for k, v in variant.items() if k not in ("name", "strategy")}
+        positions = STRATEGIES[variant["strategy"]](history, **params)
+        reports.append(
+            {
+                "name": variant.get("name", variant["strategy"]),
+                "strategy": variant["strategy"],
+                **evaluate(positions, history["yields"], fee_per_trade, fee_rate),
+            }
+        )
+    return reports
+
+
+async def load_history(
+    db,
+    start: datetime,
+    end: datetime,
+    step: int = DEFAULT_STEP,
+    hotkey: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Load recorded history from the database and align it onto a time grid
+
+    Sentiment and dividend rows from before the start are included so every
+    subnet starts with its latest known values.
+    """
+    lookback = start - timedelta(days=7)
+    sentiment_rows = await get_sentiment_history(db, lookback, end)
+    dividend_rows = await get_dividend_history(db, lookback, end, hotkey)
+    transaction_rows = await get_transaction_history(db, start, end)
+    return build_history(
+        sentiment_rows, dividend_rows, transaction_rows, start, end, step
+    )
+
+
+async def _main(args: argparse.Namespace):
+    from app.models.database import async_session
+
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=args.days)
+    async with async_session() as db:
+        history = await load_history(db, start, end, args.step, args.hotkey)
+
+    reports = run_backtest(
+        history, fee_per_trade=args.fee_per_trade, fee_rate=args.fee_rate
+    )
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest staking strategies")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--step", type=int, default=DEFAULT_STEP)
+    parser.add_argument("--hotkey", default=None)
+    parser.add_argument("--fee-per-trade", type=float, default=DEFAULT_FEE_PER_TRADE)
+    parser.add_argument("--fee-rate", type=float, default=DEFAULT_FEE_RATE)
+    asyncio.run(_main(parser.parse_args()))
@@ -6,6 +6,7 @@ import time
 
 import bittensor
 from app.services.cache import cache
+from app.services.keystore import keystore
 from app.core.config import settings
 from bittensor.utils.balance import Balance
 
@@ -20,6 +21,7 @@ class BlockchainService:
     def __init__(self):
         self._async_subtensor = None
         self._wallet = None
+        self._signing_lock = None
         self._cache_ttl = settings.CACHE_TTL
 
     async def get_async_subtensor(self):
@@ -45,6 +47,12 @@ class BlockchainService:
                         MockNeuron("5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY"),
                     ]
 
+                async def get_all_subnet_netuids(self):
+                    return [1, 3, 18, 19]
+
+                async def get_stake_for_hotkey_and_subnet(self, hotkey, netuid):
+                    return 0.0
+
                 # Add other required methods
 
             self._async_subtensor = MockAsyncSubtensor()
@@ -54,29 +62,81 @@ class BlockchainService:
 
     async def get_wallet(self):
         """
-        Get or create wallet instance
+        Get the shared in-memory wallet from the process keystore
         """
         if self._wallet is None:
-            try:
-                # Create wallet from seed phrase
-                logger.info("Creating wallet from seed phrase")
-                self._wallet = bittensor.wallet(name="default", hotkey="default")
+            self._wallet = keystore.get_wallet()
 
-                # Regenerate from mnemonic
-                success = self._wallet.regenerate(mnemonic=settings.WALLET_SEED)
-                if not success:
-                    logger.error("Failed to regenerate wallet from seed")
-                    raise ValueError("Failed to regenerate wallet from seed phrase")
+        return self._wallet
 
-                logger.info(
-                    f"Successfully created wallet with coldkey: {self._wallet.coldkeypub.ss58_address}"
-                )
-                logger.info(f"Hotkey: {self._wallet.hotkey.ss58_address}")
-            except Exception as e:
-                logger.error(f"Error creating wallet: {e}")
-                raise
+    def _get_signing_lock(self) -> asyncio.Lock:
+        """
+        Lock serializing extrinsic submission from the shared wallet
+        """
+        if self._signing_lock is None:
+            self._signing_lock = asyncio.Lock()
+        return self._signing_lock
 
-        return self._wallet
+    async def close(self):
+        """
+        Close the AsyncSubtensor connection if one is open
+        """
+        if self._async_subtensor is not None:
+            close = getattr(self._async_subtensor, "close", None)
+            if close is not None:
+                await close()
+            self._async_subtensor = None
+
+    def reset(self):
+        """
+        Forget the subtensor connection without closing it (e.g. after a fork)
+        """
+        self._async_subtensor = None
+        self._signing_lock = None
+
+    async def get_active_netuids(self) -> List[int]:
+        """
+        Get the list of active subnet IDs
+
+        Returns cached results if available
+        """
+        cache_key = "subnets:netuids"
+        cached_result = await cache.get(cache_key)
+        if cached_result:
+            return cached_result
+
+        subtensor = await self.get_async_subtensor()
+        netuids = [int(netuid) for netuid in await subtensor.get_all_subnet_netuids()]
+
+        await cache.set(cache_key, netuids, ttl=self._cache_ttl)
+        return netuids
+
+    async def get_subnet_positions(
+        self, hotkey: str, netuids: List[int]
+    ) -> Dict[str, List[float]]:
+        """
+        Get the stake, dividend and dividend yield of a hotkey on each subnet
+
+        Returns:
+            Dictionary of per-subnet lists aligned with netuids
+        """
+        subtensor = await self.get_async_subtensor()
+
+        async def query(netuid: int) -> Tuple[float, float]:
+            stake, dividend = await asyncio.gather(
+                subtensor.get_stake_for_hotkey_and_subnet(hotkey=hotkey, netuid=netuid),
+                subtensor.get_tao_dividend_for_subnet(hotkey=hotkey, netuid=netuid),
+            )
+            return float(stake or 0.0), float(dividend or 0.0)
+
+        results = await asyncio.gather(*(query(netuid) for netuid in netuids))
+        return {
+            "stakes": [stake for stake, _ in results],
+            "dividends": [dividend for _, dividend in results],
+            "yields": [
+                dividend / stake if stake > 0 else 0.0 for stake, dividend in results
+            ],
+        }
 
     def _generate_cache_key(self, netuid: Optional[int], hotkey: Optional[str]) -> str:
         """
@@ -356,13 +416,15 @@ class BlockchainService:
             )
 
             # Submit the extrinsic with wallet signature
-            tx_hash = await subtensor.add_stake(
-                wallet=wallet,
-                hotkey_ss58=hotkey,
-                amount=stake_amount,
-                wait_for_inclusion=True,
-                wait_for_finalization=False,  # Don't wait for finalization for faster response
-            )
+            # One extrinsic at a time per wallet to avoid nonce collisions
+            async with self._get_signing_lock():
+                tx_hash = await subtensor.add_stake(
+                    wallet=wallet,
+                    hotkey_ss58=hotkey,
+                    amount=stake_amount,
+                    wait_for_inclusion=True,
+                    wait_for_finalization=False,  # Don't wait for finalization for faster response
+                )
 
             logger.info(f"add_stake extrinsic submitted successfully: {tx_hash}")
 
@@ -428,13 +490,15 @@ class BlockchainService:
                 f"Submitting unstake extrinsic: {netuid}, {hotkey}, {unstake_amount}"
             )
 
-            tx_hash = await subtensor.unstake(
-                wallet=wallet,
-                hotkey_ss58=hotkey,
-                amount=unstake_amount,
-                wait_for_inclusion=True,
-                wait_for_finalization=False,  # Don't wait for finalization for faster response
-            )
+            # One extrinsic at a time per wallet to avoid nonce collisions
+            async with self._get_signing_lock():
+                tx_hash = await subtensor.unstake(
+                    wallet=wallet,
+                    hotkey_ss58=hotkey,
+                    amount=unstake_amount,
+                    wait_for_inclusion=True,
+                    wait_for_finalization=False,  # Don't wait for finalization for faster response
+                )
 
             logger.info(f"unstake extrinsic submitted successfully: {tx_hash}")
 
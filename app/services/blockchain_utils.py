@@ -10,24 +10,21 @@ from typing import Any, Dict, List, Optional, Union
 
 import bittensor
 from app.core.config import settings
+from app.services.keystore import keystore
 
 logger = logging.getLogger(__name__)
 
 
 async def create_wallet():
     """
-    Create a Bittensor wallet from seed phrase
+    Get the Bittensor wallet derived from the seed phrase
+
+    The keypairs are derived once per process by the keystore and shared
+    with BlockchainService, so repeated calls are free.
     """
     try:
-        # Create wallet from seed
-        wallet = bittensor.wallet(name="default_wallet", hotkey="default")
-        success = wallet.regenerate(mnemonic=settings.WALLET_SEED)
-
-        if not success:
-            logger.error("Failed to regenerate wallet from seed")
-            raise ValueError("Failed to regenerate wallet from seed")
-
-        logger.info(f"Created wallet with coldkey: {wallet.coldkeypub.ss58_address}")
+        wallet = keystore.get_wallet()
+        logger.info(f"Using wallet with coldkey: {wallet.coldkeypub.ss58_address}")
         return wallet
     except Exception as e:
         logger.error(f"Error creating wallet: {e}")
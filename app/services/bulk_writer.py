@@ -0,0 +1,210 @@
+"""
+Write-behind buffering of database records
+
+Transaction and sentiment records arrive in bursts (sweeps, rebalances).
+Instead of an add/commit/refresh round-trip per row, writers collect rows and
+insert them with one multi-row ``INSERT ... RETURNING`` when
+BULK_WRITE_MAX_ROWS rows are buffered or BULK_WRITE_MAX_DELAY seconds after
+the first buffered row, whichever comes first.
+
+Buffered writes return immediately without an ID. Callers that need the ID,
+or need to know the row is stored before going on, pass ``sync=True``: the
+buffer is flushed right away (together with any other pending rows) and the
+new row's ID is returned, or the database error raised.
+
+Rows that fail to insert are kept and retried with the next flush. Buffers
+are flushed when the web app or a worker process shuts down.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.blockchain import create_transactions
+from app.crud.sentiment import create_sentiment_analyses
+from app.models.database import async_session
+
+logger = logging.getLogger(__name__)
+
+InsertRows = Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[List[int]]]
+
+
+class BulkWriter:
+    """
+    Buffered bulk inserts for one table
+    """
+
+    def __init__(self, name: str, insert_rows: InsertRows):
+        self.name = name
+        self._insert_rows = insert_rows
+        self.max_rows = settings.BULK_WRITE_MAX_ROWS
+        self.max_delay = settings.BULK_WRITE_MAX_DELAY
+        self.max_buffer = settings.BULK_WRITE_MAX_BUFFER
+        self._rows: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        """
+        Lock serializing flushes, so rows are inserted in the order written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows"""
+        return len(self._rows)
+
+    async def write(self, row: Dict[str, Any], sync: bool = False) -> Optional[int]:
+        """
+        Buffer a row for insertion
+
+        Args:
+            row: Column values; created_at defaults to the time of the call
+            sync: Flush now and return the row's ID
+
+        Returns:
+            The new row's ID if sync, otherwise None
+        """
+        row = {"created_at": datetime.now(timezone.utc), **row}
+
+        if sync or not settings.BULK_WRITE_ENABLED:
+            future = asyncio.get_running_loop().create_future()
+            self._rows.append((row, future))
+            await self.flush()
+            return await future
+
+        self._rows.append((row, None))
+        if len(self._rows) >= self.max_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_later
+            )
+        return None
+
+    def _flush_later(self):
+        self._timer = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self) -> int:
+        """
+        Insert all buffered rows
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        async with self._get_flush_lock():
+            self._cancel_timer()
+            pending, self._rows = self._rows, []
+            for start in range(0, len(pending), self.max_rows):
+                batch = pending[start : start + self.max_rows]
+                if await self._write_batch(batch):
+                    written += len(batch)
+        return written
+
+    async def _write_batch(
+        self, batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]
+    ) -> bool:
+        try:
+            async with async_session() as db:
+                ids = await self._insert_rows(db, [row for row, _ in batch])
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} {self.name} rows: {e}")
+            # Sync callers get the error; buffered rows are retried later
+            for _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            retry = [(row, None) for row, future in batch if future is None]
+            self._requeue(retry)
+            return False
+
+        for (_, future), row_id in zip(batch, ids):
+            if future is not None and not future.done():
+                future.set_result(row_id)
+        return True
+
+    def _requeue(self, rows: List[Tuple[Dict[str, Any], None]]):
+        # Ahead of rows written since the flush started, keeping their order
+        self._rows = rows + self._rows
+        overflow = len(self._rows) - self.max_buffer
+        if overflow > 0:
+            logger.error(f"Dropping {overflow} oldest buffered {self.name} rows")
+            self._rows = self._rows[overflow:]
+        if self._rows and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_later
+            )
+
+    async def aclose(self):
+        """
+        Flush buffered rows (e.g. on shutdown)
+        """
+        if self._rows:
+            written = await self.flush()
+            logger.info(f"Flushed {written} buffered {self.name} rows on shutdown")
+        self._cancel_timer()
+        if self._rows:
+            logger.error(f"Lost {len(self._rows)} buffered {self.name} rows on shutdown")
+
+    def reset(self):
+        """
+        Forget buffered rows and loop-bound state (e.g. after a fork)
+        """
+        self._rows = []
+        self._timer = None
+        self._flush_task = None
+        self._flush_lock = None
+
+
+class BulkWriters:
+    """
+    Registry of bulk writers, one per table
+    """
+
+    def __init__(self):
+        self._writers: Dict[str, BulkWriter] = {}
+        self._insert_rows: Dict[str, InsertRows] = {
+            "blockchain_transactions": create_transactions,
+            "sentiment_analyses": create_sentiment_analyses,
+        }
+
+    def get(self, name: str) -> BulkWriter:
+        """
+        Get or create the writer for a table
+        """
+        writer = self._writers.get(name)
+        if writer is None:
+            writer = BulkWriter(name, self._insert_rows[name])
+            self._writers[name] = writer
+        return writer
+
+    async def aclose(self):
+        """
+        Flush every writer
+        """
+        for writer in list(self._writers.values()):
+            await writer.aclose()
+
+    def reset(self):
+        """
+        Forget all writers (e.g. after a fork)
+        """
+        self._writers = {}
+
+
+# Create singleton instance
+bulk_writers = BulkWriters()
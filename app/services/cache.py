@@ -1,7 +1,25 @@
 import redis.asyncio as redis
 from app.core.config import settings
 import json
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
+
+# Replace the value at KEYS[1] only if it still holds ARGV[1]
+_COMPARE_AND_SET_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == false or current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Delete KEYS[1] only if it still holds ARGV[1]
+_COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
 
 
 class RedisCache:
@@ -24,6 +42,20 @@ class RedisCache:
             )
         return self.redis_client
 
+    async def close(self):
+        """
+        Close the Redis client and its connection pool
+        """
+        if self.redis_client is not None:
+            await self.redis_client.close()
+            self.redis_client = None
+
+    def reset(self):
+        """
+        Forget the client without closing it (e.g. after a fork)
+        """
+        self.redis_client = None
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache
@@ -42,6 +74,56 @@ class RedisCache:
         serialized_value = json.dumps(value)
         return await client.set(key, serialized_value, ex=ttl or self.ttl)
 
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values from cache in one round-trip (MGET)
+        """
+        if not keys:
+            return []
+        client = await self.get_client()
+        values = await client.mget(keys)
+        return [json.loads(value) if value else None for value in values]
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Set several values with the same TTL in one pipelined round-trip
+        """
+        if not mapping:
+            return True
+        client = await self.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, json.dumps(value), ex=ttl or self.ttl)
+            results = await pipe.execute()
+        return all(results)
+
+    async def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Set value only if the key does not exist yet (SET NX)
+        """
+        client = await self.get_client()
+        serialized_value = json.dumps(value)
+        return bool(
+            await client.set(key, serialized_value, ex=ttl or self.ttl, nx=True)
+        )
+
+    async def replace(
+        self, key: str, expected: Any, value: Any, ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Atomically replace value only if it still equals expected
+        """
+        client = await self.get_client()
+        replaced = await client.eval(
+            _COMPARE_AND_SET_SCRIPT,
+            1,
+            key,
+            json.dumps(expected),
+            json.dumps(value),
+            ttl or self.ttl,
+        )
+        return bool(replaced)
+
     async def delete(self, key: str) -> bool:
         """
         Delete value from cache
@@ -49,6 +131,38 @@ class RedisCache:
         client = await self.get_client()
         return await client.delete(key) > 0
 
+    async def delete_if(self, key: str, expected: Any) -> bool:
+        """
+        Atomically delete value only if it still equals expected (e.g. release
+        a lock only while we still hold it)
+        """
+        client = await self.get_client()
+        deleted = await client.eval(
+            _COMPARE_AND_DELETE_SCRIPT, 1, key, json.dumps(expected)
+        )
+        return bool(deleted)
+
+    async def zincrby(self, key: str, member: Any, amount: float = 1.0) -> float:
+        """
+        Increment the score of a sorted set member
+        """
+        client = await self.get_client()
+        return await client.zincrby(key, amount, member)
+
+    async def zrevrange(self, key: str, start: int = 0, end: int = -1) -> list:
+        """
+        Get sorted set members with scores, highest score first
+        """
+        client = await self.get_client()
+        return await client.zrevrange(key, start, end, withscores=True)
+
+    async def zdecay(self, key: str, factor: float) -> int:
+        """
+        Multiply every score in a sorted set by factor
+        """
+        client = await self.get_client()
+        return await client.zunionstore(key, {key: factor})
+
     async def keys(self, pattern: str) -> list:
         """
         Get keys matching pattern
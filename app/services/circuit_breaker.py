@@ -0,0 +1,181 @@
+"""
+Circuit breakers for upstream APIs
+
+Each upstream (Datura, Chutes) has a breaker that watches its recent calls.
+When too many of them fail or are slower than the upstream's slow-call
+threshold, the breaker opens: calls fail immediately with CircuitOpenError
+and callers serve cached or local fallbacks instead of waiting on timeouts.
+After CIRCUIT_OPEN_SECONDS a single trial call is let through (half-open);
+its outcome closes the breaker or opens it again.
+
+Breakers also keep recent latencies, whose p95 is the delay after which
+idempotent requests are hedged.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Latency samples kept for the p95 estimate
+LATENCY_SAMPLES = 200
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an upstream whose breaker is open
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} circuit open, retry after {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Failure- and latency-based circuit breaker for one upstream
+    """
+
+    def __init__(self, name: str, slow_call_seconds: float):
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=settings.CIRCUIT_WINDOW_SIZE)
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+
+    def before_call(self):
+        """
+        Check that a call may be made
+
+        Raises:
+            CircuitOpenError: while the breaker is open
+        """
+        if self.state == CLOSED:
+            return
+
+        now = time.monotonic()
+        remaining = self._opened_at + settings.CIRCUIT_OPEN_SECONDS - now
+        if self.state == OPEN and remaining <= 0:
+            self.state = HALF_OPEN
+            self._trial_started = None
+
+        if self.state == HALF_OPEN:
+            # Allow one trial; a trial that never reported back (e.g. it was
+            # cancelled) is replaced after another open period
+            if (
+                self._trial_started is None
+                or now - self._trial_started > settings.CIRCUIT_OPEN_SECONDS
+            ):
+                self._trial_started = now
+                return
+            remaining = self._trial_started + settings.CIRCUIT_OPEN_SECONDS - now
+
+        raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def record_success(self, duration: Optional[float]):
+        """
+        Record a completed call; slow calls count against the upstream
+
+        A duration of None records that the upstream answered (e.g. with a
+        429) without sampling its latency.
+        """
+        if duration is not None:
+            self._latencies.append(duration)
+        slow = duration is not None and duration > self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            if slow:
+                self._open(f"trial call took {duration:.1f}s")
+            else:
+                self._close()
+            return
+        self._record(not slow)
+
+    def record_failure(self):
+        """
+        Record a failed call
+        """
+        if self.state == HALF_OPEN:
+            self._open("trial call failed")
+            return
+        self._record(False)
+
+    def release_trial(self):
+        """
+        Free the half-open trial slot of a call that ended without an outcome
+        (e.g. it was cancelled or never admitted by the quota)
+        """
+        if self.state == HALF_OPEN:
+            self._trial_started = None
+
+    def _record(self, ok: bool):
+        self._outcomes.append(ok)
+        if self.state != CLOSED or len(self._outcomes) < settings.CIRCUIT_MIN_CALLS:
+            return
+        failure_rate = self._outcomes.count(False) / len(self._outcomes)
+        if failure_rate >= settings.CIRCUIT_FAILURE_RATE:
+            self._open(f"{failure_rate:.0%} of recent calls failed or were slow")
+
+    def _open(self, reason: str):
+        logger.warning(f"Opening {self.name} circuit: {reason}")
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started = None
+
+    def _close(self):
+        logger.info(f"Closing {self.name} circuit")
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._trial_started = None
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        p95 latency of recent calls, or None until there are enough samples
+        """
+        if len(self._latencies) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        return float(np.percentile(np.fromiter(self._latencies, dtype=float), 95))
+
+
+class CircuitBreakers:
+    """
+    Registry of circuit breakers, one per upstream
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._slow_call_seconds = {
+            "datura": settings.DATURA_SLOW_CALL_SECONDS,
+            "chutes": settings.CHUTES_SLOW_CALL_SECONDS,
+        }
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Get or create the breaker for an upstream
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, self._slow_call_seconds[name])
+            self._breakers[name] = breaker
+        return breaker
+
+    def reset(self):
+        """
+        Forget all breaker state (e.g. after a fork)
+        """
+        self._breakers = {}
+
+
+# Create singleton instance
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,132 @@
+"""
+Near-duplicate tweet clustering
+
+Retweets, bot spam and copy-paste shilling produce many almost identical
+tweets. Each tweet gets a 64-bit SimHash of its normalized words and word
+bigrams; tweets whose fingerprints differ in at most a few bits are clustered
+together. Candidate pairs come from locality-sensitive banding (the
+fingerprint is split into bands and only tweets sharing a band are compared),
+so clustering stays close to linear in the number of tweets.
+
+Each cluster is scored once through its representative (the first tweet of
+the cluster in input order), and its size is available as a weight.
+"""
+
+import hashlib
+import math
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+from app.core.config import settings
+from app.services.prompt import normalize_tweet_text
+
+_MENTION_RE = re.compile(r"@\w+")
+_WORD_RE = re.compile(r"[a-z0-9$#]+")
+
+FINGERPRINT_BITS = 64
+# Eight 8-bit bands: tweets within 7 bits always share at least one band
+BANDS = 8
+BAND_BITS = FINGERPRINT_BITS // BANDS
+
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def _features(text: str) -> List[str]:
+    """
+    Words and word bigrams of the normalized text, without @mentions
+    """
+    text = _MENTION_RE.sub("", normalize_tweet_text(text)).replace("'", "")
+    words = _WORD_RE.findall(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash fingerprint of a tweet
+    """
+    features = _features(text)
+    if not features:
+        return 0
+
+    hashes = np.array([_feature_hash(f) for f in features], dtype=np.uint64)
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+
+    fingerprint = 0
+    for position in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << int(position)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+def cluster_weight(size: int) -> float:
+    """
+    Weight of a cluster in the aggregate score
+
+    Grows logarithmically, so a burst of copies counts for more than a single
+    tweet but cannot drown out distinct opinions.
+    """
+    return 1.0 + math.log(size)
+
+
+def cluster_near_duplicates(
+    texts: List[str], max_distance: int = None
+) -> List[List[int]]:
+    """
+    Group near-duplicate texts
+
+    Args:
+        texts: Tweet texts, in priority order (e.g. newest first)
+        max_distance: Maximum SimHash Hamming distance within a cluster
+            (defaults to TWEET_DEDUP_MAX_DISTANCE, at most BANDS - 1)
+
+    Returns:
+        Clusters as lists of indices into texts; the first index of each
+        cluster is its representative, and clusters are ordered by it
+    """
+    if max_distance is None:
+        max_distance = settings.TWEET_DEDUP_MAX_DISTANCE
+    max_distance = min(max_distance, BANDS - 1)
+
+    # Exact copies share a fingerprint; band only the distinct fingerprints
+    members: Dict[int, List[int]] = {}
+    for i, text in enumerate(texts):
+        members.setdefault(simhash(text), []).append(i)
+    fingerprints = list(members)
+    parent = list(range(len(fingerprints)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    band_mask = (1 << BAND_BITS) - 1
+    for i, fingerprint in enumerate(fingerprints):
+        for band in range(BANDS):
+            key = (band, (fingerprint >> (band * BAND_BITS)) & band_mask)
+            for j in buckets.setdefault(key, []):
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                if hamming_distance(fingerprint, fingerprints[j]) <= max_distance:
+                    # Keep the earliest fingerprint as the root
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            buckets[key].append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i, fingerprint in enumerate(fingerprints):
+        clusters.setdefault(find(i), []).extend(members[fingerprint])
+    return [sorted(indices) for indices in clusters.values()]
@@ -0,0 +1,99 @@
+"""
+Shared HTTP clients for upstream APIs
+
+One long-lived ``httpx.AsyncClient`` per upstream (Datura, Chutes) with
+keep-alive connection pooling, HTTP/2 and separate connect/read timeouts, so
+calls reuse established TLS connections instead of paying DNS, TCP and TLS
+setup every time. The web app closes them in its lifespan and Celery workers
+close them when their event loop shuts down.
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+import httpx
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClients:
+    """
+    Registry of pooled HTTP clients, one per upstream
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._pid: Optional[int] = None
+        self._upstreams = {
+            "datura": {
+                "base_url": "https://api.datura.ai",
+                "api_key": settings.DATURA_API_KEY,
+                "read_timeout": settings.DATURA_READ_TIMEOUT,
+            },
+            "chutes": {
+                "base_url": "https://api.chutes.ai",
+                "api_key": settings.CHUTES_API_KEY,
+                "read_timeout": settings.CHUTES_READ_TIMEOUT,
+            },
+        }
+
+    def _create_client(self, name: str) -> httpx.AsyncClient:
+        upstream = self._upstreams[name]
+        logger.info(f"Creating pooled HTTP client for {name}")
+        return httpx.AsyncClient(
+            base_url=upstream["base_url"],
+            headers={
+                "Authorization": f"Bearer {upstream['api_key']}",
+                "Content-Type": "application/json",
+            },
+            http2=settings.HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                read=upstream["read_timeout"],
+                write=settings.HTTP_CONNECT_TIMEOUT,
+                pool=settings.HTTP_CONNECT_TIMEOUT,
+            ),
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Get or create the client for an upstream
+        """
+        if self._pid != os.getpid():
+            # Connections inherited through fork are unusable here
+            self.reset()
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(name)
+            self._clients[name] = client
+        return client
+
+    async def aclose(self):
+        """
+        Close all clients and their connection pools
+        """
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {name}: {e}")
+
+    def reset(self):
+        """
+        Forget the clients without closing them (e.g. after a fork)
+        """
+        self._clients = {}
+        self._pid = os.getpid()
+
+
+# Create singleton instance
+http_clients = HttpClients()
@@ -0,0 +1,116 @@
+"""
+In-memory keystore for the staking wallet
+
+Derives the coldkey and hotkey keypairs from the configured mnemonic once per
+process and keeps them in memory, so every signing path shares the same
+signer and nothing is written to ``~/.bittensor``.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+import bittensor
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryWallet:
+    """
+    Minimal wallet exposing the attributes the subtensor extrinsics use
+
+    Mirrors the parts of ``bittensor.wallet`` that are read when signing
+    (``coldkey``, ``coldkeypub``, ``hotkey``) without touching key files.
+    """
+
+    def __init__(self, name: str, hotkey_name: str, coldkey, hotkey):
+        self.name = name
+        self.hotkey_str = hotkey_name
+        self._coldkey = coldkey
+        self._hotkey = hotkey
+
+    @property
+    def coldkey(self):
+        return self._coldkey
+
+    @property
+    def coldkeypub(self):
+        return self._coldkey
+
+    @property
+    def hotkey(self):
+        return self._hotkey
+
+    def unlock_coldkey(self):
+        """Keys are held unencrypted in memory, so unlocking is a no-op"""
+        return self._coldkey
+
+    def unlock_hotkey(self):
+        """Keys are held unencrypted in memory, so unlocking is a no-op"""
+        return self._hotkey
+
+    def __repr__(self) -> str:
+        return f"InMemoryWallet(name={self.name}, coldkey={self._coldkey.ss58_address})"
+
+
+class Keystore:
+    """
+    Process-wide holder for the staking wallet keypairs
+    """
+
+    def __init__(self):
+        self._wallet: Optional[InMemoryWallet] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> InMemoryWallet:
+        """
+        Derive the keypairs from the mnemonic if this process has not done so yet
+        """
+        with self._lock:
+            if self._wallet is not None and self._pid == os.getpid():
+                return self._wallet
+
+            try:
+                logger.info("Deriving wallet keypairs from seed phrase")
+                coldkey = bittensor.Keypair.create_from_mnemonic(settings.WALLET_SEED)
+                hotkey_seed = settings.WALLET_HOTKEY_SEED or settings.WALLET_SEED
+                hotkey = (
+                    coldkey
+                    if hotkey_seed == settings.WALLET_SEED
+                    else bittensor.Keypair.create_from_mnemonic(hotkey_seed)
+                )
+            except Exception as e:
+                logger.error(f"Error deriving wallet keypairs: {e}")
+                raise
+
+            self._wallet = InMemoryWallet(
+                name="default", hotkey_name="default", coldkey=coldkey, hotkey=hotkey
+            )
+            self._pid = os.getpid()
+
+            logger.info(f"Loaded wallet with coldkey: {coldkey.ss58_address}")
+            logger.info(f"Hotkey: {hotkey.ss58_address}")
+            return self._wallet
+
+    def get_wallet(self) -> InMemoryWallet:
+        """
+        Get the shared wallet, deriving it on first use
+        """
+        if self._wallet is not None and self._pid == os.getpid():
+            return self._wallet
+        return self.load()
+
+    def clear(self):
+        """
+        Drop the cached keypairs
+        """
+        with self._lock:
+            self._wallet = None
+            self._pid = None
+
+
+# Create singleton instance
+keystore = Keystore()
@@ -0,0 +1,201 @@
+"""
+Local lexicon-based sentiment scoring
+
+A small rule-based scorer in the spirit of VADER: tweets are tokenized, each
+token is looked up in a weighted lexicon (general sentiment words plus crypto
+slang), and valences are adjusted for a preceding intensifier ("very good")
+or a negation within the previous three tokens ("not looking good"). The
+whole batch is flattened into one token array, so the lookups, negation
+windows and per-tweet sums are NumPy operations rather than per-token Python
+code.
+
+It is used when Chutes.ai is unavailable and as a pre-filter: batches the
+engine considers clearly neutral are scored locally instead of by the LLM.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# Valence per token, roughly on VADER's -4..+4 scale
+LEXICON: Dict[str, float] = {
+    # General positive
+    "good": 1.9, "great": 3.1, "excellent": 3.2, "amazing": 2.8, "awesome": 3.1,
+    "love": 3.2, "like": 1.5, "nice": 1.8, "best": 3.2, "better": 1.9,
+    "positive": 2.3, "happy": 2.7, "excited": 2.2, "exciting": 2.2,
+    "impressive": 2.3, "impressed": 2.1, "strong": 2.3, "solid": 1.9,
+    "win": 2.8, "winning": 2.4,
+    "success": 2.7, "successful": 2.8, "promising": 1.9, "progress": 1.6,
+    "improve": 1.9, "improved": 2.0, "improvement": 2.0, "growth": 1.7,
+    "growing": 1.5, "innovative": 1.9, "innovation": 1.6, "bright": 1.9,
+    "optimistic": 2.0, "confident": 2.2, "incredible": 2.6, "fantastic": 2.6,
+    "perfect": 2.7, "wow": 2.3, "congrats": 2.4, "thanks": 1.9, "useful": 1.9,
+    "reliable": 1.7, "fast": 1.0, "huge": 1.3, "gain": 2.0, "gains": 2.0,
+    "profit": 1.9, "profitable": 2.0, "upgrade": 1.5, "launch": 0.8,
+    "launched": 0.9, "partnership": 1.4, "adoption": 1.3,
+    # General negative
+    "bad": -2.5, "terrible": -2.9, "awful": -2.9, "horrible": -2.9,
+    "worst": -3.1, "worse": -2.1, "hate": -2.7, "negative": -2.3, "poor": -2.1,
+    "weak": -1.9, "fail": -2.5, "failed": -2.3, "failing": -2.3,
+    "failure": -2.6, "broken": -2.0, "bug": -1.3, "bugs": -1.3, "down": -1.0,
+    "dead": -3.0, "dying": -2.9, "scary": -2.2, "worried": -1.9,
+    "worry": -1.9, "concern": -1.4, "concerned": -1.5, "concerns": -1.4,
+    "disappointed": -2.3, "disappointing": -2.2, "sad": -2.1, "angry": -2.3,
+    "problem": -1.7, "problems": -1.7, "issue": -1.0, "issues": -1.1,
+    "risk": -1.1, "risky": -1.4, "loss": -1.9, "losses": -2.0, "lose": -1.9,
+    "losing": -1.9, "lost": -1.3, "slow": -1.0, "unstable": -1.8,
+    "outage": -2.0, "exploit": -2.3, "exploited": -2.5, "hack": -2.2,
+    "hacked": -2.7, "attack": -2.1, "stolen": -2.6, "steal": -2.3,
+    "useless": -2.4, "overpriced": -1.7, "doubt": -1.5, "unsure": -1.0,
+    "leaving": -0.8, "struggling": -1.9, "decline": -1.6, "declining": -1.7,
+    # Crypto slang
+    "bullish": 2.4, "bull": 1.6, "moon": 2.0, "mooning": 2.6, "pump": 1.2,
+    "pumping": 1.5, "ath": 2.2, "hodl": 1.2, "wagmi": 2.0, "lfg": 2.2,
+    "undervalued": 1.9, "gem": 2.1, "rally": 1.9, "breakout": 1.8,
+    "accumulate": 1.2, "accumulating": 1.2, "staking": 0.4,
+    "bearish": -2.4, "bear": -1.5, "dump": -2.2, "dumping": -2.4,
+    "dumped": -2.2, "rug": -3.0, "rugged": -3.1, "rugpull": -3.2,
+    "scam": -3.0, "scammer": -3.0, "ponzi": -3.0, "rekt": -2.6, "fud": -1.5,
+    "ngmi": -2.2, "crash": -2.6, "crashing": -2.7, "crashed": -2.6,
+    "overvalued": -1.8, "sell": -0.9, "selling": -1.0, "deregistered": -1.8,
+    "dereg": -1.6, "centralized": -1.0,
+}
+
+# Multiplier applied to the valence of the following token
+INTENSIFIERS: Dict[str, float] = {
+    "very": 1.3, "really": 1.3, "extremely": 1.45, "incredibly": 1.4,
+    "super": 1.3, "so": 1.2, "totally": 1.3, "absolutely": 1.4, "highly": 1.3,
+    "hugely": 1.35, "most": 1.25, "massively": 1.4, "insanely": 1.4,
+    "slightly": 0.7, "somewhat": 0.75, "kinda": 0.75, "kind": 0.85,
+    "barely": 0.6, "little": 0.8, "marginally": 0.7,
+}
+
+NEGATIONS = frozenset(
+    {
+        "not", "no", "never", "nothing", "none", "nobody", "neither", "nor",
+        "without", "cannot", "cant", "dont", "doesnt", "didnt", "isnt",
+        "arent", "wasnt", "werent", "wont", "wouldnt", "shouldnt", "couldnt",
+        "aint", "hardly",
+    }
+)
+
+# Valence factor for a token negated within the previous NEGATION_WINDOW tokens
+NEGATION_FACTOR = -0.74
+NEGATION_WINDOW = 3
+
+# Normalization constant for x / sqrt(x^2 + alpha), as in VADER
+NORMALIZATION_ALPHA = 15.0
+
+
+class LexiconSentimentEngine:
+    """
+    Vectorized lexicon scorer for batches of tweets
+    """
+
+    def __init__(
+        self,
+        lexicon: Dict[str, float] = LEXICON,
+        intensifiers: Dict[str, float] = INTENSIFIERS,
+        negations=NEGATIONS,
+    ):
+        # Every known word gets an id; id 0 is reserved for unknown tokens
+        vocabulary = sorted(set(lexicon) | set(intensifiers) | set(negations))
+        self._token_ids = {token: i + 1 for i, token in enumerate(vocabulary)}
+
+        size = len(vocabulary) + 1
+        self._valence = np.zeros(size)
+        self._boost = np.ones(size)
+        self._negation = np.zeros(size, dtype=bool)
+        for token, weight in lexicon.items():
+            self._valence[self._token_ids[token]] = weight
+        for token, multiplier in intensifiers.items():
+            self._boost[self._token_ids[token]] = multiplier
+        for token in negations:
+            self._negation[self._token_ids[token]] = True
+
+    def _encode(self, texts: List[str]):
+        """
+        Flatten a batch into token ids and the index of the text of each token
+        """
+        token_ids = self._token_ids
+        ids: List[int] = []
+        lengths: List[int] = []
+        negated_contractions: List[int] = []
+
+        for text in texts:
+            tokens = _TOKEN_RE.findall(text.lower())
+            for position, token in enumerate(tokens):
+                if token.endswith("n't"):
+                    negated_contractions.append(len(ids) + position)
+            ids.extend(token_ids.get(token.replace("'", ""), 0) for token in tokens)
+            lengths.append(len(tokens))
+
+        ids_array = np.fromiter(ids, dtype=np.int64, count=len(ids))
+        docs = np.repeat(np.arange(len(texts)), lengths)
+        return ids_array, docs, np.array(negated_contractions, dtype=np.int64)
+
+    def raw_valence(self, texts: List[str]) -> np.ndarray:
+        """
+        Summed, unnormalized valence of each text
+        """
+        if not texts:
+            return np.zeros(0)
+
+        ids, docs, contractions = self._encode(texts)
+        if ids.size == 0:
+            return np.zeros(len(texts))
+
+        valence = self._valence[ids]
+        is_negation = self._negation[ids]
+        is_negation[contractions] = True
+
+        # Intensifier directly before a token, within the same text
+        boost = np.ones_like(valence)
+        same_doc = docs[1:] == docs[:-1]
+        boost[1:] = np.where(same_doc, self._boost[ids[:-1]], 1.0)
+
+        # Negation anywhere in the previous NEGATION_WINDOW tokens of the same text
+        negated = np.zeros(ids.size, dtype=bool)
+        for shift in range(1, NEGATION_WINDOW + 1):
+            if shift >= ids.size:
+                break
+            negated[shift:] |= is_negation[:-shift] & (docs[shift:] == docs[:-shift])
+
+        valence = valence * boost * np.where(negated, NEGATION_FACTOR, 1.0)
+        return np.bincount(docs, weights=valence, minlength=len(texts))
+
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Score each text from -100 (very negative) to +100 (very positive)
+        """
+        raw = self.raw_valence(texts)
+        return raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA) * 100.0
+
+    def score(self, text: str) -> float:
+        """Score a single text"""
+        return float(self.score_batch([text])[0])
+
+    def aggregate(
+        self, texts: List[str], weights: Optional[List[float]] = None
+    ) -> float:
+        """
+        (Weighted) mean score of a batch of texts (0.0 for an empty batch)
+        """
+        if not texts:
+            return 0.0
+        return float(np.average(self.score_batch(texts), weights=weights))
+
+    def is_clearly_neutral(self, texts: List[str], threshold: float) -> bool:
+        """
+        Whether no text in the batch scores beyond the neutral threshold
+        """
+        if not texts:
+            return True
+        return bool(np.all(np.abs(self.score_batch(texts)) < threshold))
+
+
+# Create singleton instance
+lexicon_engine = LexiconSentimentEngine()
@@ -0,0 +1,160 @@
+"""
+Prompt building for LLM sentiment scoring
+
+Tweets are cleaned of low-value content (URLs, retweet prefixes, runs of
+emoji and whitespace), ranked by recency and engagement, trimmed to a token
+budget and packed into compact JSON prompts. Token counts are estimated, not
+exact: about four characters per token, which is close enough to keep
+prompts well inside the model context.
+"""
+
+import hashlib
+import json
+import math
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.crud.tweets import parse_tweet_time
+
+_URL_RE = re.compile(r"https?://\S+")
+_RETWEET_RE = re.compile(r"^RT @\w+:\s*", re.IGNORECASE)
+_EMOJI = "\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF"
+# An emoji followed by more emoji (including variation selectors and joiners)
+_EMOJI_RUN_RE = re.compile(f"([{_EMOJI}])[{_EMOJI}\uFE0F\u200D]+")
+_REPEATED_PUNCTUATION_RE = re.compile(r"([!?.])\1{2,}")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+PROMPT_TEMPLATE = (
+    "Score the sentiment of each tweet about Bittensor from -100 (extremely "
+    "negative) to +100 (extremely positive). Return only a JSON array of "
+    "{count} numbers, in the same order as the tweets.\nTweets: {tweets}"
+)
+
+# Tokens per tweet for the JSON quotes and separator
+PER_TWEET_OVERHEAD_TOKENS = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+PROMPT_OVERHEAD_TOKENS = estimate_tokens(PROMPT_TEMPLATE)
+
+
+def clean_tweet_text(text: str) -> str:
+    """
+    Strip content that costs tokens without carrying sentiment
+
+    URLs and the retweet prefix are removed, a run of emoji is kept as its
+    first emoji, repeated punctuation is shortened and whitespace collapsed.
+    """
+    text = _URL_RE.sub("", text or "")
+    text = _RETWEET_RE.sub("", text)
+    text = _EMOJI_RUN_RE.sub(r"\1", text)
+    text = _REPEATED_PUNCTUATION_RE.sub(r"\1\1", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def normalize_tweet_text(text: str) -> str:
+    """
+    Cleaned, lower-cased tweet text, so trivially different copies compare equal
+    """
+    return clean_tweet_text(text).lower()
+
+
+def tweet_cost(text: str) -> int:
+    """Estimated prompt tokens for one (cleaned) tweet"""
+    return estimate_tokens(text) + PER_TWEET_OVERHEAD_TOKENS
+
+
+def build_sentiment_prompt(texts: List[str]) -> str:
+    """
+    Build a compact prompt asking for one score per (cleaned) tweet
+    """
+    return PROMPT_TEMPLATE.format(
+        count=len(texts),
+        tweets=json.dumps(texts, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def prompt_hash(prompt: str) -> str:
+    """Content hash of a prompt, used to cache LLM responses"""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
+def _engagement(tweet: Dict[str, Any]) -> int:
+    metrics = tweet.get("public_metrics") or tweet
+    return sum(
+        int(metrics.get(field) or 0) * weight
+        for field, weight in (
+            ("like_count", 1),
+            ("retweet_count", 2),
+            ("quote_count", 2),
+            ("reply_count", 1),
+        )
+    )
+
+
+def tweet_priority(tweet: Dict[str, Any], now: Optional[datetime] = None) -> float:
+    """
+    Priority of a tweet in the prompt: engagement, decayed by age
+
+    Engagement counts logarithmically and halves in weight every
+    SENTIMENT_RECENCY_HALF_LIFE_HOURS.
+    """
+    now = now or datetime.now(timezone.utc)
+    age_hours = max(
+        (now - parse_tweet_time(tweet.get("created_at"))).total_seconds() / 3600, 0.0
+    )
+    decay = 0.5 ** (age_hours / settings.SENTIMENT_RECENCY_HALF_LIFE_HOURS)
+    return (1.0 + math.log1p(_engagement(tweet))) * decay
+
+
+def rank_tweets(
+    tweets: List[Dict[str, Any]], now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Order tweets by priority, highest first
+    """
+    now = now or datetime.now(timezone.utc)
+    return sorted(tweets, key=lambda tweet: tweet_priority(tweet, now), reverse=True)
+
+
+def select_within_budget(texts: List[str], token_budget: int) -> int:
+    """
+    Number of leading texts whose combined prompt cost fits the budget
+
+    At least one text is always selected.
+    """
+    used = 0
+    for count, text in enumerate(texts):
+        used += tweet_cost(clean_tweet_text(text))
+        if count and used > token_budget:
+            return count
+    return len(texts)
+
+
+def pack_batches(
+    items: List[Tuple[str, str]], token_budget: int
+) -> List[List[Tuple[str, str]]]:
+    """
+    Pack (key, cleaned text) items into batches whose prompts fit the token budget
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    batch: List[Tuple[str, str]] = []
+    used = PROMPT_OVERHEAD_TOKENS
+
+    for item in items:
+        cost = tweet_cost(item[1])
+        if batch and used + cost > token_budget:
+            batches.append(batch)
+            batch, used = [], PROMPT_OVERHEAD_TOKENS
+        batch.append(item)
+        used += cost
+
+    if batch:
+        batches.append(batch)
+    return batches
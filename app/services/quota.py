@@ -0,0 +1,203 @@
+"""
+Distributed API quota shared by the web app and Celery workers
+
+Every outbound Datura/Chutes call reserves capacity from a per-upstream
+GCRA (generic cell rate algorithm) limiter kept in Redis. The whole check
+runs in one Lua script, so all processes share the same view of the quota
+without races.
+
+Work has one of two priorities. Interactive calls (API requests) may use the
+full burst. Background calls (sweeps, staking pipelines) may only use part of
+it, so they back off first and leave headroom for users. The priority is held
+in a context variable, set with ``quota_priority()`` for a block of code;
+tasks wrap their upstream calls in ``quota_priority(BACKGROUND)``. The
+variable lives in the coroutine's context, so it must be set inside the
+coroutine a task runs on the worker loop, not around ``worker_runtime.run``.
+
+When an upstream throttles us, the upstream is blocked for every process
+until its Retry-After has passed.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache import cache
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# GCRA over the theoretical arrival time (TAT) in KEYS[1]; KEYS[2] blocks the
+# upstream after a throttling response.
+# ARGV: emission interval (ms), burst tolerance (ms)
+# Returns {allowed, retry_after_ms}
+_GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {0, blocked}
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local allow_at = tat + interval - tolerance
+if now < allow_at then
+    return {0, allow_at - now}
+end
+
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now + 1000)
+return {1, 0}
+"""
+
+_priority: ContextVar[Optional[str]] = ContextVar("quota_priority", default=None)
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when quota does not free up within the caller's maximum wait
+    """
+
+    def __init__(self, upstream: str, retry_after: float):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(
+            f"{upstream} quota exhausted, retry after {retry_after:.1f}s"
+        )
+
+
+@contextlib.contextmanager
+def quota_priority(priority: str):
+    """
+    Run a block of code with the given quota priority
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class QuotaService:
+    """
+    Redis-backed GCRA quota per upstream
+    """
+
+    def __init__(self):
+        self.enabled = settings.QUOTA_ENABLED
+        # Priority used when none is set in the current context
+        self.default_priority = INTERACTIVE
+        self._quotas = {
+            "datura": (settings.DATURA_QUOTA_PER_MINUTE, settings.DATURA_RATE_BURST),
+            "chutes": (settings.CHUTES_QUOTA_PER_MINUTE, settings.CHUTES_RATE_BURST),
+        }
+
+    def _generate_cache_key(self, upstream: str) -> str:
+        """Generate cache key for an upstream's theoretical arrival time"""
+        return f"quota:{upstream}:tat"
+
+    def _generate_blocked_key(self, upstream: str) -> str:
+        """Generate cache key marking an upstream as throttling us"""
+        return f"quota:{upstream}:blocked"
+
+    def current_priority(self) -> str:
+        """Priority of the calling context"""
+        return _priority.get() or self.default_priority
+
+    def _limits(self, upstream: str, priority: str) -> Tuple[int, int]:
+        """
+        Emission interval and burst tolerance (ms) for an upstream and priority
+        """
+        per_minute, burst = self._quotas[upstream]
+        interval = max(int(60000 / per_minute), 1)
+        if priority == BACKGROUND:
+            burst = max(int(burst * settings.QUOTA_BACKGROUND_SHARE), 1)
+        return interval, interval * burst
+
+    async def try_reserve(self, upstream: str, priority: str) -> Tuple[bool, float]:
+        """
+        Try to reserve one request
+
+        Returns:
+            Whether it was reserved, and otherwise seconds until it may be
+        """
+        interval, tolerance = self._limits(upstream, priority)
+        client = await cache.get_client()
+        allowed, retry_after_ms = await client.eval(
+            _GCRA_SCRIPT,
+            2,
+            self._generate_cache_key(upstream),
+            self._generate_blocked_key(upstream),
+            interval,
+            tolerance,
+        )
+        return bool(int(allowed)), int(retry_after_ms) / 1000
+
+    async def reserve(self, upstream: str, priority: Optional[str] = None):
+        """
+        Wait for quota to send one request to an upstream
+
+        Interactive callers wait at most QUOTA_MAX_WAIT_INTERACTIVE seconds,
+        background callers QUOTA_MAX_WAIT_BACKGROUND. If Redis is unavailable
+        the call is let through and only the local rate limiter applies.
+
+        Raises:
+            QuotaExceededError: if no quota frees up in time
+        """
+        if not self.enabled:
+            return
+
+        priority = priority or self.current_priority()
+        max_wait = (
+            settings.QUOTA_MAX_WAIT_BACKGROUND
+            if priority == BACKGROUND
+            else settings.QUOTA_MAX_WAIT_INTERACTIVE
+        )
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            try:
+                allowed, retry_after = await self.try_reserve(upstream, priority)
+            except Exception as e:
+                logger.warning(f"Quota check for {upstream} failed, allowing call: {e}")
+                return
+
+            if allowed:
+                return
+
+            remaining = deadline - time.monotonic()
+            if retry_after > remaining:
+                raise QuotaExceededError(upstream, retry_after)
+            await asyncio.sleep(retry_after)
+
+    async def block(self, upstream: str, retry_after: float):
+        """
+        Stop every process from calling an upstream for retry_after seconds
+        """
+        if not self.enabled or retry_after <= 0:
+            return
+        try:
+            client = await cache.get_client()
+            await client.set(
+                self._generate_blocked_key(upstream), 1, px=int(retry_after * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Could not share {upstream} throttling: {e}")
+
+
+# Create singleton instance
+quota_service = QuotaService()
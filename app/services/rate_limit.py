@@ -0,0 +1,156 @@
+"""
+Client-side rate limiting for upstream APIs
+
+Each upstream (Datura, Chutes) gets an adaptive token bucket. Callers
+``acquire()`` a token before every request; when the bucket is empty they
+sleep until their reserved token is due. Throttling responses (429, or a
+Retry-After header) pause the bucket for the advertised time and halve its
+rate; successful responses raise it again additively, up to the configured
+rate, so we settle just under the real quota.
+
+Reservations are made synchronously between awaits, so no lock is needed
+while all callers share one event loop (the web app, or a worker runtime).
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Multiplicative decrease on throttling, additive increase (fraction of the
+# maximum rate) on success
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.1
+
+# Pause used when a throttling response has no usable Retry-After
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta seconds or HTTP date) into seconds
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket whose rate adapts to throttling responses (AIMD)
+    """
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.max_rate = rate
+        self.min_rate = rate * MIN_RATE_FRACTION
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly borrowing from the future
+
+        Returns:
+            Seconds to wait before the token may be used
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= 1.0
+
+        delay = max(self._blocked_until - now, 0.0)
+        if self._tokens < 0:
+            delay = max(delay, -self._tokens / self.rate)
+        return delay
+
+    async def acquire(self):
+        """
+        Wait until a request may be sent
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        """
+        Record an unthrottled response and speed back up
+        """
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(
+                self.max_rate, self.rate + self.max_rate * RATE_INCREASE_FRACTION
+            )
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """
+        Record a throttling response: pause and slow down
+        """
+        now = time.monotonic()
+        self._refill(now)
+        pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        self._blocked_until = max(self._blocked_until, now + pause)
+        # Tokens handed out so far were based on the old rate
+        self._tokens = min(self._tokens, 0.0)
+        self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+        logger.warning(
+            f"{self.name} throttled us; pausing {pause:.1f}s, rate now {self.rate:.2f}/s"
+        )
+
+
+class RateLimiters:
+    """
+    Registry of token buckets, one per upstream
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, AdaptiveTokenBucket] = {}
+        self._limits = {
+            "datura": (settings.DATURA_RATE_LIMIT, settings.DATURA_RATE_BURST),
+            "chutes": (settings.CHUTES_RATE_LIMIT, settings.CHUTES_RATE_BURST),
+        }
+
+    def get(self, name: str) -> AdaptiveTokenBucket:
+        """
+        Get or create the limiter for an upstream
+        """
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            rate, burst = self._limits[name]
+            limiter = AdaptiveTokenBucket(name, rate, burst)
+            self._limiters[name] = limiter
+        return limiter
+
+    def reset(self):
+        """
+        Forget all limiter state (e.g. after a fork)
+        """
+        self._limiters = {}
+
+
+# Create singleton instance
+rate_limiters = RateLimiters()
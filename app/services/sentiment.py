@@ -1,15 +1,47 @@
 import logging
 import json
-from typing import List, Dict, Any, Optional
-import httpx
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
+import re
+import time
+import httpx
 from app.core.config import settings
 from app.services.cache import cache
+from app.services.circuit_breaker import CircuitOpenError, circuit_breakers
+from app.services.dedup import cluster_near_duplicates, cluster_weight
+from app.services.http import http_clients
+from app.services.rate_limit import parse_retry_after, rate_limiters
+from app.services.sentiment_stats import sentiment_stats_service
+from app.services.lexicon import lexicon_engine
+from app.services.quota import QuotaExceededError, quota_service
+from app.services.prompt import (
+    build_sentiment_prompt,
+    clean_tweet_text,
+    pack_batches,
+    prompt_hash,
+    rank_tweets,
+    select_within_budget,
+)
+from app.services.tweet_scores import tweet_content_hash, tweet_score_cache
 from app.models.database import async_session
-from app.crud.sentiment import create_sentiment_analysis
+from app.services.bulk_writer import bulk_writers
+from app.crud.tweets import (
+    get_recent_tweets,
+    get_tweet_cursor,
+    newest_tweet_id,
+    oldest_tweet_id,
+    set_tweet_cursor,
+    upsert_tweets,
+)
 
 logger = logging.getLogger(__name__)
 
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Raised by upstream calls in strict mode; worth retrying later
+UPSTREAM_ERRORS = (httpx.HTTPError, CircuitOpenError, QuotaExceededError)
+
 
 class SentimentService:
     """
@@ -17,22 +49,207 @@ class SentimentService:
     """
 
     def __init__(self):
-        self.datura_api_key = settings.DATURA_API_KEY
-        self.chutes_api_key = settings.CHUTES_API_KEY
         self.cache_ttl = settings.CACHE_TTL
+        self.sentiment_cache_ttl = settings.SENTIMENT_CACHE_TTL
+
+    def _normalize_query(self, query: str) -> str:
+        """Normalize a search query so equivalent spellings share a cache entry"""
+        return " ".join(query.split()).lower()
 
     def _generate_cache_key(self, query: str) -> str:
         """Generate cache key for tweet search"""
-        return f"tweets:{query}"
+        return f"tweets:{self._normalize_query(query)}"
+
+    def _generate_stale_cache_key(self, query: str) -> str:
+        """Generate cache key for the last good tweet search result"""
+        return f"tweets:stale:{self._normalize_query(query)}"
 
     def _generate_sentiment_cache_key(self, netuid: int) -> str:
         """Generate cache key for sentiment analysis"""
         return f"sentiment:netuid:{netuid}"
 
+    # Sorted set of netuid -> (decayed) number of sentiment requests
+    QUERY_COUNTS_KEY = "sentiment:query_counts"
+
+    async def _post(
+        self,
+        upstream: str,
+        path: str,
+        payload: Dict[str, Any],
+        sent: Optional[asyncio.Event] = None,
+    ):
+        """
+        POST to an upstream through its circuit breaker, the shared quota and
+        its rate limiter
+
+        Calls fail fast with CircuitOpenError while the upstream's breaker is
+        open. Every attempt reserves capacity from the Redis quota (with the
+        caller's priority) and the local token bucket. Throttled requests
+        (429) block the upstream for the Retry-After time in all processes
+        and are retried up to UPSTREAM_THROTTLE_RETRIES times.
+
+        If given, sent is set while an attempt is on the wire and cleared
+        while it waits for admission (quota and rate limiter).
+
+        Returns:
+            The response (raises on HTTP errors, CircuitOpenError or
+            QuotaExceededError)
+        """
+        client = http_clients.get(upstream)
+        limiter = rate_limiters.get(upstream)
+        breaker = circuit_breakers.get(upstream)
+
+        for attempt in range(settings.UPSTREAM_THROTTLE_RETRIES + 1):
+            if sent is not None:
+                sent.clear()
+            breaker.before_call()
+            # Every exit records an outcome or frees a half-open trial slot
+            recorded = False
+            try:
+                await quota_service.reserve(upstream)
+                await limiter.acquire()
+                if sent is not None:
+                    sent.set()
+
+                started = time.monotonic()
+                try:
+                    response = await client.post(path, json=payload)
+                except Exception:
+                    breaker.record_failure()
+                    recorded = True
+                    raise
+
+                duration = time.monotonic() - started
+                if response.status_code == 429:
+                    # Throttled, but alive; fast 429s would skew the p95
+                    breaker.record_success(None)
+                    recorded = True
+                else:
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError:
+                        if response.status_code >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success(duration)
+                        recorded = True
+                        raise
+                    breaker.record_success(duration)
+                    recorded = True
+            finally:
+                if not recorded:
+                    breaker.release_trial()
+
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                limiter.on_throttled(retry_after)
+                await quota_service.block(upstream, retry_after or 0.0)
+                logger.warning(
+                    f"{upstream} rate limited {path} (attempt {attempt + 1}), backing off"
+                )
+                continue
+
+            limiter.on_success()
+            return response
+
+        response.raise_for_status()
+        return response
+
+    async def _hedged_post(self, upstream: str, path: str, payload: Dict[str, Any]):
+        """
+        POST an idempotent request, sending a second copy if the first is
+        slower than the upstream's recent p95 latency
+
+        Whichever copy succeeds first wins and the other is cancelled. The
+        p95 covers only the time on the wire, so the hedge delay starts once
+        the first copy has cleared the quota and rate limiter: a request
+        queued for quota is never hedged, which would only add demand.
+        """
+        p95 = circuit_breakers.get(upstream).hedge_delay()
+        if p95 is None:
+            return await self._post(upstream, path, payload)
+
+        delay = max(p95, settings.HEDGE_MIN_DELAY)
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._post(upstream, path, payload, sent))
+        try:
+            while True:
+                waiting = asyncio.ensure_future(sent.wait())
+                try:
+                    await asyncio.wait(
+                        {primary, waiting}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    waiting.cancel()
+                if not primary.done():
+                    await asyncio.wait({primary}, timeout=delay)
+                if primary.done():
+                    return primary.result()
+                # Throttled and back waiting for admission: don't hedge yet
+                if sent.is_set():
+                    break
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+        logger.info(f"Hedging {upstream} {path} after {delay:.2f}s")
+        hedge = asyncio.ensure_future(self._post(upstream, path, payload))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_tweets(
+        self,
+        query: str,
+        limit: int,
+        since_id: Optional[str] = None,
+        max_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch recent tweets from Datura.ai
+
+        Args:
+            query: Search query
+            limit: Maximum number of tweets to return
+            since_id: Only return tweets newer than this tweet ID
+            max_id: Only return tweets at or older than this tweet ID
+
+        Returns:
+            List of tweet data (raises on upstream errors)
+        """
+        payload = {"query": query, "limit": limit, "sort": "recent"}
+        if since_id:
+            payload["since_id"] = since_id
+        if max_id:
+            payload["max_id"] = max_id
+
+        # Searches are idempotent, so slow ones can safely be hedged
+        response = await self._hedged_post("datura", "/v1/twitter/search", payload)
+        result = response.json()
+
+        # Extract the actual tweet data
+        return result.get("data") or []
+
     async def search_tweets(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search for tweets using Datura.ai
 
+        Cached results remember how deep they were fetched. A smaller limit
+        is served by slicing a deeper result; a larger one only fetches the
+        missing older tail.
+
         Args:
             query: Search query
             limit: Maximum number of tweets to return
@@ -44,43 +261,55 @@ class SentimentService:
 
         # Check cache first
         cache_key = self._generate_cache_key(query)
-        cached_result = await cache.get(cache_key)
-        if cached_result:
+        entry = await cache.get(cache_key)
+        if not isinstance(entry, dict):
+            entry = None
+        if entry and (entry["limit"] >= limit or entry["exhausted"]):
             logger.info(f"Returning cached tweets for query: {query}")
-            return cached_result
-
-        datura_endpoint = "https://api.datura.ai/v1/twitter/search"
+            return entry["tweets"][:limit]
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    datura_endpoint,
-                    headers={
-                        "Authorization": f"Bearer {self.datura_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={"query": query, "limit": limit, "sort": "recent"},
-                    timeout=30.0,
-                )
-
-                response.raise_for_status()
-                result = response.json()
-
-                if not result.get("data"):
-                    logger.warning(f"No tweets found for query: {query}")
-                    return []
-
-                # Extract the actual tweet data
-                tweets = result.get("data", [])
+            if entry:
+                tweets = await self._fetch_tweet_tail(query, entry, limit)
+                fetched_at = entry["fetched_at"]
+            else:
+                tweets = await self._fetch_tweets(query, limit)
+                fetched_at = time.time()
 
-                # Cache the results
-                await cache.set(cache_key, tweets, ttl=self.cache_ttl)
+            if not tweets:
+                logger.warning(f"No tweets found for query: {query}")
+                return []
+
+            # Cache the results with their depth, and keep a long-lived copy
+            # as a fallback. The entry expires with its oldest part.
+            ttl = max(int(fetched_at + self.cache_ttl - time.time()), 1)
+            await cache.set(
+                cache_key,
+                {
+                    "limit": limit,
+                    "exhausted": len(tweets) < limit,
+                    "fetched_at": fetched_at,
+                    "tweets": tweets,
+                },
+                ttl=ttl,
+            )
+            await cache.set(
+                self._generate_stale_cache_key(query),
+                tweets,
+                ttl=settings.STALE_CACHE_TTL,
+            )
 
-                logger.info(f"Found {len(tweets)} tweets for query: {query}")
-                return tweets
+            logger.info(f"Found {len(tweets)} tweets for query: {query}")
+            return tweets[:limit]
 
         except Exception as e:
             logger.error(f"Error searching tweets: {e}")
+
+            stale_tweets = await self._get_stale_tweets(query)
+            if stale_tweets:
+                logger.info(f"Returning stale tweets for query: {query}")
+                return stale_tweets[:limit]
+
             # Provide mock data for development
             mock_tweets = [
                 {
@@ -98,12 +327,262 @@ class SentimentService:
             ]
             return mock_tweets
 
-    async def analyze_sentiment(self, tweets: List[Dict[str, Any]]) -> float:
+    async def _fetch_tweet_tail(
+        self, query: str, entry: Dict[str, Any], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Extend a cached search result with older tweets up to limit
+
+        Returns:
+            Cached tweets followed by the newly fetched older ones
+        """
+        tweets = entry["tweets"]
+        missing = limit - len(tweets)
+        logger.info(f"Fetching {missing} older tweets for query: {query}")
+
+        # max_id is inclusive, so one more is requested for the boundary tweet
+        tail = await self._fetch_tweets(
+            query, missing + 1, max_id=oldest_tweet_id(tweets)
+        )
+        seen = {str(tweet.get("id")) for tweet in tweets}
+        tail = [tweet for tweet in tail if str(tweet.get("id")) not in seen]
+        return tweets + tail[:missing]
+
+    async def _get_stale_tweets(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the last good search result for a query, however old
+        """
+        try:
+            return await cache.get(self._generate_stale_cache_key(query))
+        except Exception as e:
+            logger.warning(f"Could not read stale tweets for query {query}: {e}")
+            return None
+
+    def _parse_scores(self, text: str, count: int) -> List[Optional[float]]:
+        """
+        Parse one score per tweet from the LLM response
+
+        Accepts a JSON array of numbers, or a bare number for a single tweet.
+        Returns None for every tweet if the response cannot be matched up.
+        """
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = [float(n) for n in _NUMBER_RE.findall(text)]
+
+        if isinstance(parsed, (int, float)):
+            parsed = [parsed]
+
+        if not isinstance(parsed, list) or len(parsed) != count:
+            logger.error(f"Could not parse sentiment scores: {text}")
+            return [None] * count
+
+        scores = []
+        for value in parsed:
+            try:
+                # Ensure the score is within the valid range
+                scores.append(max(-100.0, min(100.0, float(value))))
+            except (TypeError, ValueError):
+                scores.append(None)
+        return scores
+
+    async def _score_texts_with_llm(self, texts: List[str]) -> List[Optional[float]]:
+        """
+        Score each tweet text with Chutes.ai
+
+        Texts are expected to be cleaned already (see prompt.clean_tweet_text).
+        Responses are cached by prompt hash, so an identical batch is only
+        sent once.
+
+        Returns:
+            One score per text (None where the response could not be parsed)
+        """
+        prompt = build_sentiment_prompt(texts)
+        content_hash = prompt_hash(prompt)
+
+        cached_scores = await tweet_score_cache.get_response(content_hash)
+        if cached_scores is not None and len(cached_scores) == len(texts):
+            logger.info(f"Returning cached sentiment response for {len(texts)} tweets")
+            return cached_scores
+
+        # Use Chutes.ai API for sentiment analysis
+        response = await self._post(
+            "chutes",
+            "/v1/generate",
+            {
+                "chute_id": "20acffc0-0c5f-58e3-97af-21fc0b261ec4",  # Sentiment analysis chute
+                "prompt": prompt,
+                "max_tokens": 16 + 8 * len(texts),
+                "temperature": 0.0,  # Keep deterministic
+            },
+        )
+        result = response.json()
+
+        scores = self._parse_scores(result.get("text", "").strip(), len(texts))
+        if any(score is not None for score in scores):
+            await tweet_score_cache.set_response(content_hash, scores)
+        return scores
+
+    async def _score_batch(self, batch: List[Tuple[str, str]]) -> Dict[str, float]:
+        """
+        Score one batch, splitting it in half when the response cannot be parsed
+        """
+        scores = await self._score_texts_with_llm([text for _, text in batch])
+
+        if len(batch) > 1 and all(score is None for score in scores):
+            logger.warning(f"Retrying unparseable batch of {len(batch)} as two halves")
+            middle = len(batch) // 2
+            left = await self._score_batch(batch[:middle])
+            right = await self._score_batch(batch[middle:])
+            return {**left, **right}
+
+        return {
+            content_hash: score
+            for (content_hash, _), score in zip(batch, scores)
+            if score is not None
+        }
+
+    async def score_tweets(
+        self,
+        tweet_texts: List[str],
+        token_budget: Optional[int] = None,
+        strict: bool = False,
+    ) -> Dict[str, float]:
+        """
+        Score tweet texts, sending only uncached ones to Chutes.ai
+
+        Unseen tweets are packed into as few requests as the token budget
+        allows. Batches the local lexicon engine finds clearly neutral are
+        scored locally instead. A failed request leaves its tweets unscored,
+        or with strict, raises its error once the other batches are cached.
+
+        Args:
+            tweet_texts: Tweet texts, possibly from several subnets
+            token_budget: Maximum estimated prompt tokens per request
+            strict: Raise upstream errors instead of leaving tweets unscored
+
+        Returns:
+            Dictionary of content hash to score for every tweet that has one
+        """
+        token_budget = token_budget or settings.SENTIMENT_BATCH_TOKEN_BUDGET
+        hashes = [tweet_content_hash(text) for text in tweet_texts]
+
+        scores = await tweet_score_cache.get_scores(hashes)
+        unseen = {h: text for h, text in zip(hashes, tweet_texts) if h not in scores}
+        if not unseen:
+            return scores
+
+        batches = pack_batches(
+            [(h, clean_tweet_text(text)) for h, text in unseen.items()], token_budget
+        )
+        logger.info(f"Scoring {len(unseen)} new tweets in {len(batches)} requests")
+
+        local_scores: Dict[str, float] = {}
+        llm_batches = []
+        for batch in batches:
+            texts = [text for _, text in batch]
+            if lexicon_engine.is_clearly_neutral(
+                texts, settings.LEXICON_NEUTRAL_THRESHOLD
+            ):
+                # Nothing for the LLM to pick up; keep the local scores uncached
+                local_scores.update(
+                    zip((h for h, _ in batch), lexicon_engine.score_batch(texts).tolist())
+                )
+            else:
+                llm_batches.append(batch)
+
+        # Batches run concurrently; the Chutes rate limiter paces them
+        results = await asyncio.gather(
+            *(self._score_batch(batch) for batch in llm_batches),
+            return_exceptions=True,
+        )
+        new_scores: Dict[str, float] = {}
+        errors = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error analyzing sentiment: {result}")
+                errors.append(result)
+            else:
+                new_scores.update(result)
+
+        if local_scores:
+            logger.info(f"Scored {len(local_scores)} neutral tweets locally")
+
+        await tweet_score_cache.set_scores(new_scores)
+        if strict and errors:
+            raise errors[0]
+        scores.update(local_scores)
+        scores.update(new_scores)
+        return scores
+
+    def _prepare_texts(
+        self, tweets: List[Dict[str, Any]]
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Pick the tweet texts to score and their weights
+
+        Tweets are ranked by recency and engagement, near-duplicates are
+        collapsed into their highest-ranked copy, and the clusters are cut off
+        at SENTIMENT_SUBNET_TOKEN_BUDGET estimated prompt tokens.
+
+        Returns:
+            Representative texts and their cluster weights
+        """
+        tweet_texts = [tweet.get("text", "") for tweet in rank_tweets(tweets)]
+        clusters = cluster_near_duplicates(tweet_texts)
+        if len(clusters) < len(tweet_texts):
+            logger.info(
+                f"Collapsed {len(tweet_texts)} tweets into {len(clusters)} clusters"
+            )
+
+        representatives = [tweet_texts[cluster[0]] for cluster in clusters]
+        weights = [cluster_weight(len(cluster)) for cluster in clusters]
+
+        count = select_within_budget(
+            representatives, settings.SENTIMENT_SUBNET_TOKEN_BUDGET
+        )
+        if count < len(representatives):
+            logger.info(
+                f"Token budget keeps {count} of {len(representatives)} tweet clusters"
+            )
+        return representatives[:count], weights[:count]
+
+    def _aggregate(
+        self,
+        tweet_texts: List[str],
+        scores: Dict[str, float],
+        weights: Optional[List[float]] = None,
+    ) -> float:
+        """
+        Weighted mean score of the given tweets, falling back when none were scored
+        """
+        weights = weights or [1.0] * len(tweet_texts)
+        scored = [
+            (scores[h], weight)
+            for h, weight in zip(map(tweet_content_hash, tweet_texts), weights)
+            if h in scores
+        ]
+        if not scored:
+            return self._fallback_sentiment(tweet_texts, weights)
+        return sum(score * weight for score, weight in scored) / sum(
+            weight for _, weight in scored
+        )
+
+    async def analyze_sentiment(
+        self, tweets: List[Dict[str, Any]], strict: bool = False
+    ) -> float:
         """
         Analyze sentiment of tweets using Chutes.ai
 
+        The highest-priority tweets that fit the token budget are kept, and
+        near-duplicates (retweets, spam, copy-paste) are scored once per
+        cluster. Scores are cached per tweet by content hash, so only tweets
+        that were not seen before are sent to the LLM. The result is the mean
+        of the cluster scores, weighted by cluster size.
+
         Args:
             tweets: List of tweets to analyze
+            strict: Raise upstream errors instead of falling back to the lexicon
 
         Returns:
             Sentiment score from -100 (very negative) to +100 (very positive)
@@ -114,82 +593,253 @@ class SentimentService:
 
         logger.info(f"Analyzing sentiment of {len(tweets)} tweets")
 
-        # Extract text from tweets
-        tweet_texts = [tweet.get("text", "") for tweet in tweets]
+        representatives, weights = self._prepare_texts(tweets)
+        scores = await self.score_tweets(representatives, strict=strict)
+        sentiment_score = self._aggregate(representatives, scores, weights)
+
+        logger.info(f"Sentiment analysis complete. Score: {sentiment_score}")
+        return sentiment_score
 
-        # Format the prompt for sentiment analysis
-        prompt = f"""
-        Analyze the sentiment of the following tweets about Bittensor:
-        
-        {json.dumps(tweet_texts, indent=2)}
-        
-        Return a sentiment score from -100 (extremely negative) to +100 (extremely positive).
-        Just return the numerical score.
+    async def score_subnets(
+        self,
+        tweets_by_netuid: Dict[int, List[Dict[str, Any]]],
+        token_budget: Optional[int] = None,
+    ) -> Dict[int, float]:
         """
+        Score several subnets with shared, batched Chutes.ai requests
 
-        # Use Chutes.ai API for sentiment analysis
-        chutes_endpoint = "https://api.chutes.ai/v1/generate"
+        Tweets from all subnets are deduplicated and packed together, so a
+        sweep pays the prompt overhead and round-trip once per batch instead
+        of once per subnet.
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    chutes_endpoint,
-                    headers={
-                        "Authorization": f"Bearer {self.chutes_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "chute_id": "20acffc0-0c5f-58e3-97af-21fc0b261ec4",  # Sentiment analysis chute
-                        "prompt": prompt,
-                        "max_tokens": 50,
-                        "temperature": 0.0,  # Keep deterministic
-                    },
-                    timeout=60.0,
-                )
+        Args:
+            tweets_by_netuid: Tweets for each subnet
+            token_budget: Maximum estimated prompt tokens per request
 
-                response.raise_for_status()
-                result = response.json()
+        Returns:
+            Dictionary of netuid to sentiment score (-100 to +100)
+        """
+        clusters_by_netuid = {
+            netuid: self._prepare_texts(tweets)
+            for netuid, tweets in tweets_by_netuid.items()
+        }
+        all_texts = [
+            text for texts, _ in clusters_by_netuid.values() for text in texts
+        ]
+
+        scores = await self.score_tweets(all_texts, token_budget)
+
+        return {
+            netuid: self._aggregate(texts, scores, weights) if texts else 0.0
+            for netuid, (texts, weights) in clusters_by_netuid.items()
+        }
+
+    def _fallback_sentiment(
+        self, tweet_texts: List[str], weights: Optional[List[float]] = None
+    ) -> float:
+        """
+        Local lexicon sentiment used when the LLM is unavailable
+        """
+        return lexicon_engine.aggregate(tweet_texts, weights)
 
-                # Extract the sentiment score from the response
-                sentiment_text = result.get("text", "0").strip()
-                try:
-                    # Parse the sentiment score
-                    sentiment_score = float(sentiment_text)
+    def build_subnet_query(self, netuid: int) -> str:
+        """Build the tweet search query for a subnet"""
+        return f"Bittensor netuid {netuid}"
 
-                    # Ensure the score is within the valid range
-                    sentiment_score = max(-100.0, min(100.0, sentiment_score))
+    async def ingest_tweets(
+        self, query: str, netuid: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch tweets newer than the stored cursor and persist them
 
-                    logger.info(
-                        f"Sentiment analysis complete. Score: {sentiment_score}"
-                    )
-                    return sentiment_score
+        Searches return the newest tweets first, so when more than a page
+        arrived since the cursor, older pages are fetched (max_id below the
+        oldest tweet seen) until the cursor is reached. Every page is stored
+        as it arrives, but the cursor only advances once the whole gap back to
+        it is covered; if TWEET_INGEST_MAX_PAGES runs out first, it stays put
+        and the next refresh retries.
 
-                except ValueError:
-                    logger.error(f"Could not parse sentiment score: {sentiment_text}")
-                    return 0.0
+        Args:
+            query: Search query
+            netuid: Subnet the query belongs to, if any
 
-        except Exception as e:
-            logger.error(f"Error analyzing sentiment: {e}")
-
-            # Return a mock sentiment for development purposes
-            # Calculate a simple mock sentiment based on tweet content
-            positive_count = sum(
-                1
-                for text in tweet_texts
-                if "positive" in text.lower() or "good" in text.lower()
+        Returns:
+            List of newly fetched tweets, newest first
+        """
+        async with async_session() as db:
+            since_id = await get_tweet_cursor(db, query)
+
+        limit = settings.TWEET_INGEST_LIMIT
+        tweets: List[Dict[str, Any]] = []
+        max_id: Optional[str] = None
+        complete = False
+        for _ in range(settings.TWEET_INGEST_MAX_PAGES):
+            page = await self._fetch_tweets(
+                query, limit, since_id=since_id, max_id=max_id
             )
-            negative_count = sum(
-                1
-                for text in tweet_texts
-                if "negative" in text.lower() or "bad" in text.lower()
+            if page:
+                async with async_session() as db:
+                    await upsert_tweets(db, query, page, netuid=netuid)
+                tweets.extend(page)
+
+            oldest_id = oldest_tweet_id(page)
+            # Without a cursor there is no gap to fill: one page seeds it
+            if len(page) < limit or since_id is None or oldest_id is None:
+                complete = True
+                break
+            max_id = str(int(oldest_id) - 1)
+
+        if not tweets:
+            return []
+
+        newest_id = newest_tweet_id(tweets)
+        if complete and newest_id:
+            async with async_session() as db:
+                await set_tweet_cursor(db, query, newest_id)
+        elif not complete:
+            logger.warning(
+                f"Backfill for query {query} stopped after "
+                f"{settings.TWEET_INGEST_MAX_PAGES} pages before reaching the cursor"
             )
 
-            if positive_count > negative_count:
-                return 75.0  # Mock positive sentiment
-            elif negative_count > positive_count:
-                return -75.0  # Mock negative sentiment
-            else:
-                return 0.0  # Mock neutral sentiment
+        logger.info(f"Ingested {len(tweets)} new tweets for query: {query}")
+        return tweets
+
+    async def get_subnet_tweets(
+        self,
+        netuid: int,
+        window: Optional[timedelta] = None,
+        limit: Optional[int] = None,
+        strict: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a subnet's recent tweets from the tweets table
+
+        Only tweets newer than the stored cursor are downloaded; the window
+        is then read from the database. The search API is only called again
+        if ingestion failed and nothing is stored.
+
+        Args:
+            netuid: Subnet ID
+            window: How far back to look (defaults to SENTIMENT_TWEET_WINDOW_HOURS)
+            limit: Maximum number of tweets (defaults to SENTIMENT_TWEET_LIMIT)
+            strict: Raise upstream errors instead of serving stored, stale or
+                mock tweets (for callers that retry, like the staking pipeline)
+
+        Returns:
+            List of tweet data, newest first
+        """
+        query = self.build_subnet_query(netuid)
+        window = window or timedelta(hours=settings.SENTIMENT_TWEET_WINDOW_HOURS)
+        limit = limit or settings.SENTIMENT_TWEET_LIMIT
+
+        ingested = True
+        try:
+            await self.ingest_tweets(query, netuid=netuid)
+        except Exception as e:
+            if strict:
+                raise
+            # Serve what is already stored
+            logger.error(f"Error ingesting tweets for query {query}: {e}")
+            ingested = False
+
+        async with async_session() as db:
+            stored = await get_recent_tweets(
+                db, query, since=datetime.now(timezone.utc) - window, limit=limit
+            )
+
+        if not stored and not ingested:
+            return await self.search_tweets(query, limit)
+
+        return [
+            tweet.data or {"id": tweet.id, "text": tweet.text} for tweet in stored
+        ]
+
+    async def get_cached_subnet_sentiment(self, netuid: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached sentiment result for a subnet, if any
+        """
+        cached_result = await cache.get(self._generate_sentiment_cache_key(netuid))
+        if cached_result:
+            return {**cached_result, "cached": True}
+        return None
+
+    async def score_subnet_tweets(
+        self, netuid: int, tweets: List[Dict[str, Any]], strict: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Score already fetched tweets for a subnet, then store and cache the result
+
+        Args:
+            netuid: Subnet ID
+            tweets: Tweets returned by search_tweets
+            strict: Raise upstream errors instead of storing a fallback score
+
+        Returns:
+            Dictionary with sentiment score and related data
+        """
+        cache_key = self._generate_sentiment_cache_key(netuid)
+
+        # If no tweets found, return neutral sentiment
+        if not tweets:
+            result = {
+                "netuid": netuid,
+                "sentiment_score": 0.0,
+                "tweet_count": 0,
+                "error": None,
+                "cached": False,
+            }
+            await cache.set(cache_key, result, ttl=self.sentiment_cache_ttl)
+            return result
+
+        # Analyze sentiment of tweets
+        sentiment_score = await self.analyze_sentiment(tweets, strict=strict)
+
+        return await self._store_subnet_sentiment(netuid, tweets, sentiment_score)
+
+    async def _store_subnet_sentiment(
+        self, netuid: int, tweets: List[Dict[str, Any]], sentiment_score: float
+    ) -> Dict[str, Any]:
+        """
+        Store a subnet's sentiment score in the database and cache
+        """
+        # Prepare result
+        result = {
+            "netuid": netuid,
+            "sentiment_score": sentiment_score,
+            "tweet_count": len(tweets),
+            "error": None,
+            "cached": False,
+        }
+
+        # Store in database (buffered; sweeps write many subnets at once)
+        await bulk_writers.get("sentiment_analyses").write(
+            {
+                "netuid": netuid,
+                "sentiment_score": sentiment_score,
+                "tweet_count": len(tweets),
+                # Store first 5 tweets, full tweets live in the tweets table
+                "data": {
+                    "tweets": [t.get("text", "") for t in tweets[:5]],
+                    "tweet_ids": [t.get("id") for t in tweets if t.get("id")],
+                },
+            }
+        )
+
+        # Update the rolling aggregates
+        try:
+            await sentiment_stats_service.record(netuid, sentiment_score)
+        except Exception as e:
+            logger.error(f"Error updating sentiment stats for netuid {netuid}: {e}")
+
+        # Cache the result
+        await cache.set(
+            self._generate_sentiment_cache_key(netuid),
+            result,
+            ttl=self.sentiment_cache_ttl,
+        )
+
+        return result
 
     async def get_subnet_sentiment(self, netuid: int) -> Dict[str, Any]:
         """
@@ -202,62 +852,61 @@ class SentimentService:
             Dictionary with sentiment score and related data
         """
         try:
+            await self.record_subnet_query(netuid)
+
             # Check cache first
-            cache_key = self._generate_sentiment_cache_key(netuid)
-            cached_result = await cache.get(cache_key)
+            cached_result = await self.get_cached_subnet_sentiment(netuid)
             if cached_result:
                 logger.info(f"Returning cached sentiment for netuid {netuid}")
-                return {**cached_result, "cached": True}
+                return cached_result
 
-            # Construct search query
-            query = f"Bittensor netuid {netuid}"
+            # Get new and stored tweets
+            tweets = await self.get_subnet_tweets(netuid)
 
-            # Search for tweets
-            tweets = await self.search_tweets(query, limit=20)
+            return await self.score_subnet_tweets(netuid, tweets)
 
-            # If no tweets found, return neutral sentiment
-            if not tweets:
-                result = {
-                    "netuid": netuid,
-                    "sentiment_score": 0.0,
-                    "tweet_count": 0,
-                    "error": None,
-                    "cached": False,
-                }
-                await cache.set(cache_key, result, ttl=self.cache_ttl)
-                return result
-
-            # Analyze sentiment of tweets
-            sentiment_score = await self.analyze_sentiment(tweets)
-
-            # Prepare result
-            result = {
+        except Exception as e:
+            logger.error(f"Error getting subnet sentiment: {e}")
+            return {
                 "netuid": netuid,
-                "sentiment_score": sentiment_score,
-                "tweet_count": len(tweets),
-                "error": None,
+                "sentiment_score": 0.0,
+                "tweet_count": 0,
+                "error": str(e),
                 "cached": False,
             }
 
-            # Store in database
-            async with async_session() as db:
-                await create_sentiment_analysis(
-                    db=db,
-                    netuid=netuid,
-                    sentiment_score=sentiment_score,
-                    tweet_count=len(tweets),
-                    data={
-                        "tweets": [t.get("text", "") for t in tweets[:5]]
-                    },  # Store first 5 tweets
-                )
+    async def record_subnet_query(self, netuid: int):
+        """
+        Count a sentiment request for a subnet, used to prioritize sweeps
+        """
+        try:
+            await cache.zincrby(self.QUERY_COUNTS_KEY, str(netuid))
+        except Exception as e:
+            logger.warning(f"Could not record sentiment query for netuid {netuid}: {e}")
 
-            # Cache the result
-            await cache.set(cache_key, result, ttl=self.cache_ttl)
+    async def get_sweep_order(self, netuids: List[int]) -> List[int]:
+        """
+        Order netuids by how often their sentiment is requested, busiest first
+        """
+        ranked = await cache.zrevrange(self.QUERY_COUNTS_KEY)
+        counts = {int(netuid): score for netuid, score in ranked}
+        return sorted(netuids, key=lambda netuid: (-counts.get(netuid, 0.0), netuid))
 
-            return result
+    async def refresh_subnet_sentiment(self, netuid: int) -> Dict[str, Any]:
+        """
+        Recompute sentiment for a subnet, ignoring the cached score
+
+        Args:
+            netuid: Subnet ID
 
+        Returns:
+            Dictionary with sentiment score and related data
+        """
+        try:
+            tweets = await self.get_subnet_tweets(netuid)
+            return await self.score_subnet_tweets(netuid, tweets)
         except Exception as e:
-            logger.error(f"Error getting subnet sentiment: {e}")
+            logger.error(f"Error refreshing sentiment for netuid {netuid}: {e}")
             return {
                 "netuid": netuid,
                 "sentiment_score": 0.0,
@@ -266,6 +915,74 @@ class SentimentService:
                 "cached": False,
             }
 
+    async def refresh_subnets(self, netuids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Recompute sentiment for several subnets
+
+        Tweets are fetched for up to SENTIMENT_SWEEP_CONCURRENCY subnets at
+        a time (started in the given order), then scored together with
+        batched Chutes.ai requests. The per-upstream rate limiters keep the
+        concurrent calls within quota.
+
+        Args:
+            netuids: Subnet IDs, highest priority first
+
+        Returns:
+            List of sentiment results, in the order of netuids
+        """
+        semaphore = asyncio.Semaphore(settings.SENTIMENT_SWEEP_CONCURRENCY)
+
+        async def fetch(netuid: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_subnet_tweets(netuid)
+
+        # One subnet's failure must not cost the others their refresh
+        fetched = await asyncio.gather(
+            *(fetch(netuid) for netuid in netuids), return_exceptions=True
+        )
+        errors = {
+            netuid: result
+            for netuid, result in zip(netuids, fetched)
+            if isinstance(result, Exception)
+        }
+        if errors:
+            logger.error(
+                f"Error fetching tweets for netuids {sorted(errors)}, skipping: "
+                f"{next(iter(errors.values()))}"
+            )
+        tweets_by_netuid = {
+            netuid: tweets
+            for netuid, tweets in zip(netuids, fetched)
+            if netuid not in errors
+        }
+
+        scores = await self.score_subnets(tweets_by_netuid)
+
+        results = []
+        for netuid in netuids:
+            if netuid in errors:
+                results.append(self._failed_refresh(netuid, errors[netuid]))
+                continue
+            try:
+                results.append(
+                    await self._store_subnet_sentiment(
+                        netuid, tweets_by_netuid[netuid], scores[netuid]
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error refreshing sentiment for netuid {netuid}: {e}")
+                results.append(self._failed_refresh(netuid, e))
+        return results
+
+    def _failed_refresh(self, netuid: int, error: Exception) -> Dict[str, Any]:
+        return {
+            "netuid": netuid,
+            "sentiment_score": 0.0,
+            "tweet_count": 0,
+            "error": str(error),
+            "cached": False,
+        }
+
 
 # Create singleton instance
 sentiment_service = SentimentService()
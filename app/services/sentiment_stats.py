@@ -0,0 +1,215 @@
+"""
+Rolling sentiment statistics per subnet
+
+Each new sentiment score updates a small rolling state per netuid instead of
+being aggregated from SentimentAnalysis history on every read:
+
+- an EWMA with a time-based half-life, so irregularly spaced scores are
+  weighted by how old they are rather than by how many came after them
+  (scores sharing a timestamp count as their mean);
+- 1h, 24h and 7d windows, each a fixed ring of buckets holding count, sum,
+  sum of squares, min and max.
+
+The state is a few kilobytes of JSON in Redis, updated with compare-and-set so
+concurrent writers (sweeps, staking pipelines, API requests) do not lose
+updates. Reads touch a fixed number of buckets regardless of history length.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Window name -> (length in seconds, number of buckets)
+WINDOWS = {
+    "1h": (3600, 12),
+    "24h": (24 * 3600, 24),
+    "7d": (7 * 24 * 3600, 28),
+}
+
+# Retries of a compare-and-set update that lost a race
+MAX_UPDATE_ATTEMPTS = 5
+
+# Bucket layout: [slot, count, sum, sum of squares, min, max]
+_SLOT, _COUNT, _SUM, _SUMSQ, _MIN, _MAX = range(6)
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "ewma": None,
+        # EWMA before the latest timestamp's scores, their alpha, count and mean
+        "ewma_base": None,
+        "tie_alpha": None,
+        "tie_count": 0,
+        "tie_mean": None,
+        "last_score": None,
+        "updated_at": None,
+        "count": 0,
+        "windows": {name: [] for name in WINDOWS},
+    }
+
+
+def fold_ewma(state: Dict[str, Any], score: float, now: float, half_life: float):
+    """
+    Fold a score into a state's EWMA, in place
+
+    A score with the same timestamp as the previous one (e.g. a bulk write's
+    shared created_at) has no elapsed time and would get alpha = 0. Instead,
+    the scores at one timestamp are averaged, and their mean takes the step
+    from the EWMA before them. Late scores join the latest timestamp.
+    """
+    updated_at = state.get("updated_at")
+    if state.get("ewma") is None:
+        base, alpha, ties, tie_mean = None, 1.0, 1, score
+    elif now <= updated_at and state.get("tie_count"):
+        base, alpha = state["ewma_base"], state["tie_alpha"]
+        ties = state["tie_count"] + 1
+        tie_mean = state["tie_mean"] + (score - state["tie_mean"]) / ties
+    else:
+        base = state["ewma"]
+        alpha = 1.0 - 0.5 ** (max(now - updated_at, 0.0) / half_life)
+        ties, tie_mean = 1, score
+
+    state["ewma"] = tie_mean if base is None else base + alpha * (tie_mean - base)
+    state["ewma_base"] = base
+    state["tie_alpha"] = alpha
+    state["tie_count"] = ties
+    state["tie_mean"] = tie_mean
+    state["updated_at"] = now if updated_at is None else max(now, updated_at)
+
+
+def apply_score(
+    state: Dict[str, Any], score: float, now: float, half_life: float
+) -> Dict[str, Any]:
+    """
+    Return a new state with one more score folded in
+    """
+    state = {
+        **state,
+        "windows": {name: list(buckets) for name, buckets in state["windows"].items()},
+    }
+
+    fold_ewma(state, score, now, half_life)
+
+    for name, (length, count) in WINDOWS.items():
+        bucket_seconds = length // count
+        slot = int(now // bucket_seconds)
+        oldest_slot = slot - count + 1
+        buckets = [b for b in state["windows"].get(name, []) if b[_SLOT] >= oldest_slot]
+
+        current = next((b for b in buckets if b[_SLOT] == slot), None)
+        if current is None:
+            buckets.append([slot, 1, score, score * score, score, score])
+        else:
+            updated = list(current)
+            updated[_COUNT] += 1
+            updated[_SUM] += score
+            updated[_SUMSQ] += score * score
+            updated[_MIN] = min(updated[_MIN], score)
+            updated[_MAX] = max(updated[_MAX], score)
+            buckets[buckets.index(current)] = updated
+        state["windows"][name] = buckets
+
+    state["last_score"] = score
+    state["count"] += 1
+    return state
+
+
+def summarize_window(
+    buckets: List[List[float]], length: int, count: int, now: float
+) -> Dict[str, Any]:
+    """
+    Count, mean, standard deviation, min and max of a window's live buckets
+    """
+    oldest_slot = int(now // (length // count)) - count + 1
+    live = [b for b in buckets if b[_SLOT] >= oldest_slot]
+
+    n = sum(b[_COUNT] for b in live)
+    if not n:
+        return {"count": 0, "mean": None, "std": None, "min": None, "max": None}
+
+    mean = sum(b[_SUM] for b in live) / n
+    variance = max(sum(b[_SUMSQ] for b in live) / n - mean * mean, 0.0)
+    return {
+        "count": n,
+        "mean": mean,
+        "std": math.sqrt(variance),
+        "min": min(b[_MIN] for b in live),
+        "max": max(b[_MAX] for b in live),
+    }
+
+
+class SentimentStatsService:
+    """
+    Incrementally maintained sentiment aggregates per netuid
+    """
+
+    def __init__(self):
+        self.half_life = settings.SENTIMENT_EWMA_HALF_LIFE
+        # Outlive the longest window
+        self.ttl = max(length for length, _ in WINDOWS.values()) * 2
+
+    def _generate_cache_key(self, netuid: int) -> str:
+        """Generate cache key for a subnet's rolling statistics"""
+        return f"sentiment_stats:{netuid}"
+
+    async def record(self, netuid: int, score: float, now: Optional[float] = None):
+        """
+        Fold a new sentiment score into the netuid's rolling state
+        """
+        now = now or time.time()
+        key = self._generate_cache_key(netuid)
+
+        for _ in range(MAX_UPDATE_ATTEMPTS):
+            state = await cache.get(key)
+            new_state = apply_score(state or _empty_state(), score, now, self.half_life)
+            # replace() also succeeds when the key does not exist yet
+            if await cache.replace(key, state, new_state, ttl=self.ttl):
+                return
+        logger.warning(f"Gave up updating sentiment stats for netuid {netuid}")
+
+    async def get_stats(
+        self, netuid: int, now: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the EWMA and window statistics for a netuid
+
+        Returns:
+            Dictionary of aggregates, or None if no score was recorded yet
+        """
+        state = await cache.get(self._generate_cache_key(netuid))
+        if not state:
+            return None
+
+        now = now or time.time()
+        return {
+            "netuid": netuid,
+            "ewma": state["ewma"],
+            "last_score": state["last_score"],
+            "updated_at": state["updated_at"],
+            "count": state["count"],
+            "windows": {
+                name: summarize_window(state["windows"].get(name, []), length, count, now)
+                for name, (length, count) in WINDOWS.items()
+            },
+        }
+
+    async def get_ewma(self, netuid: int) -> Optional[float]:
+        """
+        Get the current EWMA for a netuid (None if unknown or unavailable)
+        """
+        try:
+            state = await cache.get(self._generate_cache_key(netuid))
+        except Exception as e:
+            logger.warning(f"Could not read sentiment EWMA for netuid {netuid}: {e}")
+            return None
+        return state["ewma"] if state else None
+
+
+# Create singleton instance
+sentiment_stats_service = SentimentStatsService()
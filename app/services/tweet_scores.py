@@ -0,0 +1,98 @@
+"""
+Content-addressed cache of per-tweet sentiment scores
+
+Tweets are normalized (see prompt.normalize_tweet_text) and hashed, so
+the same text seen again in a later window, or retweeted, maps to the same
+cached score and is never sent to the LLM twice. Whole LLM responses are also
+cached by prompt hash, so an identical batch is never rescored.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.services.cache import cache
+from app.services.prompt import normalize_tweet_text
+
+logger = logging.getLogger(__name__)
+
+
+def tweet_content_hash(text: str) -> str:
+    """
+    Content hash of a tweet's normalized text
+    """
+    return hashlib.sha1(normalize_tweet_text(text).encode("utf-8")).hexdigest()
+
+
+class TweetScoreCache:
+    """
+    Redis-backed store of sentiment scores keyed by tweet content hash
+    """
+
+    def __init__(self):
+        self.ttl = settings.TWEET_SCORE_TTL
+
+    def _generate_cache_key(self, content_hash: str) -> str:
+        """Generate cache key for a tweet score"""
+        return f"tweet_score:{content_hash}"
+
+    async def get_scores(self, content_hashes: Iterable[str]) -> Dict[str, float]:
+        """
+        Get cached scores for the given hashes, skipping unknown ones
+        """
+        content_hashes = list(dict.fromkeys(content_hashes))
+        try:
+            values = await cache.get_many(
+                [self._generate_cache_key(h) for h in content_hashes]
+            )
+        except Exception as e:
+            logger.warning(f"Could not read cached tweet scores: {e}")
+            return {}
+
+        return {
+            content_hash: float(value)
+            for content_hash, value in zip(content_hashes, values)
+            if value is not None
+        }
+
+    async def set_scores(self, scores: Dict[str, float]):
+        """
+        Store scores for the given hashes
+        """
+        try:
+            await cache.set_many(
+                {self._generate_cache_key(h): score for h, score in scores.items()},
+                ttl=self.ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Could not store tweet scores: {e}")
+
+    def _generate_response_cache_key(self, prompt_hash: str) -> str:
+        """Generate cache key for an LLM response"""
+        return f"sentiment_prompt:{prompt_hash}"
+
+    async def get_response(self, prompt_hash: str) -> Optional[List[Optional[float]]]:
+        """
+        Get the cached parsed scores for a prompt, if any
+        """
+        try:
+            return await cache.get(self._generate_response_cache_key(prompt_hash))
+        except Exception as e:
+            logger.warning(f"Could not read cached sentiment response: {e}")
+            return None
+
+    async def set_response(self, prompt_hash: str, scores: List[Optional[float]]):
+        """
+        Store the parsed scores for a prompt
+        """
+        try:
+            await cache.set(
+                self._generate_response_cache_key(prompt_hash), scores, ttl=self.ttl
+            )
+        except Exception as e:
+            logger.warning(f"Could not store sentiment response: {e}")
+
+
+# Create singleton instance
+tweet_score_cache = TweetScoreCache()
@@ -0,0 +1,48 @@
+"""
+Dividend snapshots
+
+Celery beat runs record_dividend_snapshots every DIVIDEND_SNAPSHOT_INTERVAL
+seconds. It stores the default hotkey's stake and dividend on every active
+subnet, the yield history that offline backtests replay.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.crud.blockchain import create_dividend_snapshots
+from app.models.database import async_session
+from app.services.blockchain import blockchain_service
+from app.tasks.runtime import worker_runtime
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _record_dividend_snapshots(hotkey: str) -> Dict[str, Any]:
+    netuids = await blockchain_service.get_active_netuids()
+    positions = await blockchain_service.get_subnet_positions(hotkey, netuids)
+
+    async with async_session() as db:
+        count = await create_dividend_snapshots(
+            db, hotkey, netuids, positions["stakes"], positions["dividends"]
+        )
+
+    logger.info(f"Recorded {count} dividend snapshots for hotkey {hotkey}")
+    return {"success": True, "hotkey": hotkey, "snapshots": count}
+
+
+@celery_app.task(name="record_dividend_snapshots")
+def record_dividend_snapshots(hotkey: Optional[str] = None):
+    """
+    Record the stake and dividend of a hotkey on every active subnet
+
+    Args:
+        hotkey: Account ID or public key (defaults to DEFAULT_HOTKEY)
+    """
+    hotkey = hotkey or settings.DEFAULT_HOTKEY
+    try:
+        return worker_runtime.run(_record_dividend_snapshots(hotkey))
+    except Exception as e:
+        logger.error(f"Error recording dividend snapshots: {e}")
+        return {"success": False, "error": str(e), "hotkey": hotkey}
@@ -0,0 +1,81 @@
+"""
+Idempotent enqueueing of sentiment staking work
+
+Trade requests are keyed by (netuid, hotkey). Within TRADE_DEDUP_WINDOW
+seconds, a request for the same key gets the id of the pipeline that is
+already pending or running instead of enqueueing identical work, so queue
+depth tracks distinct work rather than request rate.
+"""
+
+from celery.result import AsyncResult
+from celery.utils import uuid
+from typing import Optional, Tuple
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.services.cache import cache
+from app.tasks.pipeline import start_sentiment_stake
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def _idempotency_key(netuid: int, hotkey: str) -> str:
+    """Generate the idempotency key for a trade request"""
+    return f"trade_task:{netuid}:{hotkey}"
+
+
+async def _is_active(task_id: Optional[str]) -> bool:
+    """Whether the task is still pending or running"""
+    if not task_id:
+        return False
+    # Result backend lookups are blocking; keep them off the event loop
+    ready = await asyncio.to_thread(AsyncResult(task_id, app=celery_app).ready)
+    return not ready
+
+
+async def _start(key: str, netuid: int, hotkey: str, task_id: str) -> str:
+    try:
+        # Publishing to the broker blocks too
+        await asyncio.to_thread(start_sentiment_stake, netuid, hotkey, task_id=task_id)
+    except Exception:
+        # Release the key so the next request can enqueue again
+        await cache.delete(key)
+        raise
+    logger.info(f"Enqueued sentiment stake task {task_id} for {key}")
+    return task_id
+
+
+async def enqueue_sentiment_stake(
+    netuid: int, hotkey: str, window: Optional[int] = None
+) -> Tuple[str, bool]:
+    """
+    Enqueue the sentiment staking pipeline unless identical work is in flight
+
+    Args:
+        netuid: Subnet ID
+        hotkey: Account ID or public key
+        window: Deduplication window in seconds (defaults to TRADE_DEDUP_WINDOW)
+
+    Returns:
+        Tuple of (task id, whether an existing task was reused)
+    """
+    window = window or settings.TRADE_DEDUP_WINDOW
+    key = _idempotency_key(netuid, hotkey)
+    task_id = uuid()
+
+    if await cache.add(key, task_id, ttl=window):
+        return await _start(key, netuid, hotkey, task_id), False
+
+    existing_id = await cache.get(key)
+    if await _is_active(existing_id):
+        logger.info(f"Reusing in-flight sentiment stake task {existing_id} for {key}")
+        return existing_id, True
+
+    # The previous task already finished, so this is new work
+    if await cache.replace(key, existing_id, task_id, ttl=window):
+        return await _start(key, netuid, hotkey, task_id), False
+
+    # Another request took over the key in the meantime
+    return await cache.get(key), True
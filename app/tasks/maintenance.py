@@ -0,0 +1,98 @@
+"""
+History table maintenance
+
+Celery beat runs maintain_history_tables every HISTORY_MAINTENANCE_INTERVAL
+seconds. For blockchain_transactions and sentiment_analyses it:
+
+1. creates the monthly partitions for the current and the next
+   HISTORY_PARTITIONS_AHEAD months, so inserts never fall into the default
+   partition;
+2. recomputes the daily per-netuid rollups of the last HISTORY_ROLLUP_DAYS
+   days (including rows that arrived late);
+3. retires partitions older than HISTORY_RETENTION_MONTHS, after rolling up
+   their whole month: they are detached (kept as standalone tables for
+   archiving) or, with HISTORY_RETENTION_DROP, dropped.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.crud.blockchain import refresh_transaction_daily
+from app.crud.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition,
+    detach_partition,
+    drop_partition,
+    list_partitions,
+    month_start,
+    partition_name,
+    partition_start,
+)
+from app.crud.sentiment import refresh_sentiment_daily
+from app.models.database import async_session
+from app.tasks.runtime import worker_runtime
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+# Rollup of each partitioned table
+ROLLUPS = {
+    "blockchain_transactions": refresh_transaction_daily,
+    "sentiment_analyses": refresh_sentiment_daily,
+}
+
+
+async def _maintain_history_tables(now: Optional[datetime] = None) -> Dict[str, Any]:
+    # Partition bounds and rollup days are UTC
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    current = month_start(now)
+    today = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+    created, retired = [], []
+
+    async with async_session() as db:
+        for table in PARTITIONED_TABLES:
+            for offset in range(settings.HISTORY_PARTITIONS_AHEAD + 1):
+                start = add_months(current, offset)
+                if await create_partition(db, table, start):
+                    created.append(partition_name(table, start))
+
+            await ROLLUPS[table](
+                db,
+                today - timedelta(days=settings.HISTORY_ROLLUP_DAYS),
+                today + timedelta(days=1),
+            )
+
+        if settings.HISTORY_RETENTION_MONTHS:
+            cutoff = add_months(current, -settings.HISTORY_RETENTION_MONTHS)
+            for table in PARTITIONED_TABLES:
+                for name in await list_partitions(db, table):
+                    start = partition_start(table, name)
+                    if start is None or add_months(start, 1) > cutoff:
+                        continue
+
+                    # The rollups outlive the raw rows
+                    await ROLLUPS[table](db, start, add_months(start, 1))
+                    if settings.HISTORY_RETENTION_DROP:
+                        await drop_partition(db, table, name)
+                    else:
+                        await detach_partition(db, table, name)
+                    retired.append(name)
+
+    if created or retired:
+        logger.info(f"History partitions created: {created}, retired: {retired}")
+    return {"success": True, "created": created, "retired": retired}
+
+
+@celery_app.task(name="maintain_history_tables")
+def maintain_history_tables():
+    """
+    Create upcoming partitions, refresh daily rollups and apply retention
+    """
+    try:
+        return worker_runtime.run(_maintain_history_tables())
+    except Exception as e:
+        logger.error(f"Error maintaining history tables: {e}")
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,204 @@
+"""
+Staged sentiment staking pipeline
+
+Splits sentiment-based staking into a Celery chain of stages, each with its
+own queue and retry policy:
+
+    fetch_subnet_tweets -> score_subnet_sentiment -> decide_stake
+        -> submit_stake -> record_stake_transaction
+
+The HTTP-bound stages (Datura search, Chutes scoring) run on queues that can
+be consumed by wide thread pools, while extrinsic signing stays on the
+``blockchain`` queue served by a single-concurrency worker.
+"""
+
+from celery import chain
+from celery.result import AsyncResult
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Dict, Any, Optional
+import logging
+
+from app.worker import celery_app
+from app.services.quota import BACKGROUND, quota_priority
+from app.services.sentiment import UPSTREAM_ERRORS, sentiment_service
+from app.tasks.runtime import worker_runtime
+from app.tasks.stake import (
+    decide_stake,
+    _decision_score,
+    _submit_stake,
+    _record_transaction,
+    _skipped_result,
+    _completed_result,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_subnet_tweets(netuid: int, hotkey: str) -> Dict[str, Any]:
+    payload = {"netuid": netuid, "hotkey": hotkey}
+    await sentiment_service.record_subnet_query(netuid)
+
+    # A fresh cached score makes the search and scoring stages unnecessary
+    cached_result = await sentiment_service.get_cached_subnet_sentiment(netuid)
+    if cached_result:
+        payload["sentiment_score"] = cached_result.get("sentiment_score", 0.0)
+        return payload
+
+    # Upstream failures raise so the stage is retried; no stale or mock tweets
+    with quota_priority(BACKGROUND):
+        payload["tweets"] = await sentiment_service.get_subnet_tweets(
+            netuid, strict=True
+        )
+    return payload
+
+
+async def _score_subnet_sentiment(netuid: int, tweets: list) -> Dict[str, Any]:
+    with quota_priority(BACKGROUND):
+        return await sentiment_service.score_subnet_tweets(netuid, tweets, strict=True)
+
+
+@celery_app.task(
+    name="fetch_subnet_tweets",
+    autoretry_for=UPSTREAM_ERRORS,
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True,
+    max_retries=5,
+)
+def fetch_subnet_tweets(netuid: int, hotkey: str) -> Dict[str, Any]:
+    """
+    Stage 1: search tweets for the subnet (or reuse a cached score)
+    """
+    logger.info(f"Fetching tweets for netuid {netuid}")
+    return worker_runtime.run(_fetch_subnet_tweets(netuid, hotkey))
+
+
+@celery_app.task(
+    name="score_subnet_sentiment",
+    autoretry_for=UPSTREAM_ERRORS,
+    retry_backoff=True,
+    retry_backoff_max=120,
+    retry_jitter=True,
+    max_retries=3,
+)
+def score_subnet_sentiment(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage 2: score the fetched tweets with the LLM
+    """
+    if "sentiment_score" in payload:
+        return payload
+
+    netuid = payload["netuid"]
+    tweets = payload.pop("tweets", [])
+    result = worker_runtime.run(_score_subnet_sentiment(netuid, tweets))
+    payload["sentiment_score"] = result.get("sentiment_score", 0.0)
+
+    logger.info(f"Sentiment score for netuid {netuid}: {payload['sentiment_score']}")
+    return payload
+
+
+@celery_app.task(name="decide_stake")
+def decide_stake_stage(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage 3: turn the sentiment score (or its EWMA) into a stake/unstake decision
+    """
+    payload["decision_score"] = worker_runtime.run(
+        _decision_score(payload["netuid"], payload["sentiment_score"])
+    )
+    payload.update(decide_stake(payload["decision_score"]))
+    return payload
+
+
+@celery_app.task(name="submit_stake", acks_late=False, max_retries=0)
+def submit_stake(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage 4: submit the extrinsic
+
+    Never retried automatically, since a resubmission could stake twice.
+    """
+    transaction_type = payload.get("transaction_type")
+    if transaction_type is None:
+        logger.info(
+            f"Skipping stake/unstake - sentiment score too low: {payload['sentiment_score']}"
+        )
+        return payload
+
+    payload["result"] = worker_runtime.run(
+        _submit_stake(
+            payload["netuid"], payload["hotkey"], transaction_type, payload["amount"]
+        )
+    )
+    return payload
+
+
+@celery_app.task(
+    name="record_stake_transaction",
+    acks_late=True,
+    autoretry_for=(SQLAlchemyError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def record_stake_transaction(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage 5: record the submitted transaction in the database
+    """
+    sentiment_score = payload["sentiment_score"]
+    transaction_type = payload.get("transaction_type")
+    if transaction_type is None:
+        return _skipped_result(sentiment_score)
+
+    netuid, hotkey = payload["netuid"], payload["hotkey"]
+    worker_runtime.run(
+        _record_transaction(
+            netuid,
+            hotkey,
+            transaction_type,
+            payload["amount"],
+            sentiment_score,
+            payload["result"],
+            # Written before the task is acknowledged, so failures are retried
+            sync=True,
+        )
+    )
+
+    logger.info(
+        f"Completed sentiment-based {transaction_type} for netuid {netuid}, hotkey {hotkey}"
+    )
+    return _completed_result(
+        netuid,
+        hotkey,
+        transaction_type,
+        payload["amount"],
+        sentiment_score,
+        payload["result"],
+    )
+
+
+def build_sentiment_stake_pipeline(netuid: int, hotkey: str):
+    """
+    Build the chain of stages for one (netuid, hotkey)
+    """
+    return chain(
+        fetch_subnet_tweets.s(netuid, hotkey),
+        score_subnet_sentiment.s(),
+        decide_stake_stage.s(),
+        submit_stake.s(),
+        record_stake_transaction.s(),
+    )
+
+
+def start_sentiment_stake(
+    netuid: int, hotkey: str, task_id: Optional[str] = None
+) -> AsyncResult:
+    """
+    Enqueue the staged pipeline
+
+    Args:
+        netuid: Subnet ID
+        hotkey: Account ID or public key
+        task_id: Optional id to assign to the final stage
+
+    Returns:
+        AsyncResult of the final stage, whose result is the pipeline outcome
+    """
+    return build_sentiment_stake_pipeline(netuid, hotkey).apply_async(task_id=task_id)
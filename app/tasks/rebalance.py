@@ -0,0 +1,107 @@
+"""
+Portfolio rebalancing across subnets
+
+rebalance_portfolio reads the current sentiment of every active subnet (the
+EWMA when STAKE_USE_EWMA is set, else the cached score kept warm by the
+sweep), the hotkey's stake and dividend yield on each subnet, and lets the
+allocator compute all stake changes in one pass. Only the resulting orders
+are submitted, unstakes first.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.allocator import allocate
+from app.services.blockchain import blockchain_service
+from app.services.quota import BACKGROUND, quota_priority
+from app.services.sentiment import sentiment_service
+from app.services.sentiment_stats import sentiment_stats_service
+from app.tasks.runtime import worker_runtime
+from app.tasks.stake import _record_transaction, _submit_stake
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _subnet_score(netuid: int) -> Optional[float]:
+    """
+    Current sentiment of a subnet, or None if nothing is known yet
+    """
+    if settings.STAKE_USE_EWMA:
+        ewma = await sentiment_stats_service.get_ewma(netuid)
+        if ewma is not None:
+            return ewma
+    cached = await sentiment_service.get_cached_subnet_sentiment(netuid)
+    if cached and not cached.get("error"):
+        return cached.get("sentiment_score")
+    return None
+
+
+async def _rebalance_portfolio(
+    hotkey: str, dry_run: bool = False
+) -> Dict[str, Any]:
+    netuids = await blockchain_service.get_active_netuids()
+    with quota_priority(BACKGROUND):
+        scores, positions, balance = await asyncio.gather(
+            asyncio.gather(*(_subnet_score(netuid) for netuid in netuids)),
+            blockchain_service.get_subnet_positions(hotkey, netuids),
+            blockchain_service.get_balance(),
+        )
+
+    stakes = np.array(positions["stakes"], dtype=float)
+    # Never plan to stake more than the wallet holds
+    budget = min(settings.ALLOCATOR_TOTAL_BUDGET, balance + stakes.sum())
+    orders = allocate(
+        netuids,
+        np.array([np.nan if s is None else s for s in scores], dtype=float),
+        np.array(positions["yields"], dtype=float),
+        stakes,
+        budget=budget,
+    )
+    logger.info(f"Rebalancing {len(netuids)} subnets with {len(orders)} orders")
+
+    if dry_run:
+        return {"success": True, "dry_run": True, "budget": budget, "orders": orders}
+
+    scores_by_netuid = dict(zip(netuids, scores))
+    results: List[Dict[str, Any]] = []
+    for order in orders:
+        netuid, transaction_type = order["netuid"], order["transaction_type"]
+        result = await _submit_stake(netuid, hotkey, transaction_type, order["amount"])
+        await _record_transaction(
+            netuid,
+            hotkey,
+            transaction_type,
+            order["amount"],
+            scores_by_netuid[netuid],
+            result,
+        )
+        results.append({**order, "result": result})
+
+    return {
+        "success": all(r["result"].get("success") for r in results),
+        "dry_run": False,
+        "budget": budget,
+        "orders": results,
+    }
+
+
+@celery_app.task(name="rebalance_portfolio")
+def rebalance_portfolio(hotkey: Optional[str] = None, dry_run: bool = False):
+    """
+    Rebalance stake across all active subnets
+
+    Args:
+        hotkey: Account ID or public key (defaults to DEFAULT_HOTKEY)
+        dry_run: Only compute the orders, do not submit them
+    """
+    hotkey = hotkey or settings.DEFAULT_HOTKEY
+    try:
+        return worker_runtime.run(_rebalance_portfolio(hotkey, dry_run))
+    except Exception as e:
+        logger.error(f"Error rebalancing portfolio: {e}")
+        return {"success": False, "error": str(e), "hotkey": hotkey}
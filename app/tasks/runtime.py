@@ -0,0 +1,181 @@
+"""
+Per-process asyncio runtime for Celery workers
+
+Every worker process owns one long-lived event loop running in a background
+thread. Tasks submit their coroutines to it instead of spinning up a loop per
+call, so the Redis client, the SQLAlchemy engine pool, the pooled HTTP
+clients and the subtensor connection are bound to a single loop and reused
+across tasks. Because the loop lives in its own thread, several task threads
+(``--pool threads``) can run their I/O-bound coroutines concurrently inside
+one process.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+from app.models.database import engine
+from app.services.blockchain import blockchain_service
+from app.services.bulk_writer import bulk_writers
+from app.services.cache import cache
+from app.services.circuit_breaker import circuit_breakers
+from app.services.http import http_clients
+from app.services.rate_limit import rate_limiters
+from app.services.keystore import keystore
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """
+    Long-lived event loop shared by all tasks of a worker process
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[Any]]):
+        """
+        Register a coroutine function to run on the loop before it stops
+        """
+        self._shutdown_hooks.append(hook)
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop if self._pid == os.getpid() else None
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the event loop thread for this process if it is not running
+        """
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            if self._pid is not None:
+                # Inherited from the parent through fork; its thread is gone
+                self._reset_inherited_clients()
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop,),
+                name="worker-event-loop",
+                daemon=True,
+            )
+            thread.start()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info(f"Started worker event loop in process {self._pid}")
+            return loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the shared loop and block until it completes
+        """
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("WorkerRuntime.run() called from the event loop thread")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Close shared clients and stop the loop thread
+        """
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                return
+
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._run_shutdown_hooks(), loop
+                ).result(timeout)
+            except Exception as e:
+                logger.error(f"Error closing worker clients: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+
+            self._loop = None
+            self._thread = None
+            self._pid = None
+            logger.info("Stopped worker event loop")
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    async def _run_shutdown_hooks(self):
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Error in worker shutdown hook {hook}: {e}")
+
+    @staticmethod
+    def _reset_inherited_clients():
+        """
+        Drop connections created by the parent process before the fork
+        """
+        cache.reset()
+        http_clients.reset()
+        rate_limiters.reset()
+        circuit_breakers.reset()
+        blockchain_service.reset()
+        bulk_writers.reset()
+        engine.sync_engine.dispose(close=False)
+
+
+async def _warm_up():
+    """
+    Open the shared clients on the worker loop
+    """
+    await cache.get_client()
+    http_clients.get("datura")
+    http_clients.get("chutes")
+    await blockchain_service.get_async_subtensor()
+
+
+def bootstrap_worker_process():
+    """
+    Prepare a freshly started worker process
+
+    Derives the wallet keys and starts the shared loop with its clients.
+    """
+    # Connections inherited from the parent are bound to a loop we do not own
+    WorkerRuntime._reset_inherited_clients()
+
+    try:
+        keystore.load()
+    except Exception as e:
+        # Signing tasks will retry the derivation lazily
+        logger.error(f"Failed to load wallet keys at worker start: {e}")
+
+    try:
+        worker_runtime.run(_warm_up())
+    except Exception as e:
+        logger.error(f"Failed to warm up worker clients: {e}")
+
+
+# Create singleton instance
+worker_runtime = WorkerRuntime()
+worker_runtime.add_shutdown_hook(engine.dispose)
+worker_runtime.add_shutdown_hook(cache.close)
+worker_runtime.add_shutdown_hook(blockchain_service.close)
+worker_runtime.add_shutdown_hook(http_clients.aclose)
+# Hooks run in reverse order: flush buffered rows while the engine is open
+worker_runtime.add_shutdown_hook(bulk_writers.aclose)
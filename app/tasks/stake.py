@@ -1,10 +1,13 @@
 from app.worker import celery_app
+from app.core.config import settings
 from app.services.sentiment import sentiment_service
+from app.services.sentiment_stats import sentiment_stats_service
 from app.services.blockchain import blockchain_service
-from app.models.database import async_session
-from app.crud.blockchain import create_transaction
+from app.services.bulk_writer import bulk_writers
+from app.services.quota import BACKGROUND, quota_priority
+from app.tasks.runtime import worker_runtime
+from typing import Dict, Any, Optional
 import logging
-import asyncio
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +25,111 @@ def process_sentiment_stake(netuid: int, hotkey: str):
         f"Processing sentiment-based stake for netuid {netuid}, hotkey {hotkey}"
     )
 
-    # Use asyncio to handle async operations in Celery task
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(_process_sentiment_stake(netuid, hotkey))
+    # Run on the worker's shared event loop so pooled clients are reused
+    return worker_runtime.run(_process_sentiment_stake(netuid, hotkey))
+
+
+def decide_stake(sentiment_score: float) -> Dict[str, Any]:
+    """
+    Decide whether to stake or unstake for a sentiment score
+
+    Returns:
+        Dictionary with transaction_type ("stake", "unstake" or None to skip)
+        and amount in TAO
+    """
+    # Calculate stake amount: 0.01 TAO (by default) * sentiment score
+    stake_amount = abs(settings.STAKE_PER_SENTIMENT_POINT * sentiment_score)
+
+    # Skip if sentiment is neutral (zero) or stake amount is too small
+    if sentiment_score == 0 or stake_amount < settings.MIN_STAKE_AMOUNT:
+        return {"transaction_type": None, "amount": 0.0}
+
+    transaction_type = "stake" if sentiment_score > 0 else "unstake"
+    return {"transaction_type": transaction_type, "amount": stake_amount}
+
+
+async def _decision_score(netuid: int, sentiment_score: float) -> float:
+    """
+    Score to base the stake decision on
+
+    The rolling EWMA smooths out noisy individual scores; the latest score is
+    used if EWMA decisions are disabled or no EWMA is available.
+    """
+    if not settings.STAKE_USE_EWMA:
+        return sentiment_score
+    ewma = await sentiment_stats_service.get_ewma(netuid)
+    return sentiment_score if ewma is None else ewma
+
+
+async def _submit_stake(
+    netuid: int, hotkey: str, transaction_type: str, amount: float
+) -> Dict[str, Any]:
+    """
+    Submit the stake or unstake extrinsic
+    """
+    if transaction_type == "stake":
+        # Positive sentiment - add stake
+        return await blockchain_service.add_stake(netuid, hotkey, amount)
+    # Negative sentiment - unstake
+    return await blockchain_service.unstake(netuid, hotkey, amount)
+
+
+async def _record_transaction(
+    netuid: int,
+    hotkey: str,
+    transaction_type: str,
+    amount: float,
+    sentiment_score: float,
+    result: Dict[str, Any],
+    sync: bool = False,
+) -> Optional[int]:
+    """
+    Record a submitted transaction in the database
+
+    The row is buffered and written in bulk; with sync the write happens
+    before returning, and the new record's ID is returned.
+    """
+    return await bulk_writers.get("blockchain_transactions").write(
+        {
+            "transaction_type": transaction_type,
+            "netuid": netuid,
+            "hotkey": hotkey,
+            "amount": amount,
+            "transaction_hash": result.get("transaction_hash"),
+            "sentiment_score": sentiment_score,
+            "success": result.get("success", False),
+            "error": result.get("error"),
+            "transaction_data": result,
+        },
+        sync=sync,
+    )
+
+
+def _skipped_result(sentiment_score: float) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "message": "Skipped - sentiment too low",
+        "sentiment_score": sentiment_score,
+    }
+
+
+def _completed_result(
+    netuid: int,
+    hotkey: str,
+    transaction_type: str,
+    amount: float,
+    sentiment_score: float,
+    result: Dict[str, Any],
+) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "transaction_type": transaction_type,
+        "netuid": netuid,
+        "hotkey": hotkey,
+        "amount": amount,
+        "sentiment_score": sentiment_score,
+        "result": result,
+    }
 
 
 async def _process_sentiment_stake(netuid: int, hotkey: str):
@@ -32,63 +137,41 @@ async def _process_sentiment_stake(netuid: int, hotkey: str):
     Internal async implementation for sentiment-based staking
     """
     try:
-        # Analyze sentiment for the subnet
-        sentiment_result = await sentiment_service.get_subnet_sentiment(netuid)
+        # Analyze sentiment for the subnet, leaving quota headroom to API requests
+        with quota_priority(BACKGROUND):
+            sentiment_result = await sentiment_service.get_subnet_sentiment(netuid)
         sentiment_score = sentiment_result.get("sentiment_score", 0.0)
 
-        logger.info(f"Sentiment score for netuid {netuid}: {sentiment_score}")
+        decision_score = await _decision_score(netuid, sentiment_score)
+        logger.info(
+            f"Sentiment score for netuid {netuid}: {sentiment_score} "
+            f"(deciding on {decision_score})"
+        )
 
-        # Calculate stake amount: 0.01 TAO * sentiment score
-        stake_amount = abs(0.01 * sentiment_score)
+        decision = decide_stake(decision_score)
+        transaction_type = decision["transaction_type"]
+        stake_amount = decision["amount"]
 
-        # Skip if sentiment is neutral (zero) or stake amount is too small
-        if sentiment_score == 0 or stake_amount < 0.01:
+        if transaction_type is None:
             logger.info(
                 f"Skipping stake/unstake - sentiment score too low: {sentiment_score}"
             )
-            return {
-                "success": True,
-                "message": "Skipped - sentiment too low",
-                "sentiment_score": sentiment_score,
-            }
+            return _skipped_result(sentiment_score)
 
         # Stake or unstake based on sentiment
-        if sentiment_score > 0:
-            # Positive sentiment - add stake
-            result = await blockchain_service.add_stake(netuid, hotkey, stake_amount)
-            transaction_type = "stake"
-        else:
-            # Negative sentiment - unstake
-            result = await blockchain_service.unstake(netuid, hotkey, stake_amount)
-            transaction_type = "unstake"
+        result = await _submit_stake(netuid, hotkey, transaction_type, stake_amount)
 
         # Record transaction in database
-        async with async_session() as db:
-            tx = await create_transaction(
-                db=db,
-                transaction_type=transaction_type,
-                netuid=netuid,
-                hotkey=hotkey,
-                amount=stake_amount,
-                transaction_hash=result.get("transaction_hash"),
-                sentiment_score=sentiment_score,
-                success=result.get("success", False),
-                error=result.get("error"),
-                transaction_data=result,  # Changed from 'metadata'
-            )
+        await _record_transaction(
+            netuid, hotkey, transaction_type, stake_amount, sentiment_score, result
+        )
 
         logger.info(
             f"Completed sentiment-based {transaction_type} for netuid {netuid}, hotkey {hotkey}"
         )
-        return {
-            "success": True,
-            "transaction_type": transaction_type,
-            "netuid": netuid,
-            "hotkey": hotkey,
-            "amount": stake_amount,
-            "sentiment_score": sentiment_score,
-            "result": result,
-        }
+        return _completed_result(
+            netuid, hotkey, transaction_type, stake_amount, sentiment_score, result
+        )
 
     except Exception as e:
         logger.error(f"Error processing sentiment stake: {e}")
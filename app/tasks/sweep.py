@@ -0,0 +1,69 @@
+"""
+Periodic sentiment sweep
+
+Celery beat runs sweep_subnet_sentiment every SENTIMENT_SWEEP_INTERVAL
+seconds. It refreshes the cached sentiment of every active subnet, busiest
+subnets first, so API requests read precomputed scores instead of paying the
+Datura and Chutes latency themselves.
+"""
+
+from typing import Dict, Any
+import logging
+import uuid
+
+from app.core.config import settings
+from app.services.blockchain import blockchain_service
+from app.services.cache import cache
+from app.services.quota import BACKGROUND, quota_priority
+from app.services.sentiment import sentiment_service
+from app.tasks.runtime import worker_runtime
+from app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+SWEEP_LOCK_KEY = "sentiment_sweep:lock"
+
+# Halve request counts every sweep so priorities follow recent demand
+QUERY_COUNT_DECAY = 0.5
+
+
+async def _sweep_subnet_sentiment() -> Dict[str, Any]:
+    # Skip if the previous sweep is still running. The lock holds a token of
+    # our own: a sweep that overran the TTL must not release a later sweep's lock
+    token = uuid.uuid4().hex
+    ttl = settings.SENTIMENT_SWEEP_INTERVAL
+    if not await cache.add(SWEEP_LOCK_KEY, token, ttl=ttl):
+        logger.info("Previous sentiment sweep still running, skipping")
+        return {"success": True, "skipped": True}
+
+    try:
+        netuids = await blockchain_service.get_active_netuids()
+        ordered = await sentiment_service.get_sweep_order(netuids)
+        await cache.zdecay(sentiment_service.QUERY_COUNTS_KEY, QUERY_COUNT_DECAY)
+
+        logger.info(f"Sweeping sentiment for {len(ordered)} subnets: {ordered}")
+        with quota_priority(BACKGROUND):
+            results = await sentiment_service.refresh_subnets(ordered)
+
+        failed = [r["netuid"] for r in results if r.get("error")]
+        return {
+            "success": True,
+            "netuids": ordered,
+            "refreshed": len(results) - len(failed),
+            "failed": failed,
+        }
+    finally:
+        if not await cache.delete_if(SWEEP_LOCK_KEY, token):
+            logger.warning("Sentiment sweep outlived its lock")
+
+
+@celery_app.task(name="sweep_subnet_sentiment")
+def sweep_subnet_sentiment():
+    """
+    Refresh sentiment for all active subnets, busiest first
+    """
+    try:
+        return worker_runtime.run(_sweep_subnet_sentiment())
+    except Exception as e:
+        logger.error(f"Error sweeping subnet sentiment: {e}")
+        return {"success": False, "error": str(e)}
@@ -1,20 +1,78 @@
 # app/tasks/worker.py
-from celery import Celery
+from celery import Celery, concurrency
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from app.core.config import settings
+from app.tasks.runtime import bootstrap_worker_process, worker_runtime
 import os
 
 celery_app = Celery(
     "worker",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    include=[
+        "app.tasks.base",
+        "app.tasks.stake",
+        "app.tasks.pipeline",
+        "app.tasks.sweep",
+        "app.tasks.rebalance",
+        "app.tasks.dividends",
+        "app.tasks.maintenance",
+    ],
 )
 
 # Configure Celery
+# Each sentiment staking stage has its own queue so HTTP-bound stages can be
+# scaled out independently of the serialized signing stage
 celery_app.conf.task_routes = {
     "app.tasks.*": {"queue": "default"},
     "process_sentiment_stake": {"queue": "blockchain"},
+    "fetch_subnet_tweets": {"queue": "sentiment_fetch"},
+    "score_subnet_sentiment": {"queue": "sentiment_score"},
+    "decide_stake": {"queue": "stake_decide"},
+    "submit_stake": {"queue": "blockchain"},
+    "record_stake_transaction": {"queue": "db_write"},
+    "sweep_subnet_sentiment": {"queue": "sentiment_sweep"},
+    "rebalance_portfolio": {"queue": "blockchain"},
+    "record_dividend_snapshots": {"queue": "default"},
+    "maintain_history_tables": {"queue": "db_write"},
+}
+
+# Periodic tasks run by celery beat
+celery_app.conf.beat_schedule = {
+    "sweep-subnet-sentiment": {
+        "task": "sweep_subnet_sentiment",
+        "schedule": settings.SENTIMENT_SWEEP_INTERVAL,
+        # Drop a sweep that could not start before the next one is due
+        "options": {"expires": settings.SENTIMENT_SWEEP_INTERVAL},
+    },
 }
 
+if settings.HISTORY_MAINTENANCE_INTERVAL:
+    celery_app.conf.beat_schedule["maintain-history-tables"] = {
+        "task": "maintain_history_tables",
+        "schedule": settings.HISTORY_MAINTENANCE_INTERVAL,
+        "options": {"expires": settings.HISTORY_MAINTENANCE_INTERVAL},
+    }
+
+if settings.DIVIDEND_SNAPSHOT_INTERVAL:
+    celery_app.conf.beat_schedule["record-dividend-snapshots"] = {
+        "task": "record_dividend_snapshots",
+        "schedule": settings.DIVIDEND_SNAPSHOT_INTERVAL,
+        "options": {"expires": settings.DIVIDEND_SNAPSHOT_INTERVAL},
+    }
+
+if settings.REBALANCE_INTERVAL:
+    celery_app.conf.beat_schedule["rebalance-portfolio"] = {
+        "task": "rebalance_portfolio",
+        "schedule": settings.REBALANCE_INTERVAL,
+        "options": {"expires": settings.REBALANCE_INTERVAL},
+    }
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
@@ -25,3 +83,44 @@ celery_app.conf.update(
     task_time_limit=600,  # 10 minutes
     worker_prefetch_multiplier=1,  # Process one task at a time
 )
+
+
+# Pools that send worker_process_init from the process running the tasks
+PROCESS_INIT_POOLS = ("prefork", "solo")
+
+
+def _pool_sends_process_init(worker) -> bool:
+    pool_cls = concurrency.get_implementation(worker.pool_cls)
+    return any(
+        pool_cls is concurrency.get_implementation(name) for name in PROCESS_INIT_POOLS
+    )
+
+
+@worker_init.connect
+def init_worker(sender=None, **kwargs):
+    """
+    Bootstrap the worker process itself for pools that run tasks in it
+
+    Thread (and green) pools never send worker_process_init; prefork children
+    are bootstrapped after the fork instead, so the parent opens no clients.
+    """
+    if sender is not None and _pool_sends_process_init(sender):
+        return
+    bootstrap_worker_process()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """
+    Derive wallet keys and start the shared event loop in each worker process
+    """
+    bootstrap_worker_process()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_runtime(**kwargs):
+    """
+    Close shared clients and stop the event loop when the worker exits
+    """
+    worker_runtime.stop()
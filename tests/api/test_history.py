@@ -0,0 +1,56 @@
+# tests/api/test_history.py
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.api.routes.history import csv_chunks, ndjson_chunks
+
+COLUMNS = ["id", "netuid", "transaction_data", "created_at"]
+
+
+async def _rows(count):
+    for i in range(count):
+        yield SimpleNamespace(
+            id=i,
+            netuid=18,
+            transaction_data={"transaction_hash": f"0x{i}", "success": True},
+            created_at=datetime(2026, 10, 19, tzinfo=timezone.utc),
+        )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_chunks():
+    """Test that NDJSON is emitted one row per line in bounded chunks"""
+    chunks = [chunk async for chunk in ndjson_chunks(_rows(5), COLUMNS, 2)]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    first = json.loads(chunks[0].splitlines()[0])
+    assert first == {
+        "id": 0,
+        "netuid": 18,
+        "transaction_data": {"transaction_hash": "0x0", "success": True},
+        "created_at": "2026-10-19T00:00:00+00:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_csv_chunks():
+    """Test that CSV has one header and JSON-encoded payload columns"""
+    chunks = [chunk async for chunk in csv_chunks(_rows(3), COLUMNS, 2)]
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == COLUMNS
+    assert len(rows) == 4
+    assert json.loads(rows[3][2]) == {"transaction_hash": "0x2", "success": True}
+
+
+@pytest.mark.asyncio
+async def test_csv_chunks_empty():
+    """Test that an empty export still has its header"""
+    chunks = [chunk async for chunk in csv_chunks(_rows(0), COLUMNS, 2)]
+
+    assert "".join(chunks).strip() == ",".join(COLUMNS)
@@ -0,0 +1,66 @@
+# tests/crud/test_export.py
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.blockchain import stream_transactions
+from app.crud.sentiment import stream_sentiment_analyses
+
+
+class _Stream:
+    def __init__(self, rows):
+        self._rows = iter(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _mock_db(rows):
+    db = MagicMock()
+    db.stream_scalars = AsyncMock(return_value=_Stream(rows))
+    return db
+
+
+@pytest.mark.asyncio
+async def test_stream_transactions_filters_and_batches():
+    """Test that transactions stream oldest first through a server-side cursor"""
+    db = _mock_db(["a", "b"])
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+    rows = [
+        row
+        async for row in stream_transactions(
+            db, netuid=18, hotkey="5F", start=start, batch_size=250
+        )
+    ]
+
+    assert rows == ["a", "b"]
+    query = db.stream_scalars.await_args.args[0]
+    assert query.get_execution_options()["yield_per"] == 250
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "blockchain_transactions.netuid = " in sql
+    assert "blockchain_transactions.hotkey = " in sql
+    assert "blockchain_transactions.created_at >= " in sql
+    assert "blockchain_transactions.created_at < " not in sql
+    assert (
+        "ORDER BY blockchain_transactions.created_at, blockchain_transactions.id"
+        in sql
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_sentiment_analyses_unfiltered():
+    """Test that an unfiltered export streams the whole table"""
+    db = _mock_db([])
+
+    assert [row async for row in stream_sentiment_analyses(db)] == []
+    sql = str(db.stream_scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "WHERE" not in sql
@@ -0,0 +1,45 @@
+# tests/crud/test_jsonb.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.blockchain import get_transaction_by_payload_hash, search_transaction_data
+from app.crud.sentiment import get_sentiment_analyses_for_tweet
+
+
+def _mock_db():
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = None
+    result.scalars.return_value.all.return_value = []
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _sql(db):
+    query = db.execute.await_args.args[0]
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_payload_hash_uses_expression_index():
+    """Test that hash lookups match the indexed payload expression"""
+    db = _mock_db()
+
+    assert await get_transaction_by_payload_hash(db, "0xabc") is None
+    assert "(blockchain_transactions.transaction_data ->> 'transaction_hash') = " in _sql(db)
+
+
+@pytest.mark.asyncio
+async def test_payload_searches_use_containment():
+    """Test that payload searches use @>, which the GIN indexes serve"""
+    db = _mock_db()
+    await search_transaction_data(db, {"success": False}, limit=10)
+    assert "blockchain_transactions.transaction_data @> " in _sql(db)
+
+    db = _mock_db()
+    await get_sentiment_analyses_for_tweet(db, "1850000000000000000")
+    assert "sentiment_analyses.data @> " in _sql(db)
+    params = db.execute.await_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert {"tweet_ids": ["1850000000000000000"]} in params.values()
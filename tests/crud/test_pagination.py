@@ -0,0 +1,73 @@
+# tests/crud/test_pagination.py
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.future import select
+
+from app.crud.pagination import decode_cursor, encode_cursor, fetch_page, keyset_query
+from app.models.blockchain import BlockchainTransaction
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the row position it encodes"""
+    cursor = encode_cursor(NOW, 42)
+
+    assert "|" not in cursor
+    assert decode_cursor(cursor) == (NOW, 42)
+
+
+def test_invalid_cursor():
+    """Test that malformed cursors are rejected"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_query_has_no_offset():
+    """Test that later pages seek past the cursor instead of using OFFSET"""
+    query = select(BlockchainTransaction).where(BlockchainTransaction.netuid == 18)
+    sql = str(
+        keyset_query(query, BlockchainTransaction, encode_cursor(NOW, 42), 50).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+
+    assert "OFFSET" not in sql
+    assert (
+        "(blockchain_transactions.created_at, blockchain_transactions.id) < "
+        in sql
+    )
+    assert (
+        "ORDER BY blockchain_transactions.created_at DESC, "
+        "blockchain_transactions.id DESC" in sql
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_next_cursor():
+    """Test that a full page returns the cursor of its last row"""
+    rows = [
+        SimpleNamespace(id=10 - i, created_at=NOW - timedelta(minutes=i))
+        for i in range(3)
+    ]
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+
+    page, cursor = await fetch_page(
+        db, select(BlockchainTransaction), BlockchainTransaction, limit=2
+    )
+    assert [row.id for row in page] == [10, 9]
+    assert decode_cursor(cursor) == (rows[1].created_at, 9)
+
+    result.scalars.return_value.all.return_value = rows[:2]
+    page, cursor = await fetch_page(
+        db, select(BlockchainTransaction), BlockchainTransaction, limit=2
+    )
+    assert len(page) == 2
+    assert cursor is None
@@ -0,0 +1,118 @@
+# tests/crud/test_partitions.py
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.crud.partitions import (
+    add_months,
+    create_partition,
+    detach_partition,
+    month_start,
+    partition_name,
+    partition_start,
+)
+
+UTC = timezone.utc
+
+
+def test_month_arithmetic():
+    """Test month starts across year boundaries"""
+    assert month_start(datetime(2026, 10, 19, 15, 30, tzinfo=UTC)) == datetime(
+        2026, 10, 1, tzinfo=UTC
+    )
+    assert add_months(datetime(2026, 11, 5, tzinfo=UTC), 2) == datetime(
+        2027, 1, 1, tzinfo=UTC
+    )
+    assert add_months(datetime(2026, 1, 1, tzinfo=UTC), -13) == datetime(
+        2024, 12, 1, tzinfo=UTC
+    )
+
+
+def test_month_arithmetic_in_utc():
+    """Test that months are taken in UTC whatever the value's time zone"""
+    # 2026-11-01 01:00 at UTC+5 is still October in UTC
+    local = datetime(2026, 11, 1, 1, 0, tzinfo=timezone(timedelta(hours=5)))
+
+    assert month_start(local) == datetime(2026, 10, 1, tzinfo=UTC)
+    assert add_months(local, -12) == datetime(2025, 10, 1, tzinfo=UTC)
+
+
+def test_partition_names():
+    """Test that partition names round-trip to their month"""
+    start = datetime(2026, 3, 1, tzinfo=UTC)
+    name = partition_name("sentiment_analyses", start)
+
+    assert name == "sentiment_analyses_p2026_03"
+    assert partition_start("sentiment_analyses", name) == start
+    assert partition_start("sentiment_analyses", "sentiment_analyses_default") is None
+    assert partition_start("blockchain_transactions", name) is None
+
+
+@pytest.mark.asyncio
+async def test_create_partition():
+    """Test the partition DDL and that existing partitions are left alone"""
+    exists = MagicMock()
+    exists.scalar.return_value = None
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=exists)
+    db.commit = AsyncMock()
+
+    created = await create_partition(
+        db, "blockchain_transactions", datetime(2026, 12, 15, tzinfo=UTC)
+    )
+
+    assert created is True
+    ddl = str(db.execute.await_args_list[-1].args[0])
+    assert "blockchain_transactions_p2026_12 PARTITION OF blockchain_transactions" in ddl
+    assert "FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')" in ddl
+
+    exists.scalar.return_value = "blockchain_transactions_p2026_12"
+    assert await create_partition(
+        db, "blockchain_transactions", datetime(2026, 12, 1, tzinfo=UTC)
+    ) is False
+
+
+@pytest.mark.asyncio
+async def test_create_partition_moves_default_rows():
+    """Test that rows stranded in the default partition are moved over"""
+    missing = MagicMock()
+    missing.scalar.return_value = None
+    stranded = MagicMock()
+    stranded.scalar.return_value = True
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[missing, stranded] + [MagicMock()] * 4)
+    db.commit = AsyncMock()
+
+    created = await create_partition(
+        db, "sentiment_analyses", datetime(2026, 11, 3, tzinfo=UTC)
+    )
+
+    assert created is True
+    statements = [str(call.args[0]) for call in db.execute.await_args_list[2:]]
+    assert statements[0] == (
+        "ALTER TABLE sentiment_analyses DETACH PARTITION sentiment_analyses_default"
+    )
+    assert (
+        "sentiment_analyses_p2026_11 PARTITION OF sentiment_analyses" in statements[1]
+    )
+    assert "DELETE FROM sentiment_analyses_default" in statements[2]
+    assert "INSERT INTO sentiment_analyses_p2026_11" in statements[2]
+    assert db.execute.await_args_list[4].args[1] == {
+        "start": datetime(2026, 11, 1, tzinfo=UTC),
+        "end": datetime(2026, 12, 1, tzinfo=UTC),
+    }
+    assert statements[3] == (
+        "ALTER TABLE sentiment_analyses ATTACH PARTITION "
+        "sentiment_analyses_default DEFAULT"
+    )
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_only_history_tables():
+    """Test that partition DDL is limited to the partitioned tables"""
+    db = MagicMock()
+    with pytest.raises(ValueError):
+        await detach_partition(db, "users", "users_p2026_01")
+    with pytest.raises(ValueError):
+        await detach_partition(db, "sentiment_analyses", "sentiment_analyses_default")
@@ -0,0 +1,51 @@
+# tests/crud/test_sentiment_latest.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.sentiment import get_latest_sentiments, refresh_sentiment_latest
+
+
+def _mock_db():
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    result.rowcount = 3
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+    return db
+
+
+def _sql(db):
+    return str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_get_latest_sentiments_single_query():
+    """Test that every subnet's latest score is read in one query"""
+    db = _mock_db()
+
+    await get_latest_sentiments(db)
+
+    db.execute.assert_awaited_once()
+    sql = _sql(db)
+    assert "FROM sentiment_latest" in sql
+    assert "sentiment_analyses" not in sql
+
+
+@pytest.mark.asyncio
+async def test_refresh_sentiment_latest_distinct_on():
+    """Test that the rebuild takes the newest analysis per netuid"""
+    db = _mock_db()
+
+    assert await refresh_sentiment_latest(db) == 3
+
+    sql = _sql(db)
+    assert "DISTINCT ON (sentiment_analyses.netuid)" in sql
+    assert (
+        "ORDER BY sentiment_analyses.netuid, sentiment_analyses.created_at DESC, "
+        "sentiment_analyses.id DESC" in sql
+    )
+    assert "ON CONFLICT (netuid) DO UPDATE" in sql
+    db.commit.assert_awaited_once()
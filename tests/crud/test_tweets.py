@@ -0,0 +1,45 @@
+# tests/crud/test_tweets.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.tweets import get_recent_tweets, upsert_tweets
+from app.models.sentiment import Tweet
+
+
+def _mock_db():
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+    return db
+
+
+def _compiled(db):
+    return db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+
+
+def test_tweets_keyed_by_query_and_id():
+    """Test that the same tweet can be stored once per query"""
+    assert [column.name for column in Tweet.__table__.primary_key] == ["query", "id"]
+
+
+@pytest.mark.asyncio
+async def test_same_tweet_stored_and_read_for_two_queries():
+    """Test that a tweet matching two subnets' queries is kept for both"""
+    tweet = {"id": "1001", "text": "SN1 and SN18 both look strong"}
+    db = _mock_db()
+
+    for query, netuid in (("Bittensor netuid 1", 1), ("Bittensor netuid 18", 18)):
+        assert await upsert_tweets(db, query, [tweet], netuid=netuid) == 1
+        compiled = _compiled(db)
+        assert "ON CONFLICT (query, id) DO UPDATE" in str(compiled)
+        assert compiled.params["query_m0"] == query
+        assert compiled.params["netuid_m0"] == netuid
+
+        await get_recent_tweets(db, query)
+        compiled = _compiled(db)
+        assert "WHERE tweets.query = %(query_1)s" in str(compiled)
+        assert compiled.params["query_1"] == query
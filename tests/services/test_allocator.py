@@ -0,0 +1,128 @@
+# tests/services/test_allocator.py
+import numpy as np
+import pytest
+
+from app.services.allocator import allocate, rebalance_deltas, target_stakes
+
+NAN = float("nan")
+
+
+def test_budget_split_by_score():
+    """Test that positive scores share the budget in proportion"""
+    targets = target_stakes(
+        scores=np.array([60.0, 20.0, 20.0]),
+        yields=np.zeros(3),
+        positions=np.zeros(3),
+        budget=10.0,
+        max_subnet_stake=10.0,
+        threshold=1.0,
+        yield_weight=0.0,
+    )
+
+    assert targets == pytest.approx([6.0, 2.0, 2.0])
+
+
+def test_cap_redistributes():
+    """Test that stake above the per-subnet cap goes to other subnets"""
+    targets = target_stakes(
+        scores=np.array([90.0, 5.0, 5.0]),
+        yields=np.zeros(3),
+        positions=np.zeros(3),
+        budget=10.0,
+        max_subnet_stake=4.0,
+        threshold=1.0,
+        yield_weight=0.0,
+    )
+
+    assert targets == pytest.approx([4.0, 3.0, 3.0])
+    assert targets.sum() <= 10.0 + 1e-9
+
+
+def test_yield_tilt():
+    """Test that higher yields attract more stake at equal sentiment"""
+    targets = target_stakes(
+        scores=np.array([50.0, 50.0]),
+        yields=np.array([0.02, 0.0]),
+        positions=np.zeros(2),
+        budget=6.0,
+        max_subnet_stake=6.0,
+        threshold=1.0,
+        yield_weight=1.0,
+    )
+
+    assert targets == pytest.approx([4.0, 2.0])
+
+
+def test_negative_exits_and_unknown_holds():
+    """Test that negative subnets are exited and unscored ones held"""
+    targets = target_stakes(
+        scores=np.array([-40.0, NAN, 0.5, 30.0]),
+        yields=np.zeros(4),
+        positions=np.array([3.0, 2.0, 1.0, 0.0]),
+        budget=10.0,
+        max_subnet_stake=5.0,
+        threshold=1.0,
+        yield_weight=0.0,
+    )
+
+    assert targets == pytest.approx([0.0, 2.0, 1.0, 5.0])
+
+
+def test_small_trades_dropped():
+    """Test that changes below the minimum trade size are not emitted"""
+    deltas = rebalance_deltas(
+        targets=np.array([1.02, 3.0, 0.0]),
+        positions=np.array([1.0, 2.0, 0.5]),
+        budget=10.0,
+        min_trade=0.05,
+    )
+
+    assert deltas == pytest.approx([0.0, 1.0, -0.5])
+
+
+def test_budget_respected_when_unstakes_dropped():
+    """Test that stakes shrink if a dropped unstake would break the budget"""
+    deltas = rebalance_deltas(
+        targets=np.array([4.97, 5.03]),
+        positions=np.array([5.0, 4.0]),
+        budget=10.0,
+        min_trade=0.05,
+    )
+
+    assert (np.array([5.0, 4.0]) + deltas).sum() <= 10.0 + 1e-9
+    assert deltas[0] == 0.0
+
+
+def test_allocate_orders():
+    """Test that only rebalancing orders are emitted, unstakes first"""
+    orders = allocate(
+        netuids=[1, 3, 18],
+        scores=np.array([50.0, -20.0, NAN]),
+        yields=np.zeros(3),
+        positions=np.array([0.0, 1.0, 2.0]),
+        budget=5.0,
+        max_subnet_stake=5.0,
+        min_trade=0.05,
+    )
+
+    assert [(o["netuid"], o["transaction_type"]) for o in orders] == [
+        (3, "unstake"),
+        (1, "stake"),
+    ]
+    assert orders[0]["amount"] == pytest.approx(1.0)
+    assert orders[1]["amount"] == pytest.approx(3.0)
+    assert orders[1]["target"] == pytest.approx(3.0)
+
+
+def test_allocate_many_subnets():
+    """Test that a large portfolio respects every limit"""
+    rng = np.random.default_rng(0)
+    n = 1024
+    scores = rng.uniform(-100, 100, n)
+    positions = rng.uniform(0, 1, n)
+
+    targets = target_stakes(scores, rng.uniform(0, 0.1, n), positions, 100.0, 0.5)
+
+    assert targets.max() <= 0.5 + 1e-9
+    assert targets.sum() <= 100.0 + 1e-6
+    assert (targets[scores < -1.0] == 0.0).all()
@@ -0,0 +1,146 @@
+# tests/services/test_backtest.py
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.services.backtest import (
+    TEMPO_SECONDS,
+    build_history,
+    evaluate,
+    forward_fill,
+    per_subnet_positions,
+    replay_ewma,
+    run_backtest,
+)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def test_forward_fill():
+    """Test that values carry forward per subnet from the grid time they appear"""
+    grid = np.arange(0.0, 5 * 3600, 3600)
+    netuids = np.array([1, 18])
+    rows = [(18, 1800.0), (1, 3600.0), (18, 3 * 3600.0), (99, 0.0)]
+
+    filled = forward_fill(grid, netuids, rows, np.array([10.0, 20.0, 30.0, 40.0]))
+
+    assert np.isnan(filled[0, 0])
+    assert filled[1:, 0].tolist() == [20.0, 20.0, 20.0, 20.0]
+    assert np.isnan(filled[0, 1])
+    assert filled[1:, 1].tolist() == [10.0, 10.0, 30.0, 30.0]
+
+
+def test_build_history_yields_and_transactions():
+    """Test per-step yields and recorded stake changes on the grid"""
+    history = build_history(
+        sentiment_rows=[(18, START, 50.0)],
+        dividend_rows=[(18, START, 100.0, 1.0)],
+        transaction_rows=[
+            (18, START + HOUR, "stake", 2.0),
+            (18, START + 2 * HOUR, "unstake", 0.5),
+        ],
+        start=START,
+        end=START + 4 * HOUR,
+        step=3600,
+    )
+
+    assert history["netuids"].tolist() == [18]
+    assert history["yields"][0, 0] == pytest.approx(0.01 * 3600 / TEMPO_SECONDS)
+    assert history["recorded"][:, 0].tolist() == [0.0, 2.0, -0.5, 0.0]
+
+
+def test_per_subnet_positions_floor_at_zero():
+    """Test that the live rule never unstakes below zero"""
+    history = {
+        "scores": np.array([[50.0], [-80.0], [-10.0], [30.0], [0.5]]),
+    }
+
+    positions = per_subnet_positions(history)
+
+    assert positions[:, 0] == pytest.approx([0.5, 0.0, 0.0, 0.3, 0.3])
+
+
+def test_per_subnet_positions_follow_replayed_ewma():
+    """Test that the per-subnet rule sizes from the EWMA like live staking"""
+    half_life = 3600
+    rows = [(18, START, 0.0), (18, START + HOUR, 100.0), (18, START + HOUR, 60.0)]
+
+    ewma = replay_ewma(rows, half_life)
+    # Two scores a half-life later move the EWMA halfway to their mean
+    assert ewma.tolist() == pytest.approx([0.0, 50.0, 40.0])
+
+    with patch("app.services.backtest.settings.SENTIMENT_EWMA_HALF_LIFE", half_life):
+        history = build_history(rows, [], [], START, START + 2 * HOUR, step=3600)
+    assert history["ewma_scores"][:, 0].tolist() == pytest.approx([0.0, 40.0])
+
+    raw = per_subnet_positions(history, use_ewma=False)
+    smoothed = per_subnet_positions(history, use_ewma=True)
+    assert raw[-1, 0] == pytest.approx(0.6)
+    assert smoothed[-1, 0] == pytest.approx(0.4)
+
+
+def test_evaluate():
+    """Test P&L, fees and turnover of a position path"""
+    positions = np.array([[1.0, 0.0], [1.0, 2.0], [0.0, 2.0]])
+    yields = np.full((3, 2), 0.01)
+
+    report = evaluate(positions, yields, fee_per_trade=0.001, fee_rate=0.01)
+
+    assert report["dividends"] == pytest.approx(0.06)
+    assert report["turnover"] == pytest.approx(4.0)
+    assert report["trades"] == 3
+    assert report["fees"] == pytest.approx(0.043)
+    assert report["pnl"] == pytest.approx(0.06 - 0.043)
+    assert report["peak_stake"] == 3.0
+    assert report["final_stake"] == 2.0
+
+
+def test_run_backtest_variants():
+    """Test that every variant gets a report"""
+    history = build_history(
+        sentiment_rows=[(1, START, 60.0), (18, START, -40.0)],
+        dividend_rows=[(1, START, 10.0, 0.1), (18, START, 10.0, 0.2)],
+        transaction_rows=[(1, START, "stake", 1.0)],
+        start=START,
+        end=START + 24 * HOUR,
+    )
+
+    reports = run_backtest(
+        history,
+        variants=[
+            {"name": "live", "strategy": "per_subnet"},
+            {"name": "double", "strategy": "per_subnet", "stake_per_point": 0.02},
+            {"name": "allocator", "strategy": "allocator", "budget": 5.0},
+            {"name": "recorded", "strategy": "recorded"},
+        ],
+    )
+
+    by_name = {report["name"]: report for report in reports}
+    assert by_name["double"]["peak_stake"] == pytest.approx(
+        2 * by_name["live"]["peak_stake"]
+    )
+    assert by_name["allocator"]["peak_stake"] <= 5.0 + 1e-9
+    assert by_name["recorded"]["final_stake"] == 1.0
+    assert all(report["dividends"] > 0 for report in reports)
+
+
+def test_year_of_hourly_data_is_fast():
+    """Test that a year of hourly data across many subnets replays in seconds"""
+    rng = np.random.default_rng(0)
+    steps, subnets = 365 * 24, 64
+    history = {
+        "scores": rng.uniform(-100, 100, (steps, subnets)),
+        "yields": rng.uniform(0, 0.001, (steps, subnets)),
+        "recorded": np.zeros((steps, subnets)),
+    }
+
+    started = time.perf_counter()
+    reports = run_backtest(history)
+    elapsed = time.perf_counter() - started
+
+    assert len(reports) == 3
+    assert elapsed < 10.0
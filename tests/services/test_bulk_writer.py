@@ -0,0 +1,105 @@
+# tests/services/test_bulk_writer.py
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.bulk_writer import BulkWriter
+
+
+class FakeTable:
+    """Insert function assigning sequential IDs, optionally failing"""
+
+    def __init__(self):
+        self.statements = []
+        self.fail = False
+
+    async def insert_rows(self, db, rows):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        start = sum(len(statement) for statement in self.statements) + 1
+        self.statements.append(rows)
+        return list(range(start, start + len(rows)))
+
+
+@pytest.fixture
+def table():
+    mock_session = MagicMock()
+    mock_session.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    mock_session.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch("app.services.bulk_writer.async_session", mock_session):
+        yield FakeTable()
+
+
+def make_writer(table, max_rows=3, max_delay=0.05):
+    writer = BulkWriter("test_rows", table.insert_rows)
+    writer.max_rows = max_rows
+    writer.max_delay = max_delay
+    return writer
+
+
+@pytest.mark.asyncio
+async def test_flush_by_size(table):
+    """Test that a full buffer is written in one statement"""
+    writer = make_writer(table)
+
+    for i in range(3):
+        assert await writer.write({"netuid": i}) is None
+
+    assert len(table.statements) == 1
+    assert [row["netuid"] for row in table.statements[0]] == [0, 1, 2]
+    assert all("created_at" in row for row in table.statements[0])
+    assert writer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_by_time(table):
+    """Test that buffered rows are written after the maximum delay"""
+    writer = make_writer(table)
+
+    await writer.write({"netuid": 1})
+    await writer.write({"netuid": 2})
+    assert table.statements == []
+
+    await asyncio.sleep(0.1)
+    assert len(table.statements) == 1
+    assert len(table.statements[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_write_returns_id(table):
+    """Test that a sync write flushes pending rows and returns its ID"""
+    writer = make_writer(table, max_rows=10)
+
+    await writer.write({"netuid": 1})
+    row_id = await writer.write({"netuid": 2}, sync=True)
+
+    assert row_id == 2
+    assert len(table.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_rows_are_retried(table):
+    """Test that buffered rows survive a failed flush and sync callers see the error"""
+    writer = make_writer(table, max_rows=10)
+    table.fail = True
+
+    await writer.write({"netuid": 1})
+    with pytest.raises(RuntimeError):
+        await writer.write({"netuid": 2}, sync=True)
+    assert writer.pending == 1
+
+    table.fail = False
+    assert await writer.flush() == 1
+    assert [row["netuid"] for row in table.statements[0]] == [1]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes(table):
+    """Test that closing the writer flushes buffered rows"""
+    writer = make_writer(table, max_rows=10, max_delay=60)
+
+    await writer.write({"netuid": 1})
+    await writer.aclose()
+
+    assert len(table.statements) == 1
+    assert writer.pending == 0
@@ -50,6 +50,20 @@ async def test_get_set_delete():
         mock_client.delete.assert_called_with("test_key")
 
 
+@pytest.mark.asyncio
+async def test_delete_if():
+    """Test that conditional deletes compare the stored value in Redis"""
+    mock_client = AsyncMock()
+    mock_client.eval.side_effect = [1, 0]
+
+    with patch.object(RedisCache, "get_client", return_value=mock_client):
+        cache = RedisCache()
+
+        assert await cache.delete_if("lock", "token-a") is True
+        assert await cache.delete_if("lock", "token-b") is False
+        assert mock_client.eval.call_args.args[1:] == (1, "lock", '"token-b"')
+
+
 @pytest.mark.asyncio
 async def test_keys():
     """Test keys operation"""
@@ -0,0 +1,208 @@
+# tests/services/test_circuit_breaker.py
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from app.services.rate_limit import AdaptiveTokenBucket
+from app.services.sentiment import SentimentService
+
+
+@pytest.fixture(autouse=True)
+def isolate_upstreams():
+    with patch(
+        "app.services.sentiment.quota_service.reserve", new=AsyncMock()
+    ), patch("app.services.sentiment.quota_service.block", new=AsyncMock()), patch(
+        "app.services.sentiment.rate_limiters.get",
+        side_effect=lambda name: AdaptiveTokenBucket(name, rate=1000.0, burst=100),
+    ):
+        yield
+
+
+def test_opens_on_failures_and_recovers():
+    """Test open -> half-open -> closed transitions"""
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+
+    for _ in range(5):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # Pretend the open period has passed
+    breaker._opened_at -= 60
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial call at a time
+
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_slow_calls():
+    """Test that calls over the latency threshold count as failures"""
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+
+    for _ in range(5):
+        breaker.record_success(2.5)
+
+    assert breaker.state == OPEN
+
+
+def test_hedge_delay_needs_samples():
+    """Test the p95 hedge delay"""
+    breaker = CircuitBreaker("test", slow_call_seconds=10.0)
+    assert breaker.hedge_delay() is None
+
+    for i in range(100):
+        breaker.record_success(i / 100)
+
+    assert breaker.hedge_delay() == pytest.approx(0.94, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    """Test that an open breaker skips the HTTP call"""
+    breaker = CircuitBreaker("datura", slow_call_seconds=10.0)
+    breaker._open("test")
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.circuit_breakers.get", return_value=breaker
+    ):
+        mock_get.return_value.post = AsyncMock()
+        with pytest.raises(CircuitOpenError):
+            await SentimentService()._post("datura", "/v1/twitter/search", {})
+
+    mock_get.return_value.post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_count_as_failures():
+    """Test that 5xx responses are recorded against the upstream"""
+    breaker = CircuitBreaker("chutes", slow_call_seconds=10.0)
+    request = httpx.Request("POST", "https://api.chutes.ai/v1/generate")
+    response = httpx.Response(503, request=request)
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.circuit_breakers.get", return_value=breaker
+    ):
+        mock_get.return_value.post = AsyncMock(return_value=response)
+        for _ in range(5):
+            with pytest.raises(httpx.HTTPStatusError):
+                await SentimentService()._post("chutes", "/v1/generate", {})
+
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_throttled_trial_call_closes_breaker():
+    """Test that a 429 on the half-open trial does not leave the trial slot taken"""
+    breaker = CircuitBreaker("datura", slow_call_seconds=10.0)
+    breaker._open("test")
+    breaker._opened_at -= 60  # open period has passed
+    request = httpx.Request("POST", "https://apis.datura.ai/v1/twitter/search")
+    throttled = httpx.Response(429, request=request)
+    ok = httpx.Response(200, request=request, json={"data": []})
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.circuit_breakers.get", return_value=breaker
+    ), patch("app.services.sentiment.settings.UPSTREAM_THROTTLE_RETRIES", 0):
+        mock_get.return_value.post = AsyncMock(side_effect=[throttled, ok])
+        with pytest.raises(httpx.HTTPStatusError):
+            await SentimentService()._post("datura", "/v1/twitter/search", {})
+        assert breaker.state == CLOSED
+
+        response = await SentimentService()._post("datura", "/v1/twitter/search", {})
+
+    assert response.status_code == 200
+    assert breaker.hedge_delay() is None  # the 429 was not sampled
+
+
+@pytest.mark.asyncio
+async def test_slow_search_is_hedged():
+    """Test that a search slower than p95 is sent again and the faster copy wins"""
+    breaker = CircuitBreaker("datura", slow_call_seconds=10.0)
+    for _ in range(20):
+        breaker.record_success(0.01)
+
+    fast = MagicMock(status_code=200)
+    fast.json.return_value = {"data": [{"id": "1", "text": "hedged"}]}
+
+    async def slow_then_fast(*args, **kwargs):
+        if slow_then_fast.calls == 0:
+            slow_then_fast.calls += 1
+            await asyncio.sleep(5)
+        return fast
+
+    slow_then_fast.calls = 0
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.circuit_breakers.get", return_value=breaker
+    ), patch("app.services.sentiment.settings.HEDGE_MIN_DELAY", 0.01):
+        mock_get.return_value.post = AsyncMock(side_effect=slow_then_fast)
+        tweets = await asyncio.wait_for(
+            SentimentService()._fetch_tweets("Bittensor netuid 18", 10), timeout=1
+        )
+
+    assert tweets == [{"id": "1", "text": "hedged"}]
+    assert mock_get.return_value.post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_queued_for_quota_is_not_hedged():
+    """Test that time spent waiting for quota does not trigger a hedge"""
+    breaker = CircuitBreaker("datura", slow_call_seconds=10.0)
+    for _ in range(20):
+        breaker.record_success(0.01)
+
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"data": [{"id": "1", "text": "queued"}]}
+
+    async def slow_reserve(upstream):
+        await asyncio.sleep(0.2)
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.circuit_breakers.get", return_value=breaker
+    ), patch("app.services.sentiment.settings.HEDGE_MIN_DELAY", 0.01), patch(
+        "app.services.sentiment.quota_service.reserve",
+        new=AsyncMock(side_effect=slow_reserve),
+    ) as mock_reserve:
+        mock_get.return_value.post = AsyncMock(return_value=response)
+        tweets = await asyncio.wait_for(
+            SentimentService()._fetch_tweets("Bittensor netuid 18", 10), timeout=1
+        )
+
+    assert tweets == [{"id": "1", "text": "queued"}]
+    assert mock_get.return_value.post.await_count == 1
+    assert mock_reserve.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_search_serves_stale_tweets_when_upstream_fails():
+    """Test the stale-cache fallback for tweet searches"""
+    stale = [{"id": "9", "text": "from an hour ago"}]
+
+    async def fake_cache_get(key):
+        return stale if key.startswith("tweets:stale:") else None
+
+    with patch(
+        "app.services.sentiment.cache.get", new=AsyncMock(side_effect=fake_cache_get)
+    ), patch.object(
+        SentimentService,
+        "_fetch_tweets",
+        new=AsyncMock(side_effect=CircuitOpenError("datura", 10.0)),
+    ):
+        tweets = await SentimentService().search_tweets("Bittensor netuid 18")
+
+    assert tweets == stale
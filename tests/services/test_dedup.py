@@ -0,0 +1,45 @@
+# tests/services/test_dedup.py
+from app.services.dedup import (
+    cluster_near_duplicates,
+    cluster_weight,
+    hamming_distance,
+    simhash,
+)
+
+
+def test_simhash_ignores_mentions_urls_and_retweets():
+    """Test that retweets and re-tagged copies share a fingerprint"""
+    original = "Subnet 18 is going to the moon, buy now! @alice https://t.co/abc"
+    retweet = "RT @carl: Subnet 18 is going to the moon, buy now! @bob"
+
+    assert simhash(original) == simhash(retweet)
+    assert hamming_distance(simhash(original), simhash("Validators set weights")) > 6
+
+
+def test_cluster_near_duplicates():
+    """Test that near-duplicates cluster and distinct tweets stay apart"""
+    texts = [
+        "Subnet 18 is going to the moon, buy now before it's too late!! @alice",
+        "Validators on subnet 18 updated their weights today",
+        "RT @carl: Subnet 18 is going to the moon, buy now before its too late!!",
+        "Subnet 18 is going to the moon!! buy now before it's too late, seriously",
+        "Not impressed by subnet 18 lately, miners are leaving",
+    ]
+
+    assert cluster_near_duplicates(texts) == [[0, 2, 3], [1], [4]]
+
+
+def test_cluster_spam_burst():
+    """Test that a burst of identical spam collapses into a single cluster"""
+    texts = ["Great subnet 18 update"] + ["SN18 airdrop, claim now"] * 200
+
+    clusters = cluster_near_duplicates(texts)
+
+    assert clusters == [[0], list(range(1, 201))]
+
+
+def test_cluster_weight():
+    """Test that weights grow sublinearly with cluster size"""
+    assert cluster_weight(1) == 1.0
+    assert 1.0 < cluster_weight(10) < 10.0
+    assert cluster_weight(200) < 10.0
@@ -0,0 +1,32 @@
+# tests/services/test_http.py
+import pytest
+
+from app.services.http import HttpClients
+
+
+@pytest.mark.asyncio
+async def test_get_reuses_client():
+    """Test that each upstream gets one long-lived client"""
+    clients = HttpClients()
+    try:
+        datura = clients.get("datura")
+        assert clients.get("datura") is datura
+        assert clients.get("chutes") is not datura
+        assert str(datura.base_url).startswith("https://api.datura.ai")
+        assert datura.timeout.connect < datura.timeout.read
+    finally:
+        await clients.aclose()
+
+    assert datura.is_closed
+
+
+@pytest.mark.asyncio
+async def test_get_recreates_closed_client():
+    """Test that a closed client is replaced on next use"""
+    clients = HttpClients()
+    try:
+        chutes = clients.get("chutes")
+        await chutes.aclose()
+        assert clients.get("chutes") is not chutes
+    finally:
+        await clients.aclose()
@@ -0,0 +1,46 @@
+# tests/services/test_keystore.py
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.keystore import Keystore
+
+
+def test_load_derives_once():
+    """Test that keypairs are derived once and shared"""
+    keypair = MagicMock(ss58_address="5FakeColdkey")
+
+    with patch(
+        "bittensor.Keypair.create_from_mnemonic", return_value=keypair
+    ) as mock_create:
+        keystore = Keystore()
+        wallet = keystore.get_wallet()
+        wallet2 = keystore.get_wallet()
+
+        # Should derive only once and hand out the same signer
+        assert wallet is wallet2
+        assert mock_create.call_count == 1
+        assert wallet.coldkey is keypair
+        assert wallet.coldkeypub.ss58_address == "5FakeColdkey"
+
+
+def test_clear_forces_rederive():
+    """Test that clearing the keystore derives the keys again"""
+    with patch(
+        "bittensor.Keypair.create_from_mnemonic", return_value=MagicMock()
+    ) as mock_create:
+        keystore = Keystore()
+        keystore.get_wallet()
+        keystore.clear()
+        keystore.get_wallet()
+
+        assert mock_create.call_count == 2
+
+
+def test_load_error_propagates():
+    """Test that derivation errors are raised"""
+    with patch(
+        "bittensor.Keypair.create_from_mnemonic", side_effect=ValueError("bad seed")
+    ):
+        keystore = Keystore()
+        with pytest.raises(ValueError):
+            keystore.get_wallet()
@@ -0,0 +1,77 @@
+# tests/services/test_lexicon.py
+import time
+
+import numpy as np
+import pytest
+
+from app.services.lexicon import LexiconSentimentEngine
+
+
+@pytest.fixture
+def engine():
+    return LexiconSentimentEngine()
+
+
+def test_polarity(engine):
+    """Test that positive, negative and neutral tweets score as expected"""
+    scores = engine.score_batch(
+        [
+            "Subnet 18 is great, really bullish",
+            "Looks like a rug, total scam",
+            "Validators set weights on subnet 18",
+        ]
+    )
+
+    assert scores[0] > 50
+    assert scores[1] < -50
+    assert scores[2] == 0.0
+    assert np.all(np.abs(scores) <= 100)
+
+
+def test_negation_and_intensifiers(engine):
+    """Test negation windows and intensifier boosts"""
+    assert engine.score("not looking good") < 0
+    assert engine.score("subnet 18 isn't great") < 0
+    assert engine.score("don't think it's bad") > 0
+    assert engine.score("very good") > engine.score("good") > engine.score("slightly good")
+
+
+def test_negation_does_not_cross_tweets(engine):
+    """Test that a negation at the end of one tweet does not flip the next"""
+    scores = engine.score_batch(["I will never", "great update"])
+    assert scores[1] == engine.score("great update")
+
+
+def test_is_clearly_neutral(engine):
+    """Test the neutral pre-filter"""
+    assert engine.is_clearly_neutral(["subnet 18 emissions update"], threshold=10.0)
+    assert not engine.is_clearly_neutral(
+        ["subnet 18 emissions update", "subnet 18 is dumping"], threshold=10.0
+    )
+    assert engine.is_clearly_neutral([], threshold=10.0)
+
+
+def test_aggregate_empty(engine):
+    """Test aggregating no tweets"""
+    assert engine.aggregate([]) == 0.0
+    assert engine.score_batch([]).shape == (0,)
+    assert engine.score_batch(["", "..."]).tolist() == [0.0, 0.0]
+
+
+def test_throughput(engine):
+    """Benchmark: thousands of tweets per second on one core"""
+    samples = [
+        "Bittensor subnet 18 is really bullish, great progress this week",
+        "Not impressed by subnet 18 lately, miners are leaving and it looks weak",
+        "Validators updated weights on subnet 19 https://t.co/abc",
+        "RT @someone: this is not a scam, the team is shipping fast lfg",
+    ]
+    texts = [f"{samples[i % len(samples)]} #{i}" for i in range(5000)]
+
+    engine.score_batch(texts[:100])  # warm up
+    start = time.perf_counter()
+    scores = engine.score_batch(texts)
+    elapsed = time.perf_counter() - start
+
+    assert scores.shape == (5000,)
+    assert len(texts) / elapsed > 2000
@@ -0,0 +1,64 @@
+# tests/services/test_prompt.py
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.services.prompt import (
+    build_sentiment_prompt,
+    clean_tweet_text,
+    pack_batches,
+    rank_tweets,
+    select_within_budget,
+)
+
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _at(hours_ago: float) -> str:
+    return (NOW - timedelta(hours=hours_ago)).isoformat()
+
+
+def test_clean_tweet_text():
+    """Test stripping URLs, retweet prefixes, emoji runs and repeated punctuation"""
+    text = "RT @bob: SN18 🚀🚀🚀🔥 to the moon!!!!!   https://t.co/abc lfg"
+
+    assert clean_tweet_text(text) == "SN18 🚀 to the moon!! lfg"
+    assert clean_tweet_text(None) == ""
+
+
+def test_prompt_is_compact_json():
+    """Test that tweets are embedded as compact JSON"""
+    prompt = build_sentiment_prompt(["first tweet", "second tweet"])
+
+    assert '["first tweet","second tweet"]' in prompt
+    assert "2 numbers" in prompt
+    assert json.loads(prompt.split("Tweets: ", 1)[1]) == ["first tweet", "second tweet"]
+
+
+def test_rank_tweets_by_recency_and_engagement():
+    """Test that fresh, engaging tweets come first"""
+    tweets = [
+        {"id": "old", "created_at": _at(48), "like_count": 500},
+        {"id": "quiet", "created_at": _at(1)},
+        {"id": "popular", "created_at": _at(1), "public_metrics": {"retweet_count": 50}},
+    ]
+
+    assert [t["id"] for t in rank_tweets(tweets, now=NOW)] == ["popular", "quiet", "old"]
+
+
+def test_select_within_budget():
+    """Test trimming to the token budget, keeping at least one tweet"""
+    texts = ["x" * 400] * 5
+
+    assert select_within_budget(texts, token_budget=250) == 2
+    assert select_within_budget(texts, token_budget=10) == 1
+    assert select_within_budget([], token_budget=10) == 0
+
+
+def test_pack_batches_respects_budget():
+    """Test that batches stay within the token budget"""
+    items = [(str(i), "x" * 400) for i in range(10)]
+
+    batches = pack_batches(items, token_budget=300)
+
+    assert sum(len(batch) for batch in batches) == 10
+    assert all(len(batch) == 2 for batch in batches)
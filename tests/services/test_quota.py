@@ -0,0 +1,74 @@
+# tests/services/test_quota.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.quota import (
+    BACKGROUND,
+    INTERACTIVE,
+    QuotaExceededError,
+    QuotaService,
+    quota_priority,
+)
+
+
+def _mock_redis(*results):
+    client = MagicMock()
+    client.eval = AsyncMock(side_effect=list(results))
+    return patch("app.services.quota.cache.get_client", new=AsyncMock(return_value=client))
+
+
+def test_background_gets_smaller_burst():
+    """Test that background work may use only part of the burst"""
+    quota = QuotaService()
+
+    interval, interactive_tolerance = quota._limits("chutes", INTERACTIVE)
+    _, background_tolerance = quota._limits("chutes", BACKGROUND)
+
+    assert interval == 500
+    assert background_tolerance < interactive_tolerance
+
+
+def test_priority_context():
+    """Test that the context priority overrides the process default"""
+    quota = QuotaService()
+    quota.default_priority = BACKGROUND
+
+    assert quota.current_priority() == BACKGROUND
+    with quota_priority(INTERACTIVE):
+        assert quota.current_priority() == INTERACTIVE
+    assert quota.current_priority() == BACKGROUND
+
+
+@pytest.mark.asyncio
+async def test_reserve_waits_for_capacity():
+    """Test that a denied reservation waits and retries"""
+    quota = QuotaService()
+
+    with _mock_redis([0, 10], [1, 0]) as mock_get_client, patch(
+        "app.services.quota.asyncio.sleep", new=AsyncMock()
+    ) as mock_sleep:
+        await quota.reserve("datura", INTERACTIVE)
+
+    mock_sleep.assert_awaited_once_with(0.01)
+    assert mock_get_client.return_value.eval.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_reserve_gives_up_after_max_wait():
+    """Test that interactive callers do not wait longer than allowed"""
+    quota = QuotaService()
+
+    with _mock_redis([0, 30000]):
+        with pytest.raises(QuotaExceededError) as exc_info:
+            await quota.reserve("datura", INTERACTIVE)
+
+    assert exc_info.value.retry_after == 30.0
+
+
+@pytest.mark.asyncio
+async def test_reserve_fails_open_without_redis():
+    """Test that calls go through when Redis is unavailable"""
+    quota = QuotaService()
+
+    with _mock_redis(ConnectionError("redis down")):
+        await quota.reserve("chutes", BACKGROUND)
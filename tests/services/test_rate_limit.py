@@ -0,0 +1,70 @@
+# tests/services/test_rate_limit.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.rate_limit import AdaptiveTokenBucket, parse_retry_after
+from app.services.sentiment import SentimentService
+
+
+def test_bucket_spends_burst_then_paces():
+    """Test that the burst is free and later tokens are spaced by the rate"""
+    bucket = AdaptiveTokenBucket("test", rate=10.0, burst=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_throttling_pauses_and_adapts_rate():
+    """Test multiplicative decrease on 429 and additive recovery"""
+    bucket = AdaptiveTokenBucket("test", rate=10.0, burst=5)
+
+    bucket.on_throttled(retry_after=2.0)
+    assert bucket.rate == 5.0
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+    for _ in range(5):
+        bucket.on_success()
+    assert bucket.rate == pytest.approx(7.5)
+
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+
+    for _ in range(10):
+        bucket.on_throttled(retry_after=0.0)
+    assert bucket.rate == pytest.approx(1.0)
+
+
+def test_parse_retry_after():
+    """Test delta-seconds and HTTP-date Retry-After values"""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_post_retries_throttled_requests():
+    """Test that a 429 is retried after the limiter backs off"""
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+    ok = MagicMock(status_code=200, headers={})
+    limiter = AdaptiveTokenBucket("datura", rate=100.0, burst=10)
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.rate_limiters.get", return_value=limiter
+    ), patch(
+        "app.services.sentiment.quota_service.reserve", new=AsyncMock()
+    ) as mock_reserve, patch(
+        "app.services.sentiment.quota_service.block", new=AsyncMock()
+    ) as mock_block:
+        mock_get.return_value.post = AsyncMock(side_effect=[throttled, ok])
+
+        response = await SentimentService()._post("datura", "/v1/twitter/search", {})
+
+    assert response is ok
+    assert mock_get.return_value.post.await_count == 2
+    assert limiter.rate < 100.0
+    assert mock_reserve.await_count == 2
+    mock_block.assert_awaited_once_with("datura", 0.0)
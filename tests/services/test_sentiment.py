@@ -1,19 +1,41 @@
 # tests/services/test_sentiment.py
+import httpx
 import pytest
 import pytest_asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.services.rate_limit import AdaptiveTokenBucket
 from app.services.sentiment import SentimentService
 
 
+@pytest.fixture(autouse=True)
+def isolate_upstreams():
+    """Keep caching, quota and rate limits out of the way of the scoring tests"""
+    with patch(
+        "app.services.sentiment.tweet_score_cache.get_response",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "app.services.sentiment.tweet_score_cache.set_response", new=AsyncMock()
+    ), patch(
+        "app.services.sentiment.quota_service.reserve", new=AsyncMock()
+    ), patch(
+        "app.services.sentiment.quota_service.block", new=AsyncMock()
+    ), patch(
+        "app.services.sentiment.rate_limiters.get",
+        side_effect=lambda name: AdaptiveTokenBucket(name, rate=1000.0, burst=100),
+    ):
+        yield
+
+
 @pytest.mark.asyncio
 async def test_search_tweets():
     """Test searching tweets"""
-    # Mock httpx client
-    with patch("httpx.AsyncClient") as mock_client:
+    # Mock the pooled Datura client
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.cache.get", new=AsyncMock(return_value=None)
+    ), patch("app.services.sentiment.cache.set", new=AsyncMock(return_value=True)):
         # Setup mock response
-        mock_response = AsyncMock()
-        mock_response.raise_for_status = AsyncMock()
+        mock_response = MagicMock()
         mock_response.json.return_value = {
             "data": [
                 {
@@ -24,14 +46,14 @@ async def test_search_tweets():
                 }
             ]
         }
-        mock_client.return_value.__aenter__.return_value.post.return_value = (
-            mock_response
-        )
+        mock_get.return_value.post = AsyncMock(return_value=mock_response)
 
         # Test the function
         service = SentimentService()
         tweets = await service.search_tweets("Bittensor netuid 18", 1)
 
+        mock_get.assert_called_with("datura")
+
         assert len(tweets) == 1
         assert tweets[0]["id"] == "1234567890"
         assert "Bittensor" in tweets[0]["text"]
@@ -50,21 +72,63 @@ async def test_analyze_sentiment():
         }
     ]
 
-    # Mock httpx client
-    with patch("httpx.AsyncClient") as mock_client:
+    # Mock the pooled Chutes client and an empty per-tweet score cache
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch(
+        "app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()
+    ) as mock_set_scores:
         # Setup mock response
-        mock_response = AsyncMock()
-        mock_response.raise_for_status = AsyncMock()
+        mock_response = MagicMock()
         mock_response.json.return_value = {"text": "75.0"}
-        mock_client.return_value.__aenter__.return_value.post.return_value = (
-            mock_response
-        )
+        mock_get.return_value.post = AsyncMock(return_value=mock_response)
 
         # Test the function
         service = SentimentService()
         sentiment_score = await service.analyze_sentiment(tweets)
 
         assert sentiment_score == 75.0
+        mock_set_scores.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_analyze_sentiment_only_scores_new_tweets():
+    """Test that cached tweet scores are reused and only new tweets hit the LLM"""
+    from app.services.tweet_scores import tweet_content_hash
+
+    tweets = [
+        {"id": "1", "text": "Bittensor subnet 18 is great"},
+        {"id": "2", "text": "Not impressed by subnet 18 lately"},
+    ]
+    cached = {tweet_content_hash(tweets[0]["text"]): 80.0}
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value=dict(cached)),
+    ), patch("app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"text": "[-40]"}
+        mock_get.return_value.post = AsyncMock(return_value=mock_response)
+
+        service = SentimentService()
+        sentiment_score = await service.analyze_sentiment(tweets)
+
+        # Only the unseen tweet is in the prompt
+        prompt = mock_get.return_value.post.call_args.kwargs["json"]["prompt"]
+        assert "Not impressed" in prompt
+        assert "is great" not in prompt
+        assert sentiment_score == 20.0
+
+
+def test_parse_scores():
+    """Test parsing per-tweet scores from the LLM response"""
+    service = SentimentService()
+
+    assert service._parse_scores("[10, -250, 30.5]", 3) == [10.0, -100.0, 30.5]
+    assert service._parse_scores("42", 1) == [42.0]
+    assert service._parse_scores("Scores: 5, -5", 2) == [5.0, -5.0]
+    assert service._parse_scores("[1, 2]", 3) == [None, None, None]
 
 
 @pytest.mark.asyncio
@@ -76,3 +140,302 @@ async def test_get_subnet_sentiment(mock_sentiment_service):
     assert "sentiment_score" in result
     assert "tweet_count" in result
     assert result["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_score_subnets_single_request():
+    """Test that several subnets are scored with one batched request"""
+    tweets_by_netuid = {
+        1: [{"id": "1", "text": "Subnet 1 looks strong"}],
+        18: [
+            {"id": "2", "text": "Subnet 18 is struggling"},
+            {"id": "3", "text": "Subnet 18 miners are leaving"},
+        ],
+    }
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch("app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"text": "[60, -20, -40]"}
+        mock_get.return_value.post = AsyncMock(return_value=mock_response)
+
+        service = SentimentService()
+        scores = await service.score_subnets(tweets_by_netuid)
+
+    assert mock_get.return_value.post.await_count == 1
+    assert scores == {1: 60.0, 18: -30.0}
+
+
+@pytest.mark.asyncio
+async def test_unparseable_batch_is_split():
+    """Test that a parse failure retries smaller batches instead of returning 0"""
+    texts = ["great progress on subnet 18", "terrible update for subnet 18"]
+    responses = [{"text": "not a score list"}, {"text": "[10]"}, {"text": "[30]"}]
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch("app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()):
+        mock_responses = []
+        for payload in responses:
+            mock_response = MagicMock()
+            mock_response.json.return_value = payload
+            mock_responses.append(mock_response)
+        mock_get.return_value.post = AsyncMock(side_effect=mock_responses)
+
+        service = SentimentService()
+        scores = await service.score_tweets(texts)
+
+    assert mock_get.return_value.post.await_count == 3
+    assert sorted(scores.values()) == [10.0, 30.0]
+
+
+@pytest.mark.asyncio
+async def test_neutral_batch_skips_llm():
+    """Test that batches the lexicon finds clearly neutral are scored locally"""
+    texts = ["Subnet 18 validators updated weights", "Reading the subnet 18 docs"]
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch(
+        "app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()
+    ) as mock_set_scores:
+        mock_get.return_value.post = AsyncMock()
+
+        service = SentimentService()
+        scores = await service.score_tweets(texts)
+
+    mock_get.return_value.post.assert_not_called()
+    mock_set_scores.assert_awaited_once_with({})
+    assert len(scores) == 2
+    assert all(abs(score) < 10.0 for score in scores.values())
+
+
+@pytest.mark.asyncio
+async def test_strict_scoring_raises_upstream_errors():
+    """Test that strict scoring raises instead of leaving tweets to the lexicon"""
+    texts = ["great progress on subnet 18", "terrible update for subnet 18"]
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch("app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()):
+        mock_get.return_value.post = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        service = SentimentService()
+        assert await service.score_tweets(texts) == {}
+        with pytest.raises(httpx.ConnectError):
+            await service.score_tweets(texts, strict=True)
+
+
+@pytest.mark.asyncio
+async def test_strict_subnet_tweets_raise_on_ingest_failure():
+    """Test that strict callers get the ingest error, not stored or mock tweets"""
+    service = SentimentService()
+    with patch.object(
+        service, "ingest_tweets", new=AsyncMock(side_effect=httpx.ConnectError("down"))
+    ), patch.object(service, "search_tweets", new=AsyncMock()) as mock_search:
+        with pytest.raises(httpx.ConnectError):
+            await service.get_subnet_tweets(18, strict=True)
+
+    mock_search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_subnet_tweets_read_from_table_after_ingest():
+    """Test that a successful ingest is not followed by a second live search"""
+    service = SentimentService()
+    with patch.object(service, "ingest_tweets", new=AsyncMock()), patch(
+        "app.services.sentiment.async_session"
+    ) as mock_session, patch(
+        "app.services.sentiment.get_recent_tweets", new=AsyncMock(return_value=[])
+    ), patch.object(
+        service, "search_tweets", new=AsyncMock()
+    ) as mock_search, patch.object(
+        service, "_fetch_tweets", new=AsyncMock()
+    ) as mock_fetch:
+        mock_session.return_value.__aenter__.return_value = MagicMock()
+        assert await service.get_subnet_tweets(18, strict=True) == []
+        assert await service.get_subnet_tweets(18) == []
+
+    mock_search.assert_not_called()
+    mock_fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_scored_once():
+    """Test that a spam burst is scored once and cannot swamp other tweets"""
+    tweets = [
+        {"id": str(i), "text": f"@user{i} SN18 to the moon, buy now!"}
+        for i in range(50)
+    ]
+    tweets.append({"id": "50", "text": "Terrible week for subnet 18 miners"})
+
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_scores",
+        new=AsyncMock(return_value={}),
+    ), patch("app.services.sentiment.tweet_score_cache.set_scores", new=AsyncMock()):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"text": "[90, -60]"}
+        mock_get.return_value.post = AsyncMock(return_value=mock_response)
+
+        service = SentimentService()
+        sentiment_score = await service.analyze_sentiment(tweets)
+
+    prompt = mock_get.return_value.post.call_args.kwargs["json"]["prompt"]
+    assert prompt.count("to the moon") == 1
+    # Weighted 1 + ln(50) to 1 instead of 50 to 1
+    assert sentiment_score == pytest.approx((90 * 4.912 - 60) / 5.912, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_identical_prompt_uses_cached_response():
+    """Test that an identical batch is answered from the response cache"""
+    with patch("app.services.sentiment.http_clients.get") as mock_get, patch(
+        "app.services.sentiment.tweet_score_cache.get_response",
+        new=AsyncMock(return_value=[55.0, -10.0]),
+    ):
+        mock_get.return_value.post = AsyncMock()
+
+        service = SentimentService()
+        scores = await service._score_texts_with_llm(["great", "bad"])
+
+    assert scores == [55.0, -10.0]
+    mock_get.return_value.post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_refresh_subnets_fetches_concurrently():
+    """Test that subnets are fetched concurrently and results keep their order"""
+    import asyncio
+
+    in_flight, peak = 0, 0
+
+    async def fake_get_subnet_tweets(netuid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [{"id": str(netuid), "text": f"tweet {netuid}"}]
+
+    async def fake_store(netuid, tweets, score):
+        return {"netuid": netuid, "sentiment_score": score, "error": None}
+
+    service = SentimentService()
+    with patch.object(
+        service, "get_subnet_tweets", side_effect=fake_get_subnet_tweets
+    ), patch.object(
+        service, "score_subnets", new=AsyncMock(return_value={1: 1.0, 3: 3.0, 18: 18.0})
+    ), patch.object(service, "_store_subnet_sentiment", side_effect=fake_store):
+        results = await service.refresh_subnets([18, 1, 3])
+
+    assert [r["netuid"] for r in results] == [18, 1, 3]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_subnets_skips_failed_subnet():
+    """Test that one subnet failing to fetch does not abort the others"""
+
+    async def fake_get_subnet_tweets(netuid):
+        if netuid == 1:
+            raise RuntimeError("database unavailable")
+        return [{"id": str(netuid), "text": f"tweet {netuid}"}]
+
+    async def fake_store(netuid, tweets, score):
+        return {"netuid": netuid, "sentiment_score": score, "error": None}
+
+    service = SentimentService()
+    with patch.object(
+        service, "get_subnet_tweets", side_effect=fake_get_subnet_tweets
+    ), patch.object(
+        service, "score_subnets", new=AsyncMock(return_value={3: 3.0, 18: 18.0})
+    ) as mock_score, patch.object(
+        service, "_store_subnet_sentiment", side_effect=fake_store
+    ) as mock_store:
+        results = await service.refresh_subnets([18, 1, 3])
+
+    assert set(mock_score.call_args.args[0]) == {18, 3}
+    assert mock_store.call_count == 2
+    assert [r["netuid"] for r in results] == [18, 1, 3]
+    assert results[1]["error"] == "database unavailable"
+    assert results[0]["error"] is None and results[2]["error"] is None
+
+
+def _tweets(first_id: int, count: int):
+    """Newest-first tweets with descending ids"""
+    return [
+        {"id": str(first_id - i), "text": f"tweet {first_id - i}"} for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_serves_smaller_limit_from_deeper_entry():
+    """Test that a deeper cached result is sliced instead of refetched"""
+    entry = {
+        "limit": 20,
+        "exhausted": False,
+        "fetched_at": 0,
+        "tweets": _tweets(100, 20),
+    }
+
+    with patch(
+        "app.services.sentiment.cache.get", new=AsyncMock(return_value=entry)
+    ) as mock_cache_get, patch.object(
+        SentimentService, "_fetch_tweets", new=AsyncMock()
+    ) as mock_fetch:
+        tweets = await SentimentService().search_tweets("  Bittensor   NETUID 18 ", 10)
+
+    assert tweets == entry["tweets"][:10]
+    mock_fetch.assert_not_called()
+    mock_cache_get.assert_awaited_once_with("tweets:bittensor netuid 18")
+
+
+@pytest.mark.asyncio
+async def test_search_fetches_only_missing_tail():
+    """Test that a larger limit fetches only older tweets past the cached ones"""
+    entry = {
+        "limit": 10,
+        "exhausted": False,
+        "fetched_at": 1e12,
+        "tweets": _tweets(100, 10),
+    }
+    # max_id is inclusive: the boundary tweet comes back first
+    tail = _tweets(91, 11)
+
+    with patch(
+        "app.services.sentiment.cache.get", new=AsyncMock(return_value=entry)
+    ), patch(
+        "app.services.sentiment.cache.set", new=AsyncMock(return_value=True)
+    ) as mock_cache_set, patch.object(
+        SentimentService, "_fetch_tweets", new=AsyncMock(return_value=tail)
+    ) as mock_fetch:
+        tweets = await SentimentService().search_tweets("Bittensor netuid 18", 20)
+
+    mock_fetch.assert_awaited_once_with("Bittensor netuid 18", 11, max_id="91")
+    assert [t["id"] for t in tweets] == [str(i) for i in range(100, 80, -1)]
+    stored = mock_cache_set.await_args_list[0].args[1]
+    assert stored["limit"] == 20 and stored["exhausted"] is False
+
+
+@pytest.mark.asyncio
+async def test_search_exhausted_entry_serves_larger_limit():
+    """Test that a result shorter than its fetch depth answers deeper requests"""
+    entry = {
+        "limit": 10,
+        "exhausted": True,
+        "fetched_at": 0,
+        "tweets": _tweets(100, 4),
+    }
+
+    with patch(
+        "app.services.sentiment.cache.get", new=AsyncMock(return_value=entry)
+    ), patch.object(SentimentService, "_fetch_tweets", new=AsyncMock()) as mock_fetch:
+        tweets = await SentimentService().search_tweets("Bittensor netuid 18", 50)
+
+    assert len(tweets) == 4
+    mock_fetch.assert_not_called()
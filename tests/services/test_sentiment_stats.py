@@ -0,0 +1,129 @@
+# tests/services/test_sentiment_stats.py
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.sentiment_stats import (
+    WINDOWS,
+    _empty_state,
+    apply_score,
+    sentiment_stats_service,
+    summarize_window,
+)
+
+HALF_LIFE = 3600
+NOW = 1_700_000_000.0
+
+
+def test_first_score_sets_ewma():
+    """Test that the first score becomes the EWMA"""
+    state = apply_score(_empty_state(), 40.0, NOW, HALF_LIFE)
+
+    assert state["ewma"] == 40.0
+    assert state["last_score"] == 40.0
+    assert state["count"] == 1
+
+
+def test_ewma_half_life():
+    """Test that a score one half-life later moves the EWMA halfway"""
+    state = apply_score(_empty_state(), 0.0, NOW, HALF_LIFE)
+    state = apply_score(state, 100.0, NOW + HALF_LIFE, HALF_LIFE)
+
+    assert state["ewma"] == pytest.approx(50.0)
+
+
+def test_ewma_averages_simultaneous_scores():
+    """Test that scores with equal timestamps count as their mean"""
+    state = apply_score(_empty_state(), 10.0, NOW, HALF_LIFE)
+    state = apply_score(state, 90.0, NOW, HALF_LIFE)
+
+    assert state["ewma"] == pytest.approx(50.0)
+    assert state["last_score"] == 90.0
+
+    # A half-life later, two tied scores move the EWMA halfway to their mean
+    state = apply_score(state, 0.0, NOW + HALF_LIFE, HALF_LIFE)
+    state = apply_score(state, 100.0, NOW + HALF_LIFE, HALF_LIFE)
+
+    assert state["ewma"] == pytest.approx(50.0)
+    state = apply_score(state, 150.0, NOW + HALF_LIFE, HALF_LIFE)
+    assert state["ewma"] == pytest.approx(50.0 + 0.5 * (250.0 / 3 - 50.0))
+    assert state["updated_at"] == NOW + HALF_LIFE
+
+
+def test_window_summary():
+    """Test count, mean, std, min and max of a window"""
+    state = _empty_state()
+    for offset, score in enumerate([10.0, 20.0, 30.0]):
+        state = apply_score(state, score, NOW + offset * 60, HALF_LIFE)
+
+    length, count = WINDOWS["1h"]
+    summary = summarize_window(state["windows"]["1h"], length, count, NOW + 180)
+
+    assert summary["count"] == 3
+    assert summary["mean"] == pytest.approx(20.0)
+    assert summary["std"] == pytest.approx((200 / 3) ** 0.5)
+    assert summary["min"] == 10.0
+    assert summary["max"] == 30.0
+
+
+def test_window_expiry():
+    """Test that old scores leave short windows but stay in long ones"""
+    state = apply_score(_empty_state(), 80.0, NOW, HALF_LIFE)
+    state = apply_score(state, -20.0, NOW + 2 * 3600, HALF_LIFE)
+    later = NOW + 2 * 3600
+
+    hour = summarize_window(state["windows"]["1h"], *WINDOWS["1h"], later)
+    day = summarize_window(state["windows"]["24h"], *WINDOWS["24h"], later)
+
+    assert hour["count"] == 1
+    assert hour["mean"] == -20.0
+    assert day["count"] == 2
+    assert day["mean"] == pytest.approx(30.0)
+
+    # Buckets are bounded by the window size
+    assert len(state["windows"]["1h"]) == 1
+    empty = summarize_window(state["windows"]["1h"], *WINDOWS["1h"], later + 7200)
+    assert empty["count"] == 0
+    assert empty["mean"] is None
+
+
+@pytest.mark.asyncio
+async def test_record_retries_on_conflict():
+    """Test that a lost compare-and-set is retried with the fresh state"""
+    existing = apply_score(_empty_state(), 10.0, NOW, HALF_LIFE)
+
+    with patch(
+        "app.services.sentiment_stats.cache.get",
+        new=AsyncMock(side_effect=[None, existing]),
+    ), patch(
+        "app.services.sentiment_stats.cache.replace",
+        new=AsyncMock(side_effect=[False, True]),
+    ) as mock_replace:
+        await sentiment_stats_service.record(18, 30.0, now=NOW + 60)
+
+    assert mock_replace.await_count == 2
+    key, expected, new_state = mock_replace.await_args.args
+    assert key == "sentiment_stats:18"
+    assert expected == existing
+    assert new_state["count"] == 2
+    assert new_state["last_score"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_get_stats():
+    """Test the stats payload and the missing-state case"""
+    state = apply_score(_empty_state(), 25.0, NOW, HALF_LIFE)
+
+    with patch(
+        "app.services.sentiment_stats.cache.get", new=AsyncMock(return_value=state)
+    ):
+        stats = await sentiment_stats_service.get_stats(18, now=NOW)
+
+    assert stats["netuid"] == 18
+    assert stats["ewma"] == 25.0
+    assert set(stats["windows"]) == set(WINDOWS)
+    assert stats["windows"]["7d"]["count"] == 1
+
+    with patch(
+        "app.services.sentiment_stats.cache.get", new=AsyncMock(return_value=None)
+    ):
+        assert await sentiment_stats_service.get_stats(18) is None
@@ -41,17 +41,16 @@ def test_get_tao_dividends_with_trade(
     authorized_client, mock_blockchain_service, monkeypatch
 ):
     """Test getting tao dividends with trade=true"""
-    # Mock the celery task
-    from app.tasks.stake import process_sentiment_stake
+    # Mock the pipeline enqueue
+    from app.api.routes import tao_dividends
 
-    # Create a mock task with delay method
-    class MockTask:
-        @staticmethod
-        def delay(netuid, hotkey):
-            return type("obj", (object,), {"id": "mock-task-id"})
+    async def mock_enqueue_sentiment_stake(netuid, hotkey):
+        return "mock-task-id", False
 
     # Apply the mock
-    monkeypatch.setattr(process_sentiment_stake, "delay", MockTask.delay)
+    monkeypatch.setattr(
+        tao_dividends, "enqueue_sentiment_stake", mock_enqueue_sentiment_stake
+    )
 
     # Test the endpoint
     response = authorized_client.get("/api/v1/tao_dividends?trade=true")
@@ -61,3 +60,4 @@ def test_get_tao_dividends_with_trade(
     assert data["trade_triggered"] is True
     assert "task_id" in data
     assert data["task_id"] == "mock-task-id"
+    assert data["task_deduplicated"] is False
@@ -0,0 +1,104 @@
+# tests/services/test_tweet_ingestion.py
+import pytest
+from datetime import timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.crud.tweets import parse_tweet_time, newest_tweet_id
+from app.services.sentiment import SentimentService
+
+
+def test_newest_tweet_id():
+    """Test that tweet IDs compare numerically"""
+    tweets = [{"id": "999"}, {"id": "1000"}, {"id": "1001"}, {"text": "no id"}]
+    assert newest_tweet_id(tweets) == "1001"
+    assert newest_tweet_id([]) is None
+
+
+def test_parse_tweet_time():
+    """Test parsing ISO and Twitter-style timestamps"""
+    iso = parse_tweet_time("2023-06-15T14:30:00Z")
+    legacy = parse_tweet_time("Thu Jun 15 14:30:00 +0000 2023")
+
+    assert iso == legacy
+    assert iso.tzinfo is not None
+    assert parse_tweet_time(None).tzinfo == timezone.utc
+
+
+@pytest.mark.asyncio
+async def test_ingest_uses_cursor():
+    """Test that ingestion only asks for tweets newer than the cursor"""
+    new_tweets = [{"id": "1002", "text": "new"}, {"id": "1003", "text": "newer"}]
+
+    with patch("app.services.sentiment.async_session") as mock_session, patch(
+        "app.services.sentiment.get_tweet_cursor", new=AsyncMock(return_value="1001")
+    ), patch(
+        "app.services.sentiment.upsert_tweets", new=AsyncMock(return_value=2)
+    ) as mock_upsert, patch(
+        "app.services.sentiment.set_tweet_cursor", new=AsyncMock()
+    ) as mock_set_cursor:
+        mock_session.return_value.__aenter__.return_value = MagicMock()
+
+        service = SentimentService()
+        service._fetch_tweets = AsyncMock(return_value=new_tweets)
+        tweets = await service.ingest_tweets("Bittensor netuid 18", netuid=18)
+
+    assert tweets == new_tweets
+    assert service._fetch_tweets.call_args.kwargs["since_id"] == "1001"
+    mock_upsert.assert_awaited_once()
+    assert mock_set_cursor.call_args.args[1:] == ("Bittensor netuid 18", "1003")
+
+
+
+@pytest.fixture
+def ingest_mocks():
+    """Patch the database side of ingestion, with 1001 as the stored cursor"""
+    with patch("app.services.sentiment.async_session") as mock_session, patch(
+        "app.services.sentiment.get_tweet_cursor", new=AsyncMock(return_value="1001")
+    ), patch(
+        "app.services.sentiment.upsert_tweets", new=AsyncMock()
+    ) as mock_upsert, patch(
+        "app.services.sentiment.set_tweet_cursor", new=AsyncMock()
+    ) as mock_set_cursor, patch(
+        "app.services.sentiment.settings.TWEET_INGEST_LIMIT", 2
+    ):
+        mock_session.return_value.__aenter__.return_value = MagicMock()
+        yield mock_upsert, mock_set_cursor
+
+
+@pytest.mark.asyncio
+async def test_ingest_backfills_gap_larger_than_a_page(ingest_mocks):
+    """Test that older pages are fetched until the cursor is reached"""
+    mock_upsert, mock_set_cursor = ingest_mocks
+    pages = [
+        [{"id": "1006"}, {"id": "1005"}],
+        [{"id": "1004"}, {"id": "1003"}],
+        [{"id": "1002"}],
+    ]
+
+    service = SentimentService()
+    service._fetch_tweets = AsyncMock(side_effect=pages)
+    tweets = await service.ingest_tweets("Bittensor netuid 18", netuid=18)
+
+    assert [t["id"] for t in tweets] == ["1006", "1005", "1004", "1003", "1002"]
+    calls = service._fetch_tweets.call_args_list
+    assert [call.kwargs["max_id"] for call in calls] == [None, "1004", "1002"]
+    assert all(call.kwargs["since_id"] == "1001" for call in calls)
+    assert mock_upsert.await_count == 3
+    assert mock_set_cursor.call_args.args[1:] == ("Bittensor netuid 18", "1006")
+
+
+@pytest.mark.asyncio
+async def test_ingest_keeps_cursor_when_backfill_incomplete(ingest_mocks):
+    """Test that the cursor does not skip tweets the page cap left behind"""
+    mock_upsert, mock_set_cursor = ingest_mocks
+    pages = [[{"id": "1006"}, {"id": "1005"}], [{"id": "1004"}, {"id": "1003"}]]
+
+    service = SentimentService()
+    service._fetch_tweets = AsyncMock(side_effect=pages)
+    with patch("app.services.sentiment.settings.TWEET_INGEST_MAX_PAGES", 2):
+        tweets = await service.ingest_tweets("Bittensor netuid 18", netuid=18)
+
+    assert len(tweets) == 4
+    # Fetched pages are kept, but the gap down to 1001 is still open
+    assert mock_upsert.await_count == 2
+    mock_set_cursor.assert_not_called()
@@ -0,0 +1,29 @@
+# tests/services/test_tweet_scores.py
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.prompt import normalize_tweet_text
+from app.services.tweet_scores import TweetScoreCache, tweet_content_hash
+
+
+def test_normalize_tweet_text():
+    """Test that trivially different copies normalize the same"""
+    original = "Bittensor   subnet 18 is mooning https://t.co/abc123"
+    retweet = "RT @someone: bittensor subnet 18 is MOONING"
+
+    assert normalize_tweet_text(original) == "bittensor subnet 18 is mooning"
+    assert tweet_content_hash(original) == tweet_content_hash(retweet)
+    assert tweet_content_hash(original) != tweet_content_hash("something else")
+
+
+@pytest.mark.asyncio
+async def test_get_scores_skips_missing():
+    """Test reading cached scores in one round-trip"""
+    with patch(
+        "app.services.tweet_scores.cache.get_many",
+        new=AsyncMock(return_value=[12.5, None]),
+    ) as mock_get_many:
+        scores = await TweetScoreCache().get_scores(["aaa", "bbb", "aaa"])
+
+    assert scores == {"aaa": 12.5}
+    mock_get_many.assert_awaited_once_with(["tweet_score:aaa", "tweet_score:bbb"])
@@ -0,0 +1,35 @@
+# tests/tasks/test_dividends.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.tasks import dividends
+from app.tasks.dividends import _record_dividend_snapshots
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+
+
+@pytest.mark.asyncio
+async def test_record_dividend_snapshots():
+    """Test that a snapshot is stored for every active subnet"""
+    mock_blockchain = MagicMock()
+    mock_blockchain.get_active_netuids = AsyncMock(return_value=[1, 18])
+    mock_blockchain.get_subnet_positions = AsyncMock(
+        return_value={
+            "stakes": [1.0, 2.0],
+            "dividends": [0.1, 0.0],
+            "yields": [0.1, 0.0],
+        }
+    )
+    mock_session = MagicMock()
+    mock_session.return_value.__aenter__ = AsyncMock(return_value="db")
+    mock_session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(dividends, "blockchain_service", mock_blockchain), patch.object(
+        dividends, "async_session", mock_session
+    ), patch(
+        "app.tasks.dividends.create_dividend_snapshots", new=AsyncMock(return_value=2)
+    ) as mock_create:
+        result = await _record_dividend_snapshots(HOTKEY)
+
+    mock_create.assert_awaited_once_with("db", HOTKEY, [1, 18], [1.0, 2.0], [0.1, 0.0])
+    assert result == {"success": True, "hotkey": HOTKEY, "snapshots": 2}
@@ -0,0 +1,99 @@
+# tests/tasks/test_enqueue.py
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.tasks import enqueue
+from app.tasks.enqueue import enqueue_sentiment_stake
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_new_task():
+    """Test enqueueing when no task is in flight"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=True)
+
+    with patch.object(enqueue, "cache", mock_cache), patch.object(
+        enqueue, "start_sentiment_stake"
+    ) as mock_start:
+        task_id, deduplicated = await enqueue_sentiment_stake(18, HOTKEY)
+
+    assert deduplicated is False
+    mock_start.assert_called_once_with(18, HOTKEY, task_id=task_id)
+    mock_cache.add.assert_awaited_once()
+    assert mock_cache.add.call_args.args[0] == f"trade_task:18:{HOTKEY}"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_reuses_in_flight_task():
+    """Test that a pending task id is returned instead of enqueueing again"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=False)
+    mock_cache.get = AsyncMock(return_value="existing-task-id")
+
+    with patch.object(enqueue, "cache", mock_cache), patch.object(
+        enqueue, "start_sentiment_stake"
+    ) as mock_start, patch.object(
+        enqueue, "_is_active", new=AsyncMock(return_value=True)
+    ):
+        task_id, deduplicated = await enqueue_sentiment_stake(18, HOTKEY)
+
+    assert task_id == "existing-task-id"
+    assert deduplicated is True
+    mock_start.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_replaces_finished_task():
+    """Test that a finished task inside the window does not block new work"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=False)
+    mock_cache.get = AsyncMock(return_value="finished-task-id")
+    mock_cache.replace = AsyncMock(return_value=True)
+
+    with patch.object(enqueue, "cache", mock_cache), patch.object(
+        enqueue, "start_sentiment_stake"
+    ) as mock_start, patch.object(
+        enqueue, "_is_active", new=AsyncMock(return_value=False)
+    ):
+        task_id, deduplicated = await enqueue_sentiment_stake(18, HOTKEY)
+
+    assert task_id != "finished-task-id"
+    assert deduplicated is False
+    mock_start.assert_called_once_with(18, HOTKEY, task_id=task_id)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_failure_releases_key():
+    """Test that the key is released when the broker rejects the task"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=True)
+    mock_cache.delete = AsyncMock(return_value=True)
+
+    with patch.object(enqueue, "cache", mock_cache), patch.object(
+        enqueue, "start_sentiment_stake", side_effect=ConnectionError("broker down")
+    ):
+        with pytest.raises(ConnectionError):
+            await enqueue_sentiment_stake(18, HOTKEY)
+
+    mock_cache.delete.assert_awaited_once_with(f"trade_task:18:{HOTKEY}")
+
+
+@pytest.mark.asyncio
+async def test_is_active_runs_off_the_event_loop():
+    """Test that the blocking result backend lookup runs in a worker thread"""
+    threads = []
+
+    def ready():
+        threads.append(threading.current_thread())
+        return False
+
+    with patch.object(enqueue, "AsyncResult") as mock_result:
+        mock_result.return_value.ready = ready
+        assert await enqueue._is_active("task-id") is True
+
+    assert threads and threads[0] is not threading.current_thread()
+    assert await enqueue._is_active(None) is False
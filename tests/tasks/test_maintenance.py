@@ -0,0 +1,82 @@
+# tests/tasks/test_maintenance.py
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.tasks import maintenance
+from app.tasks.maintenance import _maintain_history_tables
+
+NOW = datetime(2026, 10, 19, 3, 0, tzinfo=timezone.utc)
+# The same instant on a server at UTC-4, where it is still October 18th
+LOCAL_NOW = NOW.astimezone(timezone(timedelta(hours=-4)))
+
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value="db")
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(maintenance, "async_session", session):
+        yield session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("now", [NOW, LOCAL_NOW])
+async def test_maintenance_creates_rolls_up_and_retires(mock_session, now):
+    """Test partition creation, rollups and retention in one run, in UTC"""
+    partitions = {
+        "blockchain_transactions": [
+            "blockchain_transactions_default",
+            "blockchain_transactions_p2025_09",
+            "blockchain_transactions_p2025_10",
+        ],
+        "sentiment_analyses": ["sentiment_analyses_p2025_11"],
+    }
+    rollups = {
+        "blockchain_transactions": AsyncMock(return_value=1),
+        "sentiment_analyses": AsyncMock(return_value=1),
+    }
+
+    with patch.object(maintenance.settings, "HISTORY_PARTITIONS_AHEAD", 1), patch.object(
+        maintenance.settings, "HISTORY_RETENTION_MONTHS", 12
+    ), patch.object(maintenance.settings, "HISTORY_RETENTION_DROP", False), patch(
+        "app.tasks.maintenance.create_partition", new=AsyncMock(return_value=True)
+    ) as mock_create, patch(
+        "app.tasks.maintenance.list_partitions",
+        new=AsyncMock(side_effect=lambda db, table: partitions[table]),
+    ), patch(
+        "app.tasks.maintenance.detach_partition", new=AsyncMock()
+    ) as mock_detach, patch(
+        "app.tasks.maintenance.drop_partition", new=AsyncMock()
+    ) as mock_drop, patch.dict(
+        maintenance.ROLLUPS, rollups
+    ):
+        result = await _maintain_history_tables(now)
+
+    assert mock_create.await_count == 4
+    assert result["created"] == [
+        "blockchain_transactions_p2026_10",
+        "blockchain_transactions_p2026_11",
+        "sentiment_analyses_p2026_10",
+        "sentiment_analyses_p2026_11",
+    ]
+
+    # Only months ending before 2025-10-01 have expired
+    assert result["retired"] == ["blockchain_transactions_p2025_09"]
+    mock_detach.assert_awaited_once_with(
+        "db", "blockchain_transactions", "blockchain_transactions_p2025_09"
+    )
+    mock_drop.assert_not_called()
+
+    # Recent days are rolled up, and the expired month before it is retired
+    tx_ranges = [call.args[1:] for call in rollups["blockchain_transactions"].await_args_list]
+    assert tx_ranges == [
+        (
+            datetime(2026, 10, 17, tzinfo=timezone.utc),
+            datetime(2026, 10, 20, tzinfo=timezone.utc),
+        ),
+        (
+            datetime(2025, 9, 1, tzinfo=timezone.utc),
+            datetime(2025, 10, 1, tzinfo=timezone.utc),
+        ),
+    ]
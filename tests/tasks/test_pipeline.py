@@ -0,0 +1,148 @@
+# tests/tasks/test_pipeline.py
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.quota import BACKGROUND, quota_service
+from app.tasks.stake import decide_stake
+from app.tasks.pipeline import (
+    build_sentiment_stake_pipeline,
+    decide_stake_stage,
+    fetch_subnet_tweets,
+    record_stake_transaction,
+    score_subnet_sentiment,
+    submit_stake,
+)
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+
+
+def test_decide_stake():
+    """Test turning sentiment scores into stake decisions"""
+    assert decide_stake(50.0) == {"transaction_type": "stake", "amount": 0.5}
+    assert decide_stake(-20.0) == {"transaction_type": "unstake", "amount": 0.2}
+    assert decide_stake(0.5)["transaction_type"] is None
+    assert decide_stake(0.0)["transaction_type"] is None
+
+
+def test_pipeline_stage_order():
+    """Test that the pipeline chains the stages in order"""
+    pipeline = build_sentiment_stake_pipeline(18, HOTKEY)
+
+    assert [task.task for task in pipeline.tasks] == [
+        "fetch_subnet_tweets",
+        "score_subnet_sentiment",
+        "decide_stake",
+        "submit_stake",
+        "record_stake_transaction",
+    ]
+
+
+def test_score_stage_uses_cached_score():
+    """Test that a cached score skips LLM scoring"""
+    payload = {"netuid": 18, "hotkey": HOTKEY, "sentiment_score": 42.0}
+
+    with patch(
+        "app.tasks.pipeline.sentiment_service.score_subnet_tweets", new=AsyncMock()
+    ) as mock_score:
+        result = score_subnet_sentiment(payload)
+
+    assert result["sentiment_score"] == 42.0
+    mock_score.assert_not_called()
+
+
+def test_fetch_stage_raises_upstream_errors():
+    """Test that upstream failures reach the stage's retry policy"""
+    with patch(
+        "app.tasks.pipeline.sentiment_service.record_subnet_query", new=AsyncMock()
+    ), patch(
+        "app.tasks.pipeline.sentiment_service.get_cached_subnet_sentiment",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "app.tasks.pipeline.sentiment_service.get_subnet_tweets",
+        new=AsyncMock(side_effect=httpx.ConnectError("down")),
+    ) as mock_tweets:
+        with pytest.raises(httpx.ConnectError):
+            fetch_subnet_tweets(18, HOTKEY)
+
+    assert mock_tweets.call_args.kwargs["strict"] is True
+
+
+def test_score_stage_runs_as_background():
+    """Test that upstream calls of a stage reserve quota as background work"""
+    priorities = []
+
+    async def score(netuid, tweets, strict=False):
+        priorities.append(quota_service.current_priority())
+        return {"sentiment_score": 30.0}
+
+    with patch(
+        "app.tasks.pipeline.sentiment_service.score_subnet_tweets",
+        new=AsyncMock(side_effect=score),
+    ):
+        result = score_subnet_sentiment({"netuid": 18, "hotkey": HOTKEY, "tweets": []})
+
+    assert result["sentiment_score"] == 30.0
+    assert priorities == [BACKGROUND]
+
+
+def test_decision_uses_ewma():
+    """Test that the stake decision is based on the rolling EWMA"""
+    with patch(
+        "app.tasks.stake.sentiment_stats_service.get_ewma",
+        new=AsyncMock(return_value=20.0),
+    ):
+        payload = decide_stake_stage(
+            {"netuid": 18, "hotkey": HOTKEY, "sentiment_score": 90.0}
+        )
+
+    assert payload["decision_score"] == 20.0
+    assert payload["transaction_type"] == "stake"
+    assert payload["amount"] == pytest.approx(0.2)
+
+
+def test_skipped_decision_passes_through():
+    """Test that a neutral score skips submission and recording"""
+    with patch(
+        "app.tasks.stake.sentiment_stats_service.get_ewma",
+        new=AsyncMock(return_value=None),
+    ):
+        payload = decide_stake_stage(
+            {"netuid": 18, "hotkey": HOTKEY, "sentiment_score": 0.5}
+        )
+
+    with patch("app.tasks.pipeline._submit_stake", new=AsyncMock()) as mock_submit:
+        payload = submit_stake(payload)
+    mock_submit.assert_not_called()
+
+    result = record_stake_transaction(payload)
+    assert result["success"] is True
+    assert "Skipped" in result["message"]
+    assert result["sentiment_score"] == 0.5
+
+
+def test_submit_and_record():
+    """Test that a positive score is submitted and recorded"""
+    with patch(
+        "app.tasks.stake.sentiment_stats_service.get_ewma",
+        new=AsyncMock(return_value=None),
+    ):
+        payload = decide_stake_stage(
+            {"netuid": 18, "hotkey": HOTKEY, "sentiment_score": 80.0}
+        )
+    tx_result = {"success": True, "transaction_hash": "0xabc"}
+
+    with patch(
+        "app.tasks.pipeline._submit_stake", new=AsyncMock(return_value=tx_result)
+    ) as mock_submit:
+        payload = submit_stake(payload)
+    mock_submit.assert_awaited_once_with(18, HOTKEY, "stake", pytest.approx(0.8))
+
+    with patch(
+        "app.tasks.pipeline._record_transaction", new=AsyncMock(return_value=1)
+    ) as mock_record:
+        result = record_stake_transaction(payload)
+
+    mock_record.assert_awaited_once()
+    assert result["transaction_type"] == "stake"
+    assert result["result"] == tx_result
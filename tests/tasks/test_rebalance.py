@@ -0,0 +1,59 @@
+# tests/tasks/test_rebalance.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.tasks import rebalance
+from app.tasks.rebalance import _rebalance_portfolio
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+
+
+@pytest.fixture
+def mock_blockchain():
+    blockchain = MagicMock()
+    blockchain.get_active_netuids = AsyncMock(return_value=[1, 18])
+    blockchain.get_subnet_positions = AsyncMock(
+        return_value={"stakes": [1.0, 0.0], "yields": [0.0, 0.0]}
+    )
+    blockchain.get_balance = AsyncMock(return_value=4.0)
+    return blockchain
+
+
+@pytest.mark.asyncio
+async def test_rebalance_submits_orders(mock_blockchain):
+    """Test that rebalancing submits unstakes before stakes and records them"""
+    scores = {1: -30.0, 18: 60.0}
+
+    with patch.object(rebalance, "blockchain_service", mock_blockchain), patch(
+        "app.tasks.rebalance._subnet_score",
+        new=AsyncMock(side_effect=lambda netuid: scores[netuid]),
+    ), patch(
+        "app.tasks.rebalance._submit_stake",
+        new=AsyncMock(return_value={"success": True, "transaction_hash": "0xabc"}),
+    ) as mock_submit, patch(
+        "app.tasks.rebalance._record_transaction", new=AsyncMock(return_value=1)
+    ) as mock_record, patch.object(
+        rebalance.settings, "ALLOCATOR_MAX_SUBNET_STAKE", 2.0
+    ):
+        result = await _rebalance_portfolio(HOTKEY)
+
+    assert result["success"] is True
+    assert [call.args[:3] for call in mock_submit.await_args_list] == [
+        (1, HOTKEY, "unstake"),
+        (18, HOTKEY, "stake"),
+    ]
+    assert mock_submit.await_args_list[1].args[3] == pytest.approx(2.0)
+    assert mock_record.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rebalance_dry_run(mock_blockchain):
+    """Test that a dry run only returns the orders"""
+    with patch.object(rebalance, "blockchain_service", mock_blockchain), patch(
+        "app.tasks.rebalance._subnet_score", new=AsyncMock(return_value=None)
+    ), patch("app.tasks.rebalance._submit_stake", new=AsyncMock()) as mock_submit:
+        result = await _rebalance_portfolio(HOTKEY, dry_run=True)
+
+    # Without any sentiment every position is held
+    assert result["orders"] == []
+    mock_submit.assert_not_called()
@@ -0,0 +1,69 @@
+# tests/tasks/test_runtime.py
+import asyncio
+import threading
+import time
+
+from app.tasks.runtime import WorkerRuntime
+
+
+def test_run_reuses_loop():
+    """Test that coroutines run on the same long-lived loop"""
+    runtime = WorkerRuntime()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    try:
+        loop1 = runtime.run(current_loop())
+        loop2 = runtime.run(current_loop())
+        assert loop1 is loop2
+        assert loop1 is runtime.loop
+    finally:
+        runtime.stop()
+
+    assert runtime.loop is None
+
+
+def test_concurrent_runs_share_loop():
+    """Test that several threads can run I/O-bound coroutines concurrently"""
+    runtime = WorkerRuntime()
+
+    async def sleeper():
+        await asyncio.sleep(0.2)
+        return True
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(runtime.run(sleeper())))
+        for _ in range(5)
+    ]
+
+    try:
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+    finally:
+        runtime.stop()
+
+    assert results == [True] * 5
+    # Five 0.2s sleeps overlap instead of running back to back
+    assert elapsed < 0.8
+
+
+def test_stop_runs_shutdown_hooks():
+    """Test that shutdown hooks run on the loop before it stops"""
+    runtime = WorkerRuntime()
+    closed = []
+
+    async def hook():
+        closed.append(asyncio.get_running_loop())
+
+    runtime.add_shutdown_hook(hook)
+    runtime.start()
+    loop = runtime.loop
+    runtime.stop()
+
+    assert closed == [loop]
@@ -0,0 +1,66 @@
+# tests/tasks/test_sweep.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.sentiment import SentimentService
+from app.tasks import sweep
+from app.tasks.sweep import _sweep_subnet_sentiment
+
+
+@pytest.mark.asyncio
+async def test_sweep_order_by_query_count():
+    """Test that busier subnets are swept first"""
+    with patch(
+        "app.services.sentiment.cache.zrevrange",
+        new=AsyncMock(return_value=[("19", 7.0), ("3", 2.0)]),
+    ):
+        service = SentimentService()
+        order = await service.get_sweep_order([1, 3, 18, 19])
+
+    assert order == [19, 3, 1, 18]
+
+
+@pytest.mark.asyncio
+async def test_sweep_refreshes_all_subnets():
+    """Test that the sweep refreshes every active subnet"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=True)
+    mock_cache.delete_if = AsyncMock(return_value=True)
+    mock_cache.zdecay = AsyncMock(return_value=2)
+
+    mock_sentiment = MagicMock()
+    mock_sentiment.get_sweep_order = AsyncMock(return_value=[18, 1])
+    mock_sentiment.refresh_subnets = AsyncMock(
+        return_value=[
+            {"netuid": 18, "sentiment_score": 40.0, "error": None},
+            {"netuid": 1, "sentiment_score": 0.0, "error": "timeout"},
+        ]
+    )
+
+    with patch.object(sweep, "cache", mock_cache), patch.object(
+        sweep, "sentiment_service", mock_sentiment
+    ), patch.object(
+        sweep.blockchain_service,
+        "get_active_netuids",
+        new=AsyncMock(return_value=[1, 18]),
+    ):
+        result = await _sweep_subnet_sentiment()
+
+    mock_sentiment.refresh_subnets.assert_awaited_once_with([18, 1])
+    assert result["refreshed"] == 1
+    assert result["failed"] == [1]
+    # Only the lock holding this sweep's token is released
+    token = mock_cache.add.call_args.args[1]
+    mock_cache.delete_if.assert_awaited_once_with(sweep.SWEEP_LOCK_KEY, token)
+
+
+@pytest.mark.asyncio
+async def test_sweep_skips_when_running():
+    """Test that overlapping sweeps are skipped"""
+    mock_cache = MagicMock()
+    mock_cache.add = AsyncMock(return_value=False)
+
+    with patch.object(sweep, "cache", mock_cache):
+        result = await _sweep_subnet_sentiment()
+
+    assert result["skipped"] is True
@@ -0,0 +1,32 @@
+# tests/tasks/test_worker.py
+from unittest.mock import patch
+
+import pytest
+from celery.signals import worker_init, worker_process_init
+
+import app.worker  # noqa: F401  (connects the signal handlers)
+
+
+class FakeWorker:
+    def __init__(self, pool_cls):
+        self.pool_cls = pool_cls
+
+
+def test_worker_init_bootstraps_thread_pool():
+    """Test that the threads pool, which has no worker_process_init, is bootstrapped"""
+    with patch("app.worker.bootstrap_worker_process") as mock_bootstrap:
+        worker_init.send(sender=FakeWorker("threads"))
+
+    mock_bootstrap.assert_called_once()
+
+
+@pytest.mark.parametrize("pool", ["prefork", "solo"])
+def test_worker_init_defers_to_process_init(pool):
+    """Test that prefork and solo pools are bootstrapped once, per process"""
+    with patch("app.worker.bootstrap_worker_process") as mock_bootstrap:
+        worker_init.send(sender=FakeWorker(pool))
+        mock_bootstrap.assert_not_called()
+
+        worker_process_init.send(sender=None)
+
+    mock_bootstrap.assert_called_once()